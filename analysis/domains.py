@@ -93,6 +93,7 @@ class DomainAnalyzer:
                    is_monorepo
             FROM projects
             WHERE parent_project_id IS NULL
+              AND status != 'archived'
             ORDER BY priority ASC, name ASC
         """)
 
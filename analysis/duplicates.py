@@ -6,18 +6,34 @@ Detecta projetos duplicados, forks e versões antigas.
 
 Uso:
     python3 duplicates.py find
+    python3 duplicates.py find --content --min-similarity 0.8
+    python3 duplicates.py find --fuzzy --name-similarity 0.4
     python3 duplicates.py suggest-consolidation
     python3 duplicates.py report
+    python3 duplicates.py report --refresh
 """
 
 import sqlite3
 import argparse
+import hashlib
+import re
+import stat
+import unicodedata
+from array import array
+from functools import lru_cache
+from itertools import combinations
 from pathlib import Path
-from datetime import datetime
-from typing import Dict, List
-from collections import defaultdict
+from datetime import datetime, timezone
+from typing import Dict, List, Optional, Set, Tuple
+from collections import Counter, defaultdict
+from concurrent.futures import ProcessPoolExecutor
 import json
 import os
+import sys
+
+# Schema e migrações compartilhados com o scanner (index/schema.py)
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'index'))
+from schema import ensure_schema  # noqa: E402
 
 
 class DuplicateAnalyzer:
@@ -27,6 +43,9 @@ class DuplicateAnalyzer:
     COPY_SUFFIXES = ['-temp', '-backup', '-old', '-bak', '-copy', '-v2', '-v3', '-v4',
                      '-intel', '-new', '-novo', '-antigo', '-legacy']
 
+    # Um sufixo de cópia no fim do nome (nenhum sufixo termina com outro: no máximo um casa)
+    COPY_SUFFIX_RE = re.compile('(?:' + '|'.join(map(re.escape, COPY_SUFFIXES)) + r')\Z')
+
     # Padrões de nomes que indicam relação
     RELATION_PATTERNS = [
         ('sisconect', 'ERP/CRM/COMEX'),
@@ -39,7 +58,65 @@ class DuplicateAnalyzer:
         ('vilanova-ai', 'AI Lab'),
     ]
 
-    def __init__(self, db_path: str = None):
+    # Diretórios fora da comparação de conteúdo (os mesmos IGNORE_DIRS do scanner)
+    CONTENT_IGNORE_DIRS = {
+        'node_modules', '.git', 'dist', 'build', '__pycache__',
+        'venv', 'env', '.venv', 'target', 'out', '.next',
+        '.cache', 'coverage', '.pytest_cache', 'vendor'
+    }
+
+    # Score mínimo (Jaccard ponderado por bytes) para dois projetos serem cópias
+    MIN_SIMILARITY = 0.8
+
+    # Bytes lidos pelo hash parcial; arquivos até esse tamanho já saem com o hash completo
+    PARTIAL_HASH_BYTES = 4096
+
+    # Tamanhos presentes em mais projetos que isso geram pares no primeiro
+    # estágio só depois de separados pelo hash parcial
+    MAX_SIZE_POSTINGS = 64
+
+    # Arquivos por tarefa do pool de hashing
+    HASH_CHUNK_FILES = 256
+
+    # Jaccard mínimo entre os trigramas de dois nomes normalizados (--fuzzy)
+    NAME_SIMILARITY = 0.4
+
+    # Palavras que marcam cópia/versão e saem do nome antes da comparação
+    # (junto com números curtos e versões como '(1)' e 'v4'; anos ficam)
+    NAME_NOISE_WORDS = {'copy', 'copia', 'final', 'old', 'new', 'novo', 'antigo', 'backup',
+                        'bak', 'bkp', 'temp', 'tmp', 'legacy', 'intel'}
+    NAME_VERSION_RE = re.compile(r'v?[0-9]{1,2}')
+
+    # Assinatura MinHash em NAME_BANDS faixas de NAME_BAND_ROWS valores: dois nomes
+    # são candidatos se uma faixa inteira coincide (~96% de chance com Jaccard 0.4,
+    # ~99.8% com 0.5, ~5% com 0.1)
+    NAME_BANDS = 48
+    NAME_BAND_ROWS = 3
+
+    # Baldes de uma faixa com mais nomes que isso (trigramas comuns demais) não geram pares
+    MAX_NAME_BUCKET = 64
+
+    # Tipos de evidência, da mais forte para a mais fraca: a primeira presente dá o
+    # tipo e a ação do cluster ('same_directory' só quando não há cópia de fato)
+    EVIDENCE_ORDER = ['same_remote', 'same_history', 'same_content', 'same_name',
+                      'similar_name', 'fuzzy_name', 'same_directory']
+
+    # Colunas dos projetos membros de grupos e clusters
+    PROJECT_FIELDS = ('id', 'name', 'path', 'has_git', 'git_last_commit_date', 'has_claude_md',
+                      'has_memory_system', 'is_monorepo', 'framework', 'type', 'dir_device', 'dir_inode')
+
+    def __init__(self, db_path: str = None, content: bool = False,
+                 min_similarity: float = MIN_SIMILARITY, workers: int = None,
+                 fuzzy: bool = False, name_similarity: float = NAME_SIMILARITY):
+        """
+        Args:
+            db_path: Path do projects.db (padrão: index/projects.db)
+            content: Inclui a detecção por conteúdo (grupos 'same_content')
+            min_similarity: Score mínimo de um par na detecção por conteúdo
+            workers: Processos do pool de listagem/hashing (padrão: CPUs; 1 = sem pool)
+            fuzzy: Inclui a detecção por nomes parecidos (grupos 'fuzzy_name')
+            name_similarity: Score mínimo de um par na detecção por nomes parecidos
+        """
         if db_path is None:
             script_dir = Path(__file__).parent.parent
             db_path = script_dir / "index" / "projects.db"
@@ -50,21 +127,50 @@ class DuplicateAnalyzer:
 
         self.conn = sqlite3.connect(str(self.db_path))
         self.conn.row_factory = sqlite3.Row
-
-    def find_duplicates(self) -> List[Dict]:
+        # Bancos de scans antigos: sem dir_device/dir_inode, project_aliases e tabelas de clusters
+        ensure_schema(self.conn)
+        self.content = content
+        self.min_similarity = min_similarity
+        self.workers = workers or os.cpu_count() or 1
+        self.content_stats = {}
+        self.fuzzy = fuzzy
+        self.name_similarity = name_similarity
+        self.fuzzy_stats = {}
+        self.clusters_computed_at = None
+        self._hash_cache = {}
+        self._hash_cache_dirty = set()
+
+    def find_duplicates(self, save: bool = False) -> List[Dict]:
         """
-        Encontra grupos de projetos duplicados.
+        Encontra clusters de projetos duplicados.
 
-        Critérios:
+        Critérios (evidências):
         1. Mesmo nome em localizações diferentes
         2. Nomes com sufixos de cópia (-temp, -backup, etc.)
-        3. Mesmo git remote URL
+        3. Mesmo git remote (URL canônica: https/ssh, usuário, '.git' e caixa não contam)
+        4. Mesma história git (commits raiz em comum): forks, mirrors, remote trocado
+        5. Mesmo conteúdo (com content=True): cópias renomeadas, downloads sem .git
+        6. Nomes parecidos (com fuzzy=True): 'sisconect_v4', 'SisConect-final (1)'
+
+        Os grupos de todos os critérios são unidos por union-find: projetos
+        ligados por qualquer evidência, mesmo transitivamente, caem num só
+        cluster, que guarda as evidências que o formaram. Paths que são o
+        mesmo diretório (symlink, bind mount) não contam como cópia: um
+        cluster só com eles sai como 'same_directory'.
+
+        Args:
+            save: Grava os clusters em duplicate_clusters, os pares em
+                project_similarity e os caches de hashes e assinaturas (só o
+                comando find grava; report e suggest-consolidation apenas leem)
 
         Returns:
-            Lista de grupos de duplicatas
+            Lista de clusters de duplicatas
         """
         groups = []
 
+        # 0. Mesmo diretório indexado por dois paths
+        groups.extend(self._find_same_directory())
+
         # 1. Projetos com exatamente o mesmo nome
         groups.extend(self._find_same_name())
 
@@ -74,8 +180,315 @@ class DuplicateAnalyzer:
         # 3. Projetos com mesmo git remote
         groups.extend(self._find_same_remote())
 
-        # Deduplicar grupos
-        return self._deduplicate_groups(groups)
+        # 4. Repositórios com a mesma história
+        groups.extend(self._find_same_history())
+
+        # 5. Projetos com o mesmo conteúdo
+        if self.content:
+            groups.extend(self._find_same_content(save))
+
+        # 6. Projetos com nomes parecidos
+        if self.fuzzy:
+            groups.extend(self._find_fuzzy_names(save))
+
+        # Unir as evidências em clusters
+        clusters = self._cluster(groups)
+        if save:
+            self._save_clusters(clusters)
+        else:
+            self.clusters_computed_at = datetime.now(timezone.utc).strftime('%Y-%m-%d %H:%M:%S')
+        return clusters
+
+    def get_clusters(self, refresh: bool = False) -> List[Dict]:
+        """
+        Clusters gravados pelo último find ou, se não servem mais, recalculados.
+
+        O recálculo fica só em memória: os clusters, pares e caches gravados
+        mudam apenas com find_duplicates(save=True).
+
+        Args:
+            refresh: Recalcula mesmo com clusters válidos gravados (o conteúdo
+                em disco pode ter mudado sem um novo scan)
+        """
+        if not refresh:
+            clusters = self.load_clusters()
+            if clusters is not None:
+                return clusters
+        return self.find_duplicates()
+
+    def _cluster(self, groups: List[Dict]) -> List[Dict]:
+        """
+        Une os grupos de todos os critérios em componentes conexos (union-find).
+
+        Cada grupo liga seus membros; o custo é quase linear no total de
+        membros. Os clusters saem na ordem do primeiro grupo de cada um.
+        """
+        sets = _UnionFind()
+        for group in groups:
+            first = group['members'][0]['id']
+            for member in group['members'][1:]:
+                sets.union(first, member['id'])
+
+        by_root = {}
+        for group in groups:
+            root = sets.find(group['members'][0]['id'])
+            cluster = by_root.get(root)
+            if cluster is None:
+                cluster = by_root[root] = {'members': {}, 'groups': {}, 'edges': []}
+            for member in group['members']:
+                cluster['members'].setdefault(member['id'], member)
+            cluster['groups'].setdefault(group['type'], group)
+            cluster['edges'].extend(self._group_edges(group))
+
+        clusters = []
+        for cluster in by_root.values():
+            members = list(cluster['members'].values())
+            edges = cluster['edges']
+            evidence = sorted(cluster['groups'], key=self.EVIDENCE_ORDER.index)
+
+            # Um diretório só (paths alternativos): nada a consolidar
+            directories = self._directories([m['id'] for m in members], edges)
+            copies = [kind for kind in evidence if kind != 'same_directory']
+            kind = copies[0] if copies and len(set(directories.values())) > 1 else 'same_directory'
+
+            primary = self._select_primary(members)
+            clusters.append(self._with_pairs({
+                'type': kind,
+                'name': cluster['groups'][kind]['name'],
+                'count': len(members),
+                'members': members,
+                'primary_id': primary['id'] if primary else None,
+                'action': cluster['groups'][kind]['action'],
+                'evidence': evidence,
+                'edges': edges,
+            }))
+
+        return clusters
+
+    @staticmethod
+    def _group_edges(group: Dict) -> List[Dict]:
+        """Arestas de um grupo: os pares com score ou, sem eles, o primeiro membro ligado aos outros."""
+        if 'pairs' in group:
+            return [{
+                'project_a_id': pair['project_a_id'],
+                'project_b_id': pair['project_b_id'],
+                'evidence': group['type'],
+                'score': pair['score'],
+                'matched_files': pair.get('matched_files'),
+            } for pair in group['pairs']]
+
+        first = group['members'][0]['id']
+        return [{
+            'project_a_id': first,
+            'project_b_id': member['id'],
+            'evidence': group['type'],
+            'score': None,
+            'matched_files': None,
+        } for member in group['members'][1:]]
+
+    @staticmethod
+    def _directories(ids: List[int], edges: List[Dict]) -> Dict[int, int]:
+        """Diretório de cada membro (pelas arestas 'same_directory'): ID -> ID representante."""
+        sets = _UnionFind()
+        for edge in edges:
+            if edge['evidence'] == 'same_directory':
+                sets.union(edge['project_a_id'], edge['project_b_id'])
+        return {project_id: sets.find(project_id) for project_id in ids}
+
+    def _split_cluster(self, cluster: Dict) -> Tuple[List[Dict], Set[int]]:
+        """
+        Separa os membros que podem ser arquivados dos paths alternativos.
+
+        Returns:
+            (um membro por diretório além do principal, IDs que são o mesmo
+            diretório de outro membro listado)
+        """
+        directories = self._directories([m['id'] for m in cluster['members']], cluster['edges'])
+        seen = {directories.get(cluster['primary_id'])}
+        archive = []
+        aliases = set()
+        for member in cluster['members']:
+            if member['id'] == cluster['primary_id']:
+                continue
+            if directories[member['id']] in seen:
+                aliases.add(member['id'])
+            else:
+                seen.add(directories[member['id']])
+                archive.append(member)
+        return archive, aliases
+
+    @staticmethod
+    def _with_pairs(cluster: Dict) -> Dict:
+        """Completa o cluster com os pares com score (para exibição) e as evidências por membro."""
+        by_id = {m['id']: m for m in cluster['members']}
+        member_evidence = defaultdict(set)
+        pairs = []
+        for edge in cluster['edges']:
+            member_evidence[edge['project_a_id']].add(edge['evidence'])
+            member_evidence[edge['project_b_id']].add(edge['evidence'])
+            if edge['score'] is not None:
+                a, b = by_id[edge['project_a_id']], by_id[edge['project_b_id']]
+                pairs.append(dict(edge, path_a=a['path'], path_b=b['path'],
+                                  name_a=a['name'], name_b=b['name']))
+
+        order = DuplicateAnalyzer.EVIDENCE_ORDER.index
+        cluster['member_evidence'] = {project_id: sorted(kinds, key=order)
+                                      for project_id, kinds in member_evidence.items()}
+        cluster['pairs'] = pairs
+        return cluster
+
+    def _projects_snapshot(self) -> Tuple:
+        """Estado da tabela projects: muda quando o scanner insere, atualiza ou remove projetos."""
+        row = self.conn.execute("SELECT COUNT(*), MAX(id), MAX(updated_at) FROM projects").fetchone()
+        return tuple(row)
+
+    def _save_clusters(self, clusters: List[Dict]):
+        """Substitui os clusters gravados pelos desta execução."""
+        for table in ('duplicate_cluster_edges', 'duplicate_cluster_members',
+                      'duplicate_clusters', 'duplicate_cluster_runs'):
+            self.conn.execute(f"DELETE FROM {table}")
+
+        count, max_id, updated_at = self._projects_snapshot()
+        cursor = self.conn.execute("""
+            INSERT INTO duplicate_cluster_runs (
+                content, fuzzy, min_similarity, name_similarity,
+                projects_count, projects_max_id, projects_updated_at
+            ) VALUES (?, ?, ?, ?, ?, ?, ?)
+        """, (self.content, self.fuzzy, self.min_similarity, self.name_similarity,
+              count, max_id, updated_at))
+        run_id = cursor.lastrowid
+
+        for position, cluster in enumerate(clusters):
+            cursor = self.conn.execute("""
+                INSERT INTO duplicate_clusters (
+                    run_id, position, name, cluster_type, evidence, action,
+                    primary_project_id, project_count
+                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+            """, (run_id, position, cluster['name'], cluster['type'], ','.join(cluster['evidence']),
+                  cluster['action'], cluster['primary_id'], cluster['count']))
+            cluster_id = cursor.lastrowid
+
+            self.conn.executemany(
+                "INSERT INTO duplicate_cluster_members (cluster_id, project_id, evidence) VALUES (?, ?, ?)",
+                [(cluster_id, m['id'], ','.join(cluster['member_evidence'][m['id']]))
+                 for m in cluster['members']]
+            )
+            self.conn.executemany("""
+                INSERT INTO duplicate_cluster_edges (
+                    cluster_id, project_a_id, project_b_id, evidence, score, matched_files
+                ) VALUES (?, ?, ?, ?, ?, ?)
+            """, [(cluster_id, e['project_a_id'], e['project_b_id'], e['evidence'], e['score'],
+                   e['matched_files']) for e in cluster['edges']])
+
+        self.conn.commit()
+        self.clusters_computed_at = self.conn.execute(
+            "SELECT computed_at FROM duplicate_cluster_runs WHERE id = ?", (run_id,)
+        ).fetchone()[0]
+
+    def load_clusters(self) -> Optional[List[Dict]]:
+        """
+        Lê os clusters gravados pela última execução.
+
+        Returns:
+            Lista de clusters, ou None se não há execução gravada, se ela usou
+            outras opções ou se os projetos mudaram desde então
+        """
+        run = self.conn.execute(
+            "SELECT * FROM duplicate_cluster_runs ORDER BY id DESC LIMIT 1"
+        ).fetchone()
+        if run is None:
+            return None
+        if (bool(run['content']), bool(run['fuzzy'])) != (self.content, self.fuzzy):
+            return None
+        if self.content and run['min_similarity'] != self.min_similarity:
+            return None
+        if self.fuzzy and run['name_similarity'] != self.name_similarity:
+            return None
+        if (run['projects_count'], run['projects_max_id'], run['projects_updated_at']) != self._projects_snapshot():
+            return None
+
+        clusters = {}
+        for row in self.conn.execute("""
+            SELECT id, name, cluster_type, evidence, action, primary_project_id
+            FROM duplicate_clusters
+            WHERE run_id = ?
+            ORDER BY position
+        """, (run['id'],)):
+            clusters[row['id']] = {
+                'type': row['cluster_type'],
+                'name': row['name'],
+                'members': [],
+                'primary_id': row['primary_project_id'],
+                'action': row['action'],
+                'evidence': row['evidence'].split(','),
+                'edges': [],
+            }
+
+        fields = ', '.join('p.' + field for field in self.PROJECT_FIELDS)
+        for row in self.conn.execute(f"""
+            SELECT m.cluster_id, {fields}
+            FROM duplicate_cluster_members m
+            JOIN duplicate_clusters c ON c.id = m.cluster_id
+            JOIN projects p ON p.id = m.project_id
+            WHERE c.run_id = ?
+            ORDER BY m.rowid
+        """, (run['id'],)):
+            member = dict(row)
+            clusters[member.pop('cluster_id')]['members'].append(member)
+
+        for row in self.conn.execute("""
+            SELECT e.cluster_id, e.project_a_id, e.project_b_id, e.evidence, e.score, e.matched_files
+            FROM duplicate_cluster_edges e
+            JOIN duplicate_clusters c ON c.id = e.cluster_id
+            WHERE c.run_id = ?
+            ORDER BY e.rowid
+        """, (run['id'],)):
+            edge = dict(row)
+            clusters[edge.pop('cluster_id')]['edges'].append(edge)
+
+        for cluster in clusters.values():
+            cluster['count'] = len(cluster['members'])
+            self._with_pairs(cluster)
+
+        self.clusters_computed_at = run['computed_at']
+        return list(clusters.values())
+
+    def _find_same_directory(self) -> List[Dict]:
+        """Encontra projetos com o mesmo (st_dev, st_ino): um diretório, vários paths."""
+        cursor = self.conn.execute("""
+            SELECT dir_device, dir_inode, COUNT(*) as cnt,
+                   GROUP_CONCAT(id, ',') as ids
+            FROM projects
+            WHERE dir_inode IS NOT NULL
+              AND parent_project_id IS NULL
+              AND status != 'archived'
+            GROUP BY dir_device, dir_inode
+            HAVING cnt > 1
+        """)
+
+        groups = []
+        for row in cursor.fetchall():
+            ids = [int(x) for x in row['ids'].split(',')]
+            members = self._get_projects_by_ids(ids)
+
+            primary = self._select_primary(members)
+            groups.append({
+                'type': 'same_directory',
+                'name': members[0]['name'],
+                'count': row['cnt'],
+                'members': members,
+                'primary_id': primary['id'] if primary else None,
+                'action': 'mesmo diretório por paths diferentes (symlink/bind mount) - não é cópia',
+            })
+
+        return groups
+
+    def find_aliases(self) -> List[Dict]:
+        """Paths alternativos de diretórios já indexados, registrados pelo scanner."""
+        cursor = self.conn.execute(
+            "SELECT alias_path, canonical_path, via FROM project_aliases ORDER BY canonical_path"
+        )
+        return [dict(row) for row in cursor.fetchall()]
 
     def _find_same_name(self) -> List[Dict]:
         """Encontra projetos com o mesmo nome em localizações diferentes."""
@@ -85,6 +498,7 @@ class DuplicateAnalyzer:
                    GROUP_CONCAT(id, ',') as ids
             FROM projects
             WHERE parent_project_id IS NULL
+              AND status != 'archived'
             GROUP BY name
             HAVING cnt > 1
             ORDER BY cnt DESC
@@ -112,68 +526,70 @@ class DuplicateAnalyzer:
         return groups
 
     def _find_similar_names(self) -> List[Dict]:
-        """Encontra projetos com nomes que indicam cópia/versão."""
+        """
+        Encontra projetos com nomes que indicam cópia/versão.
+
+        Uma passada: cada nome é normalizado uma vez (minúsculas, sem o
+        sufixo de cópia) e os projetos são agrupados por esse nome base.
+        Um grupo reúne as cópias com sufixo e, se houver, o primeiro
+        projeto com o nome base exato; uma cópia sozinha só forma grupo
+        com um nome exato.
+        """
         cursor = self.conn.execute(
-            "SELECT id, name, path, has_git, git_last_commit_date, has_claude_md "
-            "FROM projects WHERE parent_project_id IS NULL ORDER BY name"
+            f"SELECT {', '.join(self.PROJECT_FIELDS)} "
+            f"FROM projects WHERE parent_project_id IS NULL AND status != 'archived' ORDER BY name"
         )
-        projects = [dict(row) for row in cursor.fetchall()]
 
-        groups = []
-        seen = set()
+        # nome base -> (posição do primeiro projeto, primeiro nome exato, cópias com sufixo)
+        buckets = {}
+        for position, row in enumerate(cursor):
+            project = dict(row)
+            name = project['name'].lower()
+            suffix = self.COPY_SUFFIX_RE.search(name)
+            base_name = name[:suffix.start()] if suffix else name
+
+            bucket = buckets.get(base_name)
+            if bucket is None:
+                bucket = buckets[base_name] = [position, None, None, []]
+            if suffix:
+                bucket[3].append(project)
+            elif bucket[1] is None:
+                bucket[1] = project
+                bucket[2] = position
 
-        for p in projects:
-            if p['id'] in seen:
+        groups = []
+        for base_name, (first_position, exact, exact_position, copies) in buckets.items():
+            # Ordem dos membros e dos grupos: a do nome (como no ORDER BY)
+            if exact is not None and copies and (exact_position == first_position or len(copies) == 1):
+                related, position = [exact] + copies, exact_position
+            elif len(copies) > 1:
+                related, position = copies, first_position
+            else:
                 continue
 
-            base_name = p['name'].lower()
-            related = [p]
-
-            for suffix in self.COPY_SUFFIXES:
-                if base_name.endswith(suffix):
-                    base_name = base_name[:base_name.rfind(suffix)]
-                    break
-
-            for other in projects:
-                if other['id'] == p['id'] or other['id'] in seen:
-                    continue
-
-                other_name = other['name'].lower()
-                other_base = other_name
-                for suffix in self.COPY_SUFFIXES:
-                    if other_name.endswith(suffix):
-                        other_base = other_name[:other_name.rfind(suffix)]
-                        break
-
-                if base_name == other_base and base_name != other_name:
-                    related.append(other)
-
-            if len(related) > 1:
-                for r in related:
-                    seen.add(r['id'])
-
-                primary = self._select_primary(related)
-                groups.append({
-                    'type': 'similar_name',
-                    'name': base_name,
-                    'count': len(related),
-                    'members': related,
-                    'primary_id': primary['id'] if primary else None,
-                    'action': 'verificar se são versões diferentes e consolidar',
-                })
+            primary = self._select_primary(related)
+            groups.append((position, {
+                'type': 'similar_name',
+                'name': base_name,
+                'count': len(related),
+                'members': related,
+                'primary_id': primary['id'] if primary else None,
+                'action': 'verificar se são versões diferentes e consolidar',
+            }))
 
-        return groups
+        groups.sort(key=lambda item: item[0])
+        return [group for _, group in groups]
 
     def _find_same_remote(self) -> List[Dict]:
-        """Encontra projetos que apontam para o mesmo repositório remoto."""
+        """Encontra projetos que apontam para o mesmo repositório remoto (URL canônica)."""
         cursor = self.conn.execute("""
-            SELECT git_remote, COUNT(*) as cnt,
+            SELECT git_remote_canonical, COUNT(*) as cnt,
                    GROUP_CONCAT(id, ',') as ids
             FROM projects
-            WHERE git_remote IS NOT NULL
-              AND git_remote != ''
+            WHERE git_remote_canonical IS NOT NULL
               AND parent_project_id IS NULL
-            GROUP BY git_remote
+              AND status != 'archived'
+            GROUP BY git_remote_canonical
             HAVING cnt > 1
         """)
 
@@ -186,7 +602,7 @@ class DuplicateAnalyzer:
             primary = self._select_primary(members)
             groups.append({
                 'type': 'same_remote',
-                'name': row['git_remote'].split('/')[-1].replace('.git', ''),
+                'name': row['git_remote_canonical'].split('/')[-1],
                 'count': row['cnt'],
                 'members': members,
                 'primary_id': primary['id'] if primary else None,
@@ -195,13 +611,541 @@ class DuplicateAnalyzer:
 
         return groups
 
+    def _find_same_history(self) -> List[Dict]:
+        """
+        Encontra repositórios com commits raiz em comum.
+
+        Clones, forks e mirrors compartilham a história mesmo quando os
+        remotes diferem (fork em outra conta, remote trocado) ou não existem.
+        """
+        # Cada repositório liga ao primeiro com a mesma raiz (sem gerar todos os pares),
+        # pelo índice em project_root_commits.sha
+        pairs = [dict(row) for row in self.conn.execute("""
+            WITH roots AS (
+                SELECT r.sha, r.project_id
+                FROM project_root_commits r
+                JOIN projects p ON p.id = r.project_id
+                WHERE p.parent_project_id IS NULL
+                  AND p.status != 'archived'
+            ),
+            first_with_root AS (
+                SELECT sha, MIN(project_id) AS first_id
+                FROM roots
+                GROUP BY sha
+                HAVING COUNT(*) > 1
+            )
+            SELECT f.first_id AS project_a_id, roots.project_id AS project_b_id
+            FROM first_with_root f
+            JOIN roots ON roots.sha = f.sha AND roots.project_id != f.first_id
+            ORDER BY roots.project_id, f.first_id
+        """)]
+
+        groups = []
+        for component, _ in self._pair_components(pairs):
+            members = self._get_projects_by_ids(component)
+            primary = self._select_primary(members)
+            groups.append({
+                'type': 'same_history',
+                'name': primary['name'] if primary else members[0]['name'],
+                'count': len(members),
+                'members': members,
+                'primary_id': primary['id'] if primary else None,
+                'action': 'mesma história git (clone, fork ou mirror) - comparar branches e manter um',
+            })
+
+        return groups
+
+    def _find_same_content(self, save: bool = False) -> List[Dict]:
+        """Agrupa os projetos ligados por pares de conteúdo similar (componentes conexos)."""
+        pairs = self.compute_similarity(save)
+
+        groups = []
+        for component, component_pairs in self._pair_components(pairs):
+            members = self._get_projects_by_ids(component)
+            primary = self._select_primary(members)
+            groups.append({
+                'type': 'same_content',
+                'name': primary['name'] if primary else members[0]['name'],
+                'count': len(members),
+                'members': members,
+                'primary_id': primary['id'] if primary else None,
+                'action': 'mesmo conteúdo (cópia renomeada ou download sem .git) - manter um',
+                'pairs': component_pairs,
+            })
+
+        return groups
+
+    def _find_fuzzy_names(self, save: bool = False) -> List[Dict]:
+        """Agrupa os projetos ligados por pares de nomes parecidos (componentes conexos)."""
+        pairs = self.compute_name_similarity(save)
+
+        groups = []
+        for component, component_pairs in self._pair_components(pairs):
+            members = self._get_projects_by_ids(component)
+            primary = self._select_primary(members)
+            groups.append({
+                'type': 'fuzzy_name',
+                'name': self._normalize_name(primary['name'] if primary else members[0]['name']),
+                'count': len(members),
+                'members': members,
+                'primary_id': primary['id'] if primary else None,
+                'action': 'nomes parecidos - verificar se são versões do mesmo projeto',
+                'pairs': component_pairs,
+            })
+
+        return groups
+
+    @staticmethod
+    def _pair_components(pairs: List[Dict]) -> List[Tuple[List[int], List[Dict]]]:
+        """
+        Componentes conexos do grafo de pares, pelo menor ID.
+
+        Returns:
+            Lista de (IDs ordenados, pares do componente na ordem de `pairs`)
+        """
+        sets = _UnionFind()
+        for pair in pairs:
+            sets.union(pair['project_a_id'], pair['project_b_id'])
+
+        members = defaultdict(list)
+        for project_id in sets.parent:
+            members[sets.find(project_id)].append(project_id)
+        component_pairs = defaultdict(list)
+        for pair in pairs:
+            component_pairs[sets.find(pair['project_a_id'])].append(pair)
+
+        roots = sorted(members, key=lambda root: min(members[root]))
+        return [(sorted(members[root]), component_pairs[root]) for root in roots]
+
+    def compute_similarity(self, save: bool = False) -> List[Dict]:
+        """
+        Calcula a similaridade de conteúdo entre projetos raiz.
+
+        Estágios, cada um descartando pares pelo limite superior do score:
+        1. Tamanhos dos arquivos (arquivos iguais têm o mesmo tamanho)
+        2. Hash parcial dos arquivos cujo tamanho também existe no outro projeto
+        3. Hash completo só dos arquivos cujo hash parcial ainda casa
+
+        O score é o Jaccard ponderado por bytes: bytes de arquivos com o
+        mesmo conteúdo sobre os bytes da união. Hashes ficam em
+        file_hash_cache (por inode/mtime/tamanho) entre execuções.
+
+        Args:
+            save: Grava os pares em project_similarity e os hashes novos em
+                file_hash_cache (sem save o cache só é lido)
+
+        Returns:
+            Pares com score >= min_similarity, do maior score para o menor
+        """
+        projects = [
+            dict(row) for row in self.conn.execute(
+                "SELECT id, path FROM projects WHERE parent_project_id IS NULL AND status != 'archived' "
+                "ORDER BY path"
+            )
+            if os.path.isdir(row['path'])
+        ]
+
+        executor = ProcessPoolExecutor(max_workers=self.workers) if self.workers > 1 else None
+        try:
+            return self._score_pairs(projects, executor, save)
+        finally:
+            if executor:
+                executor.shutdown()
+
+    def _score_pairs(self, projects: List[Dict], executor, save: bool = False) -> List[Dict]:
+        run = executor.map if executor else map
+        listings = list(run(_list_files, [p['path'] for p in projects],
+                            [self.CONTENT_IGNORE_DIRS] * len(projects)))
+
+        # Arquivos de cada projeto agrupados por tamanho: {tamanho: [(path, inode, mtime_ns)]}
+        by_size = []
+        totals = []
+        for listing in listings:
+            sizes = defaultdict(list)
+            for path, size, inode, mtime_ns in listing:
+                sizes[size].append((path, inode, mtime_ns))
+            by_size.append(sizes)
+            totals.append(sum(size for _, size, _, _ in listing))
+        self.content_stats = {
+            'projects': len(projects),
+            'files': sum(len(listing) for listing in listings),
+        }
+
+        # 1. Tamanhos: limite superior pelo multiconjunto de tamanhos (índice invertido)
+        postings = defaultdict(list)
+        for i, sizes in enumerate(by_size):
+            for size, files in sizes.items():
+                postings[size].append((i, len(files)))
+
+        # Tamanhos populares (boilerplate, licenças) são refinados pelo hash parcial:
+        # só cópias do mesmo conteúdo inicial geram pares
+        popular = {size: posting for size, posting in postings.items()
+                   if len(posting) > self.MAX_SIZE_POSTINGS}
+        popular_projects = sorted({i for posting in popular.values() for i, _ in posting})
+        self._hash_cache, self._hash_cache_dirty = {}, set()
+        cache_paths = self._load_hash_cache([projects[i]['path'] for i in popular_projects])
+
+        popular_wanted = {}
+        for size in popular:
+            for i, _ in popular[size]:
+                for path, inode, mtime_ns in by_size[i][size]:
+                    popular_wanted[path] = (i, size, inode, mtime_ns)
+        popular_hashes = self._hashes({path: entry[1:] for path, entry in popular_wanted.items()},
+                                      full=False, executor=executor)
+
+        hash_postings = defaultdict(Counter)
+        for path, digest in popular_hashes.items():
+            i, size, _, _ = popular_wanted[path]
+            hash_postings[(size, digest)][i] += 1
+
+        shared = defaultdict(int)
+        posting_lists = [(size, posting) for size, posting in postings.items() if size not in popular]
+        posting_lists += [(size, sorted(counts.items())) for (size, _), counts in hash_postings.items()]
+        for size, posting in posting_lists:
+            for x, (i, count_i) in enumerate(posting):
+                for j, count_j in posting[x + 1:]:
+                    shared[(i, j)] += min(count_i, count_j) * size
+
+        candidates = [
+            (i, j) for (i, j), bytes_shared in shared.items()
+            if _jaccard(bytes_shared, totals[i], totals[j]) >= self.min_similarity
+        ]
+        self.content_stats['sizes_bucketed_by_hash'] = len(popular)
+        self.content_stats['pairs_by_size'] = len(candidates)
+
+        loaded_projects = set(popular_projects)
+        cache_paths |= self._load_hash_cache([projects[i]['path'] for pair in candidates for i in pair
+                                              if i not in loaded_projects])
+
+        # 2. Hash parcial dos arquivos com tamanho presente no outro projeto do par
+        def matching_files(i, j):
+            return [(path, size, inode, mtime_ns)
+                    for size, files in by_size[i].items() if size in by_size[j]
+                    for path, inode, mtime_ns in files]
+
+        partial_wanted = {}
+        for i, j in candidates:
+            for a, b in ((i, j), (j, i)):
+                for path, size, inode, mtime_ns in matching_files(a, b):
+                    partial_wanted[path] = (size, inode, mtime_ns)
+        partial = self._hashes(partial_wanted, full=False, executor=executor)
+
+        def keyed(i, j, hashes):
+            keys = Counter()
+            for path, size, _, _ in matching_files(i, j):
+                if path in hashes:
+                    keys[(size, hashes[path])] += 1
+            return keys
+
+        survivors = []
+        for i, j in candidates:
+            keys_i, keys_j = keyed(i, j, partial), keyed(j, i, partial)
+            if _jaccard(_shared_bytes(keys_i, keys_j)[1], totals[i], totals[j]) >= self.min_similarity:
+                survivors.append((i, j, keys_i, keys_j))
+        self.content_stats['pairs_by_partial_hash'] = len(survivors)
+        self.content_stats['files_partial_hashed'] = len(set(partial_wanted) | set(popular_hashes))
+
+        # 3. Hash completo só dos arquivos maiores que o bloco parcial que ainda casam
+        full_wanted = {}
+        for i, j, keys_i, keys_j in survivors:
+            for a, b, partner_keys in ((i, j, keys_j), (j, i, keys_i)):
+                for path, size, inode, mtime_ns in matching_files(a, b):
+                    if size > self.PARTIAL_HASH_BYTES and (size, partial.get(path)) in partner_keys:
+                        full_wanted[path] = (size, inode, mtime_ns)
+        full = self._hashes(full_wanted, full=True, executor=executor)
+        self.content_stats['files_full_hashed'] = len(full_wanted)
+
+        # Conteúdo final: o hash parcial já é o completo nos arquivos pequenos
+        final = {path: digest for path, digest in partial.items()
+                 if partial_wanted[path][0] <= self.PARTIAL_HASH_BYTES}
+        final.update(full)
+
+        pairs = []
+        for i, j, _, _ in survivors:
+            matched_files, matched_bytes = _shared_bytes(keyed(i, j, final), keyed(j, i, final))
+            score = _jaccard(matched_bytes, totals[i], totals[j])
+            if score >= self.min_similarity:
+                pairs.append({
+                    'project_a_id': projects[i]['id'],
+                    'project_b_id': projects[j]['id'],
+                    'path_a': projects[i]['path'],
+                    'path_b': projects[j]['path'],
+                    'score': round(score, 4),
+                    'matched_files': matched_files,
+                    'matched_bytes': matched_bytes,
+                    'union_bytes': totals[i] + totals[j] - matched_bytes,
+                })
+        pairs.sort(key=lambda pair: (-pair['score'], pair['path_a'], pair['path_b']))
+        self.content_stats['pairs_similar'] = len(pairs)
+
+        if save:
+            self._save_hash_cache(cache_paths, {path for listing in listings for path, _, _, _ in listing})
+            self._save_similarity(pairs)
+        return pairs
+
+    def _load_hash_cache(self, project_paths: List[str]) -> Set[str]:
+        """
+        Acrescenta ao cache em memória os hashes gravados sob os projetos.
+
+        Returns:
+            Paths carregados (para remover depois os que não existem mais)
+        """
+        loaded = set()
+        for project_path in sorted(set(project_paths)):
+            prefix = project_path.rstrip('/') + '/'
+            for row in self.conn.execute(
+                "SELECT * FROM file_hash_cache WHERE path >= ? AND path < ?",
+                (prefix, prefix[:-1] + '0')  # '0' vem logo depois de '/'
+            ):
+                self._hash_cache[row['path']] = (row['inode'], row['mtime_ns'], row['size'],
+                                                 row['partial_hash'], row['full_hash'])
+                loaded.add(row['path'])
+        self.content_stats['hash_cache_loaded'] = self.content_stats.get('hash_cache_loaded', 0) + len(loaded)
+        return loaded
+
+    def _hashes(self, files: Dict[str, Tuple[int, int, int]], full: bool, executor) -> Dict[str, str]:
+        """
+        Hash parcial ou completo dos arquivos, do cache quando inode/mtime/tamanho batem.
+
+        Args:
+            files: {path: (tamanho, inode, mtime_ns)}
+            full: Hash completo (senão, dos primeiros PARTIAL_HASH_BYTES)
+
+        Returns:
+            {path: hash} (arquivos ilegíveis ficam de fora)
+        """
+        hashes = {}
+        todo = []
+        for path, (size, inode, mtime_ns) in files.items():
+            cached = self._hash_cache.get(path)
+            if cached and cached[:3] == (inode, mtime_ns, size):
+                digest = cached[4] if full else cached[3]
+                if digest:
+                    hashes[path] = digest
+                    continue
+            todo.append(path)
+
+        chunks = [todo[k:k + self.HASH_CHUNK_FILES] for k in range(0, len(todo), self.HASH_CHUNK_FILES)]
+        limit = None if full else self.PARTIAL_HASH_BYTES
+        run = executor.map if executor else map
+        for results in run(_hash_files, chunks, [limit] * len(chunks)):
+            for path, digest in results:
+                if digest is None:
+                    continue
+                hashes[path] = digest
+
+                size, inode, mtime_ns = files[path]
+                cached = self._hash_cache.get(path)
+                partial_hash, full_hash = (cached[3], cached[4]) if cached and cached[:3] == (inode, mtime_ns, size) else (None, None)
+                if full:
+                    full_hash = digest
+                else:
+                    partial_hash = digest
+                    if size <= self.PARTIAL_HASH_BYTES:
+                        full_hash = digest
+                self._hash_cache[path] = (inode, mtime_ns, size, partial_hash, full_hash)
+                self._hash_cache_dirty.add(path)
+
+        key = 'files_hashed_full' if full else 'files_hashed_partial'
+        self.content_stats[key] = self.content_stats.get(key, 0) + len(todo)
+        return hashes
+
+    def _save_hash_cache(self, loaded: Set[str], listed: Set[str]):
+        """Grava os hashes novos e remove do cache arquivos que não existem mais."""
+        self.conn.executemany("""
+            INSERT OR REPLACE INTO file_hash_cache (
+                path, inode, mtime_ns, size, partial_hash, full_hash, updated_at
+            ) VALUES (?, ?, ?, ?, ?, ?, CURRENT_TIMESTAMP)
+        """, [(path,) + self._hash_cache[path] for path in sorted(self._hash_cache_dirty)])
+        self.conn.executemany(
+            "DELETE FROM file_hash_cache WHERE path = ?",
+            [(path,) for path in sorted(loaded - listed)]
+        )
+        self.conn.commit()
+
+    def _save_similarity(self, pairs: List[Dict]):
+        """Substitui os pares gravados pelos desta execução."""
+        self.conn.execute("DELETE FROM project_similarity")
+        self.conn.executemany("""
+            INSERT INTO project_similarity (
+                project_a_id, project_b_id, score, matched_files, matched_bytes, union_bytes
+            ) VALUES (?, ?, ?, ?, ?, ?)
+        """, [
+            (p['project_a_id'], p['project_b_id'], p['score'], p['matched_files'],
+             p['matched_bytes'], p['union_bytes'])
+            for p in pairs
+        ])
+        self.conn.commit()
+
+    def compute_name_similarity(self, save: bool = False) -> List[Dict]:
+        """
+        Encontra pares de projetos raiz com nomes parecidos (trigramas + MinHash-LSH).
+
+        O nome de cada projeto (e o do diretório, se for outro) é normalizado
+        por _normalize_name; nomes normalizados iguais formam pares com score 1.
+        Entre nomes diferentes só são comparados os que coincidem em alguma
+        faixa da assinatura MinHash, pelo Jaccard exato dos trigramas. As
+        assinaturas ficam em name_signatures e só são recalculadas para
+        projetos novos ou renomeados.
+
+        Args:
+            save: Grava as assinaturas novas em name_signatures (sem save a
+                tabela só é lida)
+
+        Returns:
+            Pares com score >= name_similarity, do maior score para o menor
+        """
+        projects = [dict(row) for row in self.conn.execute(
+            "SELECT id, name, path FROM projects WHERE parent_project_id IS NULL AND status != 'archived' "
+            "ORDER BY path"
+        )]
+
+        by_key = defaultdict(list)
+        project_keys = {}
+        for p in projects:
+            key = self._name_key(p['name'], p['path'])
+            if key:
+                by_key[key].append(p)
+                project_keys[p['id']] = key
+        signatures = self._name_signatures(project_keys, save)
+
+        # Mesmo nome normalizado: todos ligados ao primeiro, sem gerar todos os pares
+        pairs = []
+        for members in by_key.values():
+            for other in members[1:]:
+                pairs.append(self._name_pair(members[0], other, 1.0))
+
+        # LSH: nomes com uma faixa inteira da assinatura em comum caem no mesmo balde;
+        # a primeira palavra também é um balde ('sisconect multi tenant' e 'sisconect'
+        # ficam candidatos mesmo quando nenhuma faixa coincide)
+        keys = sorted(by_key)
+        band_bytes = self.NAME_BAND_ROWS * 4
+        buckets = defaultdict(list)
+        for index, key in enumerate(keys):
+            signature = signatures[key]
+            for band in range(self.NAME_BANDS):
+                buckets[(band, signature[band * band_bytes:(band + 1) * band_bytes])].append(index)
+            buckets[(-1, key.split(' ', 1)[0])].append(index)
+
+        trigrams = [None] * len(keys)
+        candidates = set()
+        skipped = 0
+        for members in buckets.values():
+            if len(members) > self.MAX_NAME_BUCKET:
+                skipped += 1
+                continue
+
+            for i, j in combinations(members, 2):
+                if (i, j) in candidates:
+                    continue
+                candidates.add((i, j))
+
+                for k in (i, j):
+                    if trigrams[k] is None:
+                        trigrams[k] = _trigrams(keys[k])
+                # Jaccard <= menor/maior: tamanhos muito diferentes nem chegam à interseção
+                small, large = sorted((len(trigrams[i]), len(trigrams[j])))
+                if small < self.name_similarity * large:
+                    continue
+
+                score = _set_jaccard(trigrams[i], trigrams[j])
+                if score >= self.name_similarity:
+                    pairs.append(self._name_pair(by_key[keys[i]][0], by_key[keys[j]][0], round(score, 4)))
+
+        pairs.sort(key=lambda pair: (-pair['score'], pair['path_a'], pair['path_b']))
+        self.fuzzy_stats.update({
+            'projects': len(projects),
+            'names': len(keys),
+            'candidates': len(candidates),
+            'buckets_skipped': skipped,
+            'pairs_similar': len(pairs),
+        })
+        return pairs
+
+    @classmethod
+    def _normalize_name(cls, name: str) -> str:
+        """Minúsculas sem acentos, sem marcas de cópia/versão, palavras separadas por espaço."""
+        text = unicodedata.normalize('NFKD', name.lower())
+        text = ''.join(c for c in text if not unicodedata.combining(c))
+        words = re.findall(r'[a-z0-9]+', text)
+        kept = [w for w in words if w not in cls.NAME_NOISE_WORDS and not cls.NAME_VERSION_RE.fullmatch(w)]
+        # Nome feito só de marcas ('backup', 'v2') fica como está
+        return ' '.join(kept or words)
+
+    def _name_key(self, name: str, path: str) -> str:
+        """Texto comparado de um projeto: nome normalizado (+ diretório, se diferente)."""
+        key = self._normalize_name(name)
+        dir_key = self._normalize_name(os.path.basename(path.rstrip('/')))
+        if dir_key and dir_key != key:
+            key = f"{key} {dir_key}".strip()
+        return key
+
+    @staticmethod
+    def _name_pair(a: Dict, b: Dict, score: float) -> Dict:
+        if a['path'] > b['path']:
+            a, b = b, a
+        return {
+            'project_a_id': a['id'],
+            'project_b_id': b['id'],
+            'path_a': a['path'],
+            'path_b': b['path'],
+            'name_a': a['name'],
+            'name_b': b['name'],
+            'score': score,
+        }
+
+    def _name_signatures(self, project_keys: Dict[int, str], save: bool = False) -> Dict[str, bytes]:
+        """
+        Assinaturas MinHash por nome normalizado, de name_signatures quando o nome não mudou.
+
+        Args:
+            project_keys: {id do projeto: nome normalizado}
+            save: Grava as assinaturas recalculadas e remove as de projetos que saíram
+
+        Returns:
+            {nome normalizado: assinatura}
+        """
+        stored = {}
+        for row in self.conn.execute("SELECT project_id, name_key, signature FROM name_signatures"):
+            stored[row['project_id']] = (row['name_key'], row['signature'])
+
+        num_hashes = self.NAME_BANDS * self.NAME_BAND_ROWS
+        signatures = {}
+        outdated = []
+        for project_id, key in project_keys.items():
+            cached = stored.get(project_id)
+            # Assinatura de outro tamanho: NAME_BANDS/NAME_BAND_ROWS mudaram
+            if cached and cached[0] == key and len(cached[1]) == num_hashes * 4:
+                signatures.setdefault(key, bytes(cached[1]))
+            else:
+                outdated.append((project_id, key))
+
+        # Projetos novos ou renomeados (nomes iguais calculam uma vez só)
+        dirty = []
+        for project_id, key in outdated:
+            if key not in signatures:
+                signatures[key] = _minhash(_trigrams(key), num_hashes)
+            dirty.append((project_id, key, signatures[key]))
+
+        if save:
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO name_signatures (project_id, name_key, signature) VALUES (?, ?, ?)",
+                dirty
+            )
+            self.conn.executemany(
+                "DELETE FROM name_signatures WHERE project_id = ?",
+                [(project_id,) for project_id in sorted(set(stored) - set(project_keys))]
+            )
+            self.conn.commit()
+
+        self.fuzzy_stats = {'names_indexed': len(dirty), 'names_cached': len(project_keys) - len(dirty)}
+        return signatures
+
     def _get_projects_by_ids(self, ids: List[int]) -> List[Dict]:
         """Busca projetos por lista de IDs."""
         placeholders = ','.join(['?' for _ in ids])
         cursor = self.conn.execute(
-            f"SELECT id, name, path, has_git, git_last_commit_date, has_claude_md, "
-            f"has_memory_system, is_monorepo, framework, type "
-            f"FROM projects WHERE id IN ({placeholders})", ids
+            f"SELECT {', '.join(self.PROJECT_FIELDS)} FROM projects WHERE id IN ({placeholders})", ids
         )
         return [dict(row) for row in cursor.fetchall()]
 
@@ -236,111 +1180,324 @@ class DuplicateAnalyzer:
 
         return max(members, key=score)
 
-    def _deduplicate_groups(self, groups: List[Dict]) -> List[Dict]:
-        """Remove grupos duplicados (mesmo conjunto de projetos)."""
-        seen_sets = []
-        unique = []
-
-        for g in groups:
-            member_ids = frozenset(m['id'] for m in g['members'])
-            if member_ids not in seen_sets:
-                seen_sets.append(member_ids)
-                unique.append(g)
-
-        return unique
+    def suggest_consolidation(self, refresh: bool = False) -> List[Dict]:
+        """
+        Sugere ações de consolidação para cada cluster de duplicatas.
 
-    def suggest_consolidation(self) -> List[Dict]:
-        """Sugere ações de consolidação para cada grupo de duplicatas."""
-        groups = self.find_duplicates()
+        Args:
+            refresh: Recalcula os clusters em vez de usar os gravados
+        """
         suggestions = []
 
-        for group in groups:
-            primary = next((m for m in group['members'] if m['id'] == group['primary_id']), None)
-            others = [m for m in group['members'] if m['id'] != group['primary_id']]
+        for cluster in self.get_clusters(refresh):
+            if cluster['type'] == 'same_directory':
+                continue  # Nada a arquivar: é o mesmo diretório
+
+            primary = next((m for m in cluster['members'] if m['id'] == cluster['primary_id']), None)
+            archive, _ = self._split_cluster(cluster)
 
             suggestion = {
-                'group': group['name'],
-                'type': group['type'],
+                'group': cluster['name'],
+                'type': cluster['type'],
+                'evidence': cluster['evidence'],
                 'keep': {
                     'name': primary['name'] if primary else 'N/A',
                     'path': primary['path'] if primary else 'N/A',
                 },
-                'archive': [{'name': o['name'], 'path': o['path']} for o in others],
-                'action': group['action'],
-                'disk_savings_estimate': self._estimate_disk_savings(others),
+                'archive': [{'name': o['name'], 'path': o['path']} for o in archive],
+                'action': cluster['action'],
+                'disk_savings_estimate': self._estimate_disk_savings(archive),
             }
             suggestions.append(suggestion)
 
         return suggestions
 
     def _estimate_disk_savings(self, projects: List[Dict]) -> str:
-        """Estima economia de disco ao consolidar."""
-        total_size = 0
-        for p in projects:
-            path = Path(p['path'])
-            if path.exists():
-                try:
-                    for f in path.rglob('*'):
-                        if f.is_file() and 'node_modules' not in str(f):
-                            total_size += f.stat().st_size
-                except:
-                    pass
+        """
+        Estima economia de disco ao consolidar.
 
-        if total_size > 1_000_000_000:
-            return f"{total_size / 1_000_000_000:.1f} GB"
-        elif total_size > 1_000_000:
-            return f"{total_size / 1_000_000:.1f} MB"
-        elif total_size > 1_000:
-            return f"{total_size / 1_000:.1f} KB"
-        return "desconhecido"
+        Soma os tamanhos medidos pelo scanner (scan --disk-usage) dos
+        projetos e de todos os projetos sob eles, pela faixa de path no
+        índice idx_projects_disk_size, sem percorrer o disco.
+        """
+        # Um projeto dentro de outro da lista já entra na soma da subárvore
+        paths = sorted(p['path'] for p in projects)
+        roots = [path for i, path in enumerate(paths)
+                 if not any(path.startswith(other.rstrip('/') + '/') for other in paths[:i])]
+
+        measured = 0
+        source = ignored = 0
+        for path in roots:
+            prefix = path.rstrip('/') + '/'
+            row = self.conn.execute("""
+                SELECT COUNT(disk_size_source) AS measured,
+                       COALESCE(SUM(disk_size_source), 0) AS source,
+                       COALESCE(SUM(disk_size_ignored), 0) AS ignored
+                FROM projects
+                WHERE (path = ? OR (path >= ? AND path < ?)) AND status != 'archived'
+            """, (path, prefix, prefix[:-1] + '0')).fetchone()  # '0' vem logo depois de '/'
+            measured += row['measured']
+            source += row['source']
+            ignored += row['ignored']
+
+        if not measured:
+            return "desconhecido (rode scanner.py scan --disk-usage)"
+
+        total = source + ignored
+        if not ignored:
+            return self._format_size(total)
+        return f"{self._format_size(total)} ({self._format_size(ignored)} em diretórios ignorados)"
+
+    @staticmethod
+    def _format_size(size: int) -> str:
+        if size > 1_000_000_000:
+            return f"{size / 1_000_000_000:.1f} GB"
+        elif size > 1_000_000:
+            return f"{size / 1_000_000:.1f} MB"
+        elif size > 1_000:
+            return f"{size / 1_000:.1f} KB"
+        return f"{size} B"
+
+    def generate_report(self, refresh: bool = False) -> str:
+        """
+        Gera relatório Markdown de duplicatas.
 
-    def generate_report(self) -> str:
-        """Gera relatório Markdown de duplicatas."""
-        groups = self.find_duplicates()
+        Args:
+            refresh: Recalcula os clusters em vez de usar os gravados
+        """
+        clusters = self.get_clusters(refresh)
 
         lines = [
             "# Relatório de Duplicatas",
             f"\n**Data**: {datetime.now().strftime('%Y-%m-%d %H:%M')}",
-            f"**Grupos encontrados**: {len(groups)}",
+            f"**Clusters calculados em**: {self.clusters_computed_at} (UTC)",
+            f"**Clusters encontrados**: {len(clusters)}",
             "",
         ]
 
-        if not groups:
+        aliases = self.find_aliases()
+
+        if not clusters and not aliases:
             lines.append("Nenhuma duplicata encontrada.")
             return "\n".join(lines)
 
-        total_dups = sum(g['count'] - 1 for g in groups)
+        splits = [self._split_cluster(c) for c in clusters]
+        total_dups = sum(len(archive) for archive, _ in splits)
         lines.append(f"**Total de projetos redundantes**: {total_dups}")
         lines.append("")
 
-        for i, group in enumerate(groups, 1):
-            lines.append(f"## {i}. {group['name']} ({group['type']})")
-            lines.append(f"**Projetos**: {group['count']}")
-            lines.append(f"**Ação**: {group['action']}")
+        for i, (cluster, (_, same_directory)) in enumerate(zip(clusters, splits), 1):
+            lines.append(f"## {i}. {cluster['name']} ({cluster['type']})")
+            lines.append(f"**Projetos**: {cluster['count']}")
+            lines.append(f"**Evidências**: {', '.join(cluster['evidence'])}")
+            lines.append(f"**Ação**: {cluster['action']}")
             lines.append("")
 
-            for m in group['members']:
-                is_primary = " **(MANTER)**" if m['id'] == group['primary_id'] else " _(candidato a remoção)_"
-                lines.append(f"- `{m['path']}`{is_primary}")
+            for m in cluster['members']:
+                if m['id'] == cluster['primary_id']:
+                    label = " **(MANTER)**"
+                elif m['id'] in same_directory:
+                    label = " _(mesmo diretório)_"
+                else:
+                    label = " _(candidato a remoção)_"
+                lines.append(f"- `{m['path']}`{label} - {', '.join(cluster['member_evidence'][m['id']])}")
+
+            if cluster['pairs']:
+                lines.append("")
+                lines.append("| Par | Evidência | Similaridade | Detalhe |")
+                lines.append("|-----|-----------|--------------|---------|")
+                for pair in cluster['pairs']:
+                    lines.append(f"| `{pair['path_a']}` ↔ `{pair['path_b']}` | {pair['evidence']} | "
+                                 f"{pair['score']:.0%} | {self._pair_detail(pair)} |")
 
             lines.append("")
 
+        if aliases:
+            lines.append("## Diretórios alcançados por mais de um path")
+            lines.append("_Indexados uma vez só; não são cópias._")
+            lines.append("")
+            for a in aliases:
+                lines.append(f"- `{a['alias_path']}` → `{a['canonical_path']}` ({a['via']})")
+            lines.append("")
+
         return "\n".join(lines)
 
+    @staticmethod
+    def _pair_detail(pair: Dict) -> str:
+        if pair['evidence'] == 'same_content':
+            return f"{pair['matched_files']} arquivos iguais"
+        return f"{pair['name_a']} / {pair['name_b']}"
+
     def close(self):
         if self.conn:
             self.conn.close()
 
 
+def _list_files(root: str, ignore_dirs: Set[str]) -> List[Tuple[str, int, int, int]]:
+    """
+    Arquivos regulares não vazios de um projeto (roda no pool de processos).
+
+    Returns:
+        Lista de (path, tamanho, inode, mtime_ns); symlinks não são seguidos
+    """
+    files = []
+    stack = [root]
+    while stack:
+        directory = stack.pop()
+        try:
+            with os.scandir(directory) as it:
+                entries = list(it)
+        except OSError:
+            continue
+
+        for entry in entries:
+            try:
+                st = entry.stat(follow_symlinks=False)
+            except OSError:
+                continue
+            if stat.S_ISDIR(st.st_mode):
+                if entry.name not in ignore_dirs:
+                    stack.append(entry.path)
+            elif stat.S_ISREG(st.st_mode) and st.st_size > 0:
+                files.append((entry.path, st.st_size, st.st_ino, st.st_mtime_ns))
+
+    return files
+
+
+def _hash_files(paths: List[str], limit: Optional[int]) -> List[Tuple[str, Optional[str]]]:
+    """
+    Hash BLAKE2b dos arquivos (roda no pool de processos).
+
+    Args:
+        limit: Bytes lidos do início de cada arquivo (None = arquivo inteiro)
+
+    Returns:
+        Lista de (path, hash hex ou None se ilegível)
+    """
+    results = []
+    for path in paths:
+        digest = hashlib.blake2b(digest_size=16)
+        try:
+            with open(path, 'rb') as f:
+                if limit is not None:
+                    digest.update(f.read(limit))
+                else:
+                    for block in iter(lambda: f.read(1024 * 1024), b''):
+                        digest.update(block)
+        except OSError:
+            results.append((path, None))
+            continue
+        results.append((path, digest.hexdigest()))
+    return results
+
+
+def _trigrams(text: str) -> Set[str]:
+    """Trigramas de caracteres do texto com um espaço de borda em cada ponta."""
+    padded = f" {text} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+@lru_cache(maxsize=65536)
+def _trigram_hashes(trigram: str, num_hashes: int) -> array:
+    # Um digest SHAKE de tamanho variável dá as num_hashes funções de hash de uma vez
+    # (estável entre execuções, ao contrário de hash())
+    return array('I', hashlib.shake_128(trigram.encode('utf-8')).digest(num_hashes * 4))
+
+
+def _minhash(trigrams: Set[str], num_hashes: int) -> bytes:
+    """Assinatura MinHash (valores de 32 bits) de um conjunto de trigramas."""
+    columns = zip(*(_trigram_hashes(trigram, num_hashes) for trigram in sorted(trigrams)))
+    return array('I', map(min, columns)).tobytes()
+
+
+def _set_jaccard(a: Set[str], b: Set[str]) -> float:
+    union = len(a | b)
+    return len(a & b) / union if union else 0.0
+
+
+def _shared_bytes(keys_a: Counter, keys_b: Counter) -> Tuple[int, int]:
+    """Arquivos e bytes em comum entre dois multiconjuntos de (tamanho, hash)."""
+    files = 0
+    size_total = 0
+    for key, count in keys_a.items():
+        common = min(count, keys_b.get(key, 0))
+        files += common
+        size_total += common * key[0]
+    return files, size_total
+
+
+def _jaccard(shared: int, total_a: int, total_b: int) -> float:
+    """Jaccard ponderado: bytes em comum sobre os bytes da união."""
+    union = total_a + total_b - shared
+    return shared / union if union > 0 else 0.0
+
+
+class _UnionFind:
+    """Conjuntos disjuntos com compressão de caminho e união por tamanho."""
+
+    def __init__(self):
+        self.parent = {}
+        self.size = {}
+
+    def find(self, item: int) -> int:
+        parent = self.parent
+        if item not in parent:
+            parent[item] = item
+            self.size[item] = 1
+            return item
+
+        root = item
+        while parent[root] != root:
+            root = parent[root]
+        while parent[item] != root:
+            parent[item], item = root, parent[item]
+        return root
+
+    def union(self, a: int, b: int) -> int:
+        root_a, root_b = self.find(a), self.find(b)
+        if root_a == root_b:
+            return root_a
+        if self.size[root_a] < self.size[root_b]:
+            root_a, root_b = root_b, root_a
+        self.parent[root_b] = root_a
+        self.size[root_a] += self.size[root_b]
+        return root_a
+
+
 def main():
     parser = argparse.ArgumentParser(
         description='Análise de Duplicatas - Claude Projects Intelligence Hub'
     )
 
+    # Opções da detecção por conteúdo, comuns a todos os comandos
+    content_options = argparse.ArgumentParser(add_help=False)
+    content_options.add_argument('--content', action='store_true',
+                                 help='Comparar também o conteúdo dos arquivos (cópias renomeadas, '
+                                      'downloads sem .git)')
+    content_options.add_argument('--min-similarity', type=float, default=DuplicateAnalyzer.MIN_SIMILARITY,
+                                 help='Score mínimo de um par com --content (0-1, padrão: %(default)s)')
+    content_options.add_argument('--workers', type=int,
+                                 help='Processos de listagem/hashing com --content (padrão: CPUs)')
+
+    # Opções da detecção por nomes parecidos
+    fuzzy_options = argparse.ArgumentParser(add_help=False)
+    fuzzy_options.add_argument('--fuzzy', action='store_true',
+                               help='Agrupar também nomes parecidos (sisconect_v4, SisConect-final (1))')
+    fuzzy_options.add_argument('--name-similarity', type=float, default=DuplicateAnalyzer.NAME_SIMILARITY,
+                               help='Score mínimo de um par com --fuzzy (0-1, padrão: %(default)s)')
+
+    # Comandos que leem os clusters gravados pelo último find
+    cluster_options = argparse.ArgumentParser(add_help=False)
+    cluster_options.add_argument('--refresh', action='store_true',
+                                 help='Recalcular os clusters mesmo se os gravados ainda valem '
+                                      '(ex.: arquivos mudaram sem novo scan); não grava, só o find grava')
+
+    options = [content_options, fuzzy_options]
     subparsers = parser.add_subparsers(dest='command')
-    subparsers.add_parser('find', help='Encontrar duplicatas')
-    subparsers.add_parser('suggest-consolidation', help='Sugerir consolidação')
-    subparsers.add_parser('report', help='Gerar relatório Markdown')
+    subparsers.add_parser('find', help='Encontrar duplicatas', parents=options)
+    subparsers.add_parser('suggest-consolidation', help='Sugerir consolidação',
+                          parents=options + [cluster_options])
+    subparsers.add_parser('report', help='Gerar relatório Markdown', parents=options + [cluster_options])
 
     args = parser.parse_args()
 
@@ -348,31 +1505,52 @@ def main():
         parser.print_help()
         return
 
-    analyzer = DuplicateAnalyzer()
+    analyzer = DuplicateAnalyzer(content=args.content, min_similarity=args.min_similarity,
+                                 workers=args.workers, fuzzy=args.fuzzy,
+                                 name_similarity=args.name_similarity)
 
     try:
         if args.command == 'find':
-            groups = analyzer.find_duplicates()
+            clusters = analyzer.find_duplicates(save=True)
             print(f"\n{'='*60}")
-            print(f"DUPLICATAS ENCONTRADAS: {len(groups)} grupos")
+            print(f"DUPLICATAS ENCONTRADAS: {len(clusters)} clusters")
             print(f"{'='*60}\n")
 
-            for i, group in enumerate(groups, 1):
-                print(f"{i}. {group['name']} ({group['type']})")
-                print(f"   Projetos: {group['count']}")
-                for m in group['members']:
-                    marker = " [PRINCIPAL]" if m['id'] == group['primary_id'] else ""
+            for i, cluster in enumerate(clusters, 1):
+                print(f"{i}. {cluster['name']} ({cluster['type']})")
+                print(f"   Projetos: {cluster['count']}")
+                print(f"   Evidências: {', '.join(cluster['evidence'])}")
+                for m in cluster['members']:
+                    marker = " [PRINCIPAL]" if m['id'] == cluster['primary_id'] else ""
                     print(f"   - {m['name']} ({m['path']}){marker}")
+                for pair in cluster['pairs']:
+                    print(f"   ~ {pair['score']:.0%} {pair['path_a']} <-> {pair['path_b']} "
+                          f"({analyzer._pair_detail(pair)})")
                 print()
 
+            if args.content:
+                stats = analyzer.content_stats
+                print(f"Conteúdo: {stats['projects']} projetos, {stats['files']} arquivos; pares por "
+                      f"tamanho {stats['pairs_by_size']}, por hash parcial {stats['pairs_by_partial_hash']}, "
+                      f"similares {stats['pairs_similar']}")
+                print(f"Hashes calculados: {stats.get('files_hashed_partial', 0)} parciais, "
+                      f"{stats.get('files_hashed_full', 0)} completos (o resto veio do cache)")
+
+            if args.fuzzy:
+                stats = analyzer.fuzzy_stats
+                print(f"Nomes: {stats['projects']} projetos, {stats['names']} nomes normalizados; "
+                      f"candidatos por LSH {stats['candidates']}, parecidos {stats['pairs_similar']}")
+                print(f"Assinaturas calculadas: {stats['names_indexed']} (o resto veio de name_signatures)")
+
         elif args.command == 'suggest-consolidation':
-            suggestions = analyzer.suggest_consolidation()
+            suggestions = analyzer.suggest_consolidation(refresh=args.refresh)
             print(f"\n{'='*60}")
             print(f"SUGESTÕES DE CONSOLIDAÇÃO")
             print(f"{'='*60}\n")
 
             for s in suggestions:
                 print(f"Grupo: {s['group']} ({s['type']})")
+                print(f"  Evidências: {', '.join(s['evidence'])}")
                 print(f"  Manter: {s['keep']['name']} ({s['keep']['path']})")
                 for a in s['archive']:
                     print(f"  Arquivar: {a['name']} ({a['path']})")
@@ -381,7 +1559,7 @@ def main():
                 print()
 
         elif args.command == 'report':
-            print(analyzer.generate_report())
+            print(analyzer.generate_report(refresh=args.refresh))
 
     finally:
         analyzer.close()
@@ -56,7 +56,7 @@ class PriorityAnalyzer:
             Dicionário com score e breakdown
         """
         cursor = self.conn.execute(
-            "SELECT * FROM projects WHERE name = ? AND parent_project_id IS NULL",
+            "SELECT * FROM projects WHERE name = ? AND parent_project_id IS NULL AND status != 'archived'",
             (project_name,)
         )
         project = cursor.fetchone()
@@ -118,7 +118,7 @@ class PriorityAnalyzer:
         subproject_count = 0
         if project['is_monorepo']:
             cursor2 = self.conn.execute(
-                "SELECT COUNT(*) as cnt FROM projects WHERE parent_project_id = ?",
+                "SELECT COUNT(*) as cnt FROM projects WHERE parent_project_id = ? AND status != 'archived'",
                 (project['id'],)
             )
             subproject_count = cursor2.fetchone()['cnt']
@@ -147,7 +147,8 @@ class PriorityAnalyzer:
 
         # 6. Duplicatas (penalizar projetos duplicados: +0.5)
         cursor3 = self.conn.execute(
-            "SELECT COUNT(*) as cnt FROM projects WHERE name = ? AND parent_project_id IS NULL",
+            "SELECT COUNT(*) as cnt FROM projects "
+            "WHERE name = ? AND parent_project_id IS NULL AND status != 'archived'",
             (project_name,)
         )
         dup_count = cursor3.fetchone()['cnt']
@@ -192,7 +193,7 @@ class PriorityAnalyzer:
         priority = int(round(score))
 
         self.conn.execute(
-            "UPDATE projects SET priority = ? WHERE name = ? AND parent_project_id IS NULL",
+            "UPDATE projects SET priority = ? WHERE name = ? AND parent_project_id IS NULL AND status != 'archived'",
             (priority, project_name)
         )
         self.conn.commit()
@@ -220,9 +221,11 @@ class PriorityAnalyzer:
                 is_monorepo,
                 framework,
                 git_last_commit_date,
-                (SELECT COUNT(*) FROM projects sub WHERE sub.parent_project_id = projects.id) as subproject_count
+                (SELECT COUNT(*) FROM projects sub
+                 WHERE sub.parent_project_id = projects.id AND sub.status != 'archived') as subproject_count
             FROM projects
             WHERE parent_project_id IS NULL
+              AND status != 'archived'
             ORDER BY priority ASC, name ASC
         """
 
@@ -294,10 +297,33 @@ class PriorityAnalyzer:
 
         return "; ".join(reasons) if reasons else "Próximo na fila"
 
+    def update_priorities(self, project_names: List[str]) -> int:
+        """
+        Recalcula a prioridade de vários projetos raiz em uma única transação.
+
+        Usado pelo `scanner.py update-recent`, que recalcula só os projetos
+        alterados em vez de rodar update-all.
+
+        Returns:
+            Número de projetos atualizados
+        """
+        rows = []
+        for name in project_names:
+            result = self.calculate_priority(name)
+            if 'error' not in result:
+                rows.append((int(round(result['score'])), name))
+
+        self.conn.executemany(
+            "UPDATE projects SET priority = ? WHERE name = ? AND parent_project_id IS NULL AND status != 'archived'",
+            rows
+        )
+        self.conn.commit()
+        return len(rows)
+
     def update_all_priorities(self) -> int:
         """Atualiza prioridade de todos os projetos raiz."""
         cursor = self.conn.execute(
-            "SELECT name FROM projects WHERE parent_project_id IS NULL"
+            "SELECT name FROM projects WHERE parent_project_id IS NULL AND status != 'archived'"
         )
         projects = cursor.fetchall()
 
@@ -16,6 +16,11 @@ from pathlib import Path
 from datetime import datetime, timedelta
 from typing import Dict, List
 import json
+import sys
+
+# Schema e migrações compartilhados com o scanner
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'index'))
+from schema import ensure_schema  # noqa: E402
 
 class StatusAnalyzer:
     """Analisador de status de projetos."""
@@ -38,6 +43,8 @@ class StatusAnalyzer:
 
         self.conn = sqlite3.connect(str(self.db_path))
         self.conn.row_factory = sqlite3.Row
+        # Bancos de scans antigos: sem status_before_prune
+        ensure_schema(self.conn)
 
     def analyze_status(self, project_name: str) -> Dict:
         """
@@ -52,8 +59,10 @@ class StatusAnalyzer:
         Returns:
             Dicionário com status e razões
         """
+        # Projetos arquivados pelo sweep do scanner (diretório sumiu) ficam de fora:
+        # o status anterior volta sozinho se o diretório reaparecer
         cursor = self.conn.execute(
-            "SELECT * FROM projects WHERE name = ?",
+            "SELECT * FROM projects WHERE name = ? AND status_before_prune IS NULL",
             (project_name,)
         )
         project = cursor.fetchone()
@@ -129,7 +138,7 @@ class StatusAnalyzer:
             return True
 
         self.conn.execute(
-            "UPDATE projects SET status = ? WHERE name = ?",
+            "UPDATE projects SET status = ? WHERE name = ? AND status_before_prune IS NULL",
             (result['suggested_status'], project_name)
         )
         self.conn.commit()
@@ -139,7 +148,7 @@ class StatusAnalyzer:
 
     def analyze_all(self) -> Dict:
         """Analisa status de todos os projetos."""
-        cursor = self.conn.execute("SELECT name FROM projects")
+        cursor = self.conn.execute("SELECT name FROM projects WHERE status_before_prune IS NULL")
         projects = [row['name'] for row in cursor.fetchall()]
 
         results = {
@@ -0,0 +1,250 @@
+#!/usr/bin/env python3
+"""
+Benchmark da Detecção de Duplicatas - Claude Projects Intelligence Hub
+
+Gera bancos sintéticos com N projetos (nomes repetidos, cópias com sufixo
+-backup/-v2/..., remotes compartilhados) e mede DuplicateAnalyzer.find_duplicates
+sem a detecção por conteúdo, com o tempo de _find_similar_names e do
+agrupamento em clusters (_cluster, union-find) à parte. O tempo por linha
+deve ficar estável quando N cresce: a análise é quase linear no número de
+projetos.
+
+Antes de medir, confere que _find_similar_names dá o mesmo resultado que a
+implementação quadrática original (embutida aqui) em uma amostra pequena.
+
+Uso:
+    python3 bench_duplicates.py run
+    python3 bench_duplicates.py run --sizes 1000,10000,100000 --max-ratio 3 --output atual.json
+"""
+
+import argparse
+import json
+import platform
+import random
+import sqlite3
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List
+
+ROOT_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT_DIR / "analysis"))
+sys.path.insert(0, str(ROOT_DIR / "index"))
+
+from duplicates import DuplicateAnalyzer  # noqa: E402
+from git_reader import canonical_remote  # noqa: E402
+from schema import ensure_schema  # noqa: E402
+
+WORDS = ['api', 'app', 'web', 'core', 'data', 'auth', 'site', 'bot', 'cli', 'sdk',
+         'admin', 'shop', 'blog', 'chat', 'docs', 'mobile', 'infra', 'tools']
+
+
+def build_database(db_path: Path, rows: int, seed: int) -> Dict:
+    """Cria um projects.db sintético com `rows` projetos raiz."""
+    rand = random.Random(seed)
+    conn = sqlite3.connect(str(db_path))
+    ensure_schema(conn)
+
+    suffixes = DuplicateAnalyzer.COPY_SUFFIXES
+    records = []
+    copies = 0
+    for i in range(rows):
+        # ~1/3 dos nomes reaproveitam uma base anterior (mesmo nome ou cópia com sufixo)
+        if i and rand.random() < 0.33:
+            base = f"{rand.choice(WORDS)}-{rand.randrange(max(1, i // 3)):06d}"
+            name = base + rand.choice(suffixes) if rand.random() < 0.7 else base
+            copies += 1
+        else:
+            name = f"{rand.choice(WORDS)}-{i // 3:06d}"
+
+        # Maiúsculas mudam a ordem do ORDER BY name: a cópia pode vir antes do original
+        if rand.random() < 0.1:
+            name = name.capitalize()
+
+        remote = f"git@github.com:org/{name}.git" if rand.random() < 0.3 else None
+        records.append((
+            name, f"/bench/{i // 1000:03d}/{name}-{i}", 'nodejs',
+            1 if remote else 0, remote, canonical_remote(remote),
+            f"2024-{rand.randint(1, 12):02d}-{rand.randint(1, 28):02d}" if remote else None,
+            1 if rand.random() < 0.2 else 0,
+        ))
+
+    conn.executemany(
+        "INSERT INTO projects (name, path, type, has_git, git_remote, git_remote_canonical, "
+        "git_last_commit_date, has_claude_md) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+        records,
+    )
+    conn.commit()
+    conn.close()
+    return {'rows': rows, 'reused_names': copies}
+
+
+def legacy_similar_names(analyzer: DuplicateAnalyzer) -> List[Dict]:
+    """_find_similar_names original (O(n²)), só para conferir equivalência."""
+    cursor = analyzer.conn.execute(
+        f"SELECT {', '.join(analyzer.PROJECT_FIELDS)} "
+        f"FROM projects WHERE parent_project_id IS NULL ORDER BY name"
+    )
+    projects = [dict(row) for row in cursor.fetchall()]
+
+    def strip_suffix(name):
+        for suffix in analyzer.COPY_SUFFIXES:
+            if name.endswith(suffix):
+                return name[:name.rfind(suffix)]
+        return name
+
+    groups = []
+    seen = set()
+    for p in projects:
+        if p['id'] in seen:
+            continue
+        base_name = strip_suffix(p['name'].lower())
+        related = [p]
+        for other in projects:
+            if other['id'] == p['id'] or other['id'] in seen:
+                continue
+            other_name = other['name'].lower()
+            if base_name == strip_suffix(other_name) and base_name != other_name:
+                related.append(other)
+
+        if len(related) > 1:
+            seen.update(r['id'] for r in related)
+            primary = analyzer._select_primary(related)
+            groups.append({
+                'type': 'similar_name',
+                'name': base_name,
+                'count': len(related),
+                'members': related,
+                'primary_id': primary['id'] if primary else None,
+                'action': 'verificar se são versões diferentes e consolidar',
+            })
+    return groups
+
+
+def check_equivalence(workdir: Path, rows: int, seed: int) -> Dict:
+    """Compara as implementações nova e original em um banco pequeno."""
+    db_path = workdir / f"check-{rows}.db"
+    build_database(db_path, rows, seed)
+    analyzer = DuplicateAnalyzer(str(db_path))
+    try:
+        similar = analyzer._find_similar_names()
+        if similar != legacy_similar_names(analyzer):
+            raise AssertionError("_find_similar_names diverge da implementação original")
+    finally:
+        analyzer.close()
+
+    return {'rows': rows, 'similar_groups': len(similar)}
+
+
+def timed(func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    return time.perf_counter() - start, result
+
+
+def measure(db_path: Path, repeat: int) -> Dict:
+    """Mediana de `repeat` execuções de cada etapa."""
+    analyzer = DuplicateAnalyzer(str(db_path))
+    samples = {'similar_names': [], 'cluster': [], 'find_duplicates': []}
+    try:
+        for _ in range(repeat):
+            seconds, similar = timed(analyzer._find_similar_names)
+            samples['similar_names'].append(seconds)
+
+            groups = analyzer._find_same_name() + similar + analyzer._find_same_remote()
+            seconds, _ = timed(analyzer._cluster, groups)
+            samples['cluster'].append(seconds)
+
+            seconds, found = timed(analyzer.find_duplicates, True)  # como o comando find (grava)
+            samples['find_duplicates'].append(seconds)
+    finally:
+        analyzer.close()
+
+    result = {key: round(statistics.median(values), 4) for key, values in samples.items()}
+    result['clusters'] = len(found)
+    return result
+
+
+def run_benchmark(args) -> Dict:
+    sizes = sorted(int(s) for s in args.sizes.split(','))
+    results = {
+        'timestamp': datetime.now().isoformat(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'config': {'sizes': sizes, 'repeat': args.repeat, 'seed': args.seed},
+        'sizes': [],
+    }
+
+    with tempfile.TemporaryDirectory(prefix='bench-duplicates-') as tmp:
+        workdir = Path(tmp)
+
+        if args.check_rows:
+            check = check_equivalence(workdir, args.check_rows, args.seed)
+            results['equivalence'] = check
+            print(f"Equivalência com a implementação original: OK "
+                  f"({check['rows']} linhas, {check['similar_groups']} grupos de nome similar)",
+                  file=sys.stderr)
+
+        for rows in sizes:
+            db_path = workdir / f"bench-{rows}.db"
+            build_database(db_path, rows, args.seed)
+            measured = measure(db_path, args.repeat)
+            measured['rows'] = rows
+            measured['us_per_row'] = round(measured['find_duplicates'] / rows * 1e6, 2)
+            results['sizes'].append(measured)
+
+            print(f"{rows:>8} linhas: find_duplicates {measured['find_duplicates']:.3f}s "
+                  f"(nomes similares {measured['similar_names']:.3f}s, "
+                  f"clusters {measured['cluster']:.4f}s) "
+                  f"- {measured['us_per_row']:.2f} µs/linha, {measured['clusters']} clusters",
+                  file=sys.stderr)
+
+    # Linear: o custo por linha no maior N não pode disparar em relação ao menor
+    first, last = results['sizes'][0], results['sizes'][-1]
+    results['growth'] = round(last['us_per_row'] / first['us_per_row'], 2) if first['us_per_row'] else None
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Benchmark da Detecção de Duplicatas - Claude Projects Intelligence Hub'
+    )
+    subparsers = parser.add_subparsers(dest='command')
+
+    # Comando: run
+    run_parser = subparsers.add_parser('run', help='Gerar bancos sintéticos e medir find_duplicates')
+    run_parser.add_argument('--sizes', default='1000,10000,100000',
+                            help='Números de projetos, separados por vírgula')
+    run_parser.add_argument('--repeat', type=int, default=3, help='Execuções por tamanho (mediana)')
+    run_parser.add_argument('--seed', type=int, default=42, help='Semente do gerador')
+    run_parser.add_argument('--check-rows', type=int, default=2000,
+                            help='Linhas da conferência com a implementação original (0 = pular)')
+    run_parser.add_argument('--max-ratio', type=float, default=3.0,
+                            help='Crescimento máximo do tempo por linha entre o menor e o maior N')
+    run_parser.add_argument('--output', help='Gravar o resultado JSON neste arquivo')
+
+    args = parser.parse_args()
+
+    if args.command is None:
+        parser.print_help()
+        return
+
+    if args.command == 'run':
+        results = run_benchmark(args)
+        output = json.dumps(results, indent=2)
+        if args.output:
+            Path(args.output).write_text(output + "\n", encoding='utf-8')
+            print(f"Resultado gravado em {args.output}", file=sys.stderr)
+        print(output)
+
+        if results['growth'] is not None and results['growth'] > args.max_ratio:
+            print(f"\nTempo por linha cresceu {results['growth']}x (limite {args.max_ratio}x): "
+                  f"não é linear.", file=sys.stderr)
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
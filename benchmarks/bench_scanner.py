@@ -0,0 +1,432 @@
+#!/usr/bin/env python3
+"""
+Benchmark do Scanner - Claude Projects Intelligence Hub
+
+Gera uma árvore sintética de projetos em um diretório temporário e mede
+ProjectScanner.scan_location nos modos cold, warm e incremental. Cada
+medição roda em um subprocesso próprio, para que o pico de RSS seja só dela.
+
+Modos:
+    cold         banco vazio (todas as linhas inseridas)
+    warm         mesmo banco, segundo scan completo (UPDATEs, cache do SO quente)
+    incremental  --incremental depois de um scan que gravou os fingerprints
+
+Uso:
+    python3 bench_scanner.py run
+    python3 bench_scanner.py run --nodejs 500 --python 200 --workers 4 --output atual.json
+    python3 bench_scanner.py compare base.json atual.json --threshold 10
+"""
+
+import argparse
+import json
+import os
+import platform
+import random
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List
+
+INDEX_DIR = Path(__file__).resolve().parent.parent / "index"
+
+MODES = ['cold', 'warm', 'incremental']
+
+
+class SyntheticTree:
+    """Gerador determinístico de árvores de projetos para benchmark."""
+
+    NODE_FRAMEWORKS = [
+        {'next': '^14.0.0', 'react': '^18.2.0'},
+        {'express': '^4.18.0'},
+        {'@nestjs/core': '^10.0.0'},
+        {'react': '^18.2.0', 'vite': '^5.0.0'},
+        {'lodash': '^4.17.21'},
+    ]
+    NODE_LOCKFILES = ['pnpm-lock.yaml', 'yarn.lock', 'package-lock.json']
+    WORKSPACE_KINDS = ['pnpm', 'turbo', 'nx']
+
+    def __init__(self, root: Path, config: Dict):
+        self.root = Path(root)
+        self.config = config
+        self.random = random.Random(config['seed'])
+        self.projects = 0
+        self.git_repos = []
+
+    def build(self) -> Dict:
+        """Cria a árvore e retorna contagens (projetos, diretórios visitáveis)."""
+        self.root.mkdir(parents=True, exist_ok=True)
+        cfg = self.config
+
+        for i in range(cfg['nodejs']):
+            self._nodejs_project(self.root / 'nodejs' / f'app-{i:04d}')
+        for i in range(cfg['python']):
+            self._python_project(self.root / 'python' / f'svc-{i:04d}')
+        for i in range(cfg['rust']):
+            self._rust_project(self.root / 'rust' / f'crate-{i:04d}')
+        for i in range(cfg['monorepos']):
+            kind = self.WORKSPACE_KINDS[i % len(self.WORKSPACE_KINDS)]
+            self._monorepo(self.root / 'monorepos' / f'mono-{i:03d}', kind, nested=True)
+
+        git_available = shutil.which('git') is not None
+        if cfg['git_repos'] and not git_available:
+            print("Aviso: git não encontrado, repositórios não serão criados", file=sys.stderr)
+        elif git_available:
+            for repo in self.git_repos[:cfg['git_repos']]:
+                self._git_init(repo, cfg['commits'])
+
+        return {'projects': self.projects, 'dirs': count_scanned_dirs(self.root, cfg['max_depth'])}
+
+    # ------------------------------------------------------------------
+    # Projetos
+    # ------------------------------------------------------------------
+
+    def _write(self, path: Path, content: str):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(content, encoding='utf-8')
+
+    def _doc(self, title: str) -> str:
+        lines = [f"# {title}", ""]
+        for i in range(self.config['doc_lines']):
+            lines.append(f"Linha {i} de documentação sintética para medir a contagem de linhas.")
+        return "\n".join(lines) + "\n"
+
+    def _package_json(self, name: str, deps: Dict, extra: Dict = None) -> str:
+        data = {'name': name, 'version': '1.0.0', 'dependencies': deps}
+        data.update(extra or {})
+        return json.dumps(data, indent=2)
+
+    def _node_modules(self, path: Path):
+        """Volume ignorado pelo scanner (deve custar só uma entrada na listagem)."""
+        for i in range(self.config['node_modules']):
+            pkg = path / 'node_modules' / f'dep-{i:04d}'
+            self._write(pkg / 'package.json', self._package_json(f'dep-{i}', {}))
+            self._write(pkg / 'index.js', 'module.exports = {};\n')
+
+    def _nodejs_project(self, path: Path):
+        deps = self.random.choice(self.NODE_FRAMEWORKS)
+        self._write(path / 'package.json', self._package_json(path.name, deps))
+        self._write(path / self.random.choice(self.NODE_LOCKFILES), '')
+        self._write(path / 'README.md', self._doc(path.name))
+        self._write(path / 'src' / 'index.js', 'console.log("ok");\n')
+        self._write(path / 'src' / 'lib' / 'util.js', 'export const x = 1;\n')
+        self._node_modules(path)
+        self.git_repos.append(path)
+        self.projects += 1
+
+    def _python_project(self, path: Path):
+        if self.random.random() < 0.5:
+            self._write(path / 'pyproject.toml', f'[tool.poetry]\nname = "{path.name}"\n')
+            self._write(path / 'poetry.lock', '')
+        else:
+            self._write(path / 'requirements.txt', 'requests\n')
+        self._write(path / 'CLAUDE.md', self._doc(path.name))
+        self._write(path / 'pkg' / '__init__.py', '')
+        self._write(path / 'tests' / 'test_pkg.py', 'def test_ok():\n    pass\n')
+        self.git_repos.append(path)
+        self.projects += 1
+
+    def _rust_project(self, path: Path):
+        self._write(path / 'Cargo.toml', f'[package]\nname = "{path.name}"\n')
+        self._write(path / 'src' / 'main.rs', 'fn main() {}\n')
+        self._write(path / 'target' / 'debug' / 'build.log', 'ignorado\n')
+        self.projects += 1
+
+    def _monorepo(self, path: Path, kind: str, nested: bool):
+        if kind == 'pnpm':
+            self._write(path / 'pnpm-workspace.yaml', "packages:\n  - 'packages/*'\n  - 'apps/*'\n")
+            self._write(path / 'pnpm-lock.yaml', '')
+        elif kind == 'turbo':
+            self._write(path / 'turbo.json', '{"pipeline": {}}')
+        else:
+            self._write(path / 'nx.json', '{"workspaceLayout": {"libsDir": "packages", "appsDir": "apps"}}')
+
+        self._write(path / 'package.json', self._package_json(
+            path.name, {}, {'private': True, 'workspaces': ['packages/*', 'apps/*']}
+        ))
+        self._write(path / 'CLAUDE.md', self._doc(path.name))
+        self.git_repos.append(path)
+        self.projects += 1
+
+        for i in range(self.config['packages']):
+            pkg = path / 'packages' / f'pkg-{i:02d}'
+            self._write(pkg / 'package.json', self._package_json(pkg.name, {'react': '^18.2.0'}))
+            self._write(pkg / 'src' / 'index.ts', 'export {};\n')
+            self.projects += 1
+
+        web = path / 'apps' / 'web'
+        self._write(web / 'package.json', self._package_json('web', {'next': '^14.0.0'}))
+        self._node_modules(web)
+        self.projects += 1
+
+        # Um workspace dentro do outro (ex.: apps/platform com seu próprio pnpm)
+        if nested:
+            inner_kind = self.WORKSPACE_KINDS[(self.WORKSPACE_KINDS.index(kind) + 1) % len(self.WORKSPACE_KINDS)]
+            self._monorepo(path / 'apps' / 'platform', inner_kind, nested=False)
+
+    def _git_init(self, path: Path, commits: int):
+        """Repositório real com `commits` commits e um remote origin."""
+        env = dict(os.environ, GIT_AUTHOR_NAME='bench', GIT_AUTHOR_EMAIL='bench@example.com',
+                   GIT_COMMITTER_NAME='bench', GIT_COMMITTER_EMAIL='bench@example.com')
+
+        def git(*args):
+            subprocess.run(['git', '-C', str(path), *args], env=env, check=True,
+                           stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+        git('init', '-q', '-b', 'main')
+        git('remote', 'add', 'origin', f'git@github.com:bench/{path.name}.git')
+        for i in range(commits):
+            self._write(path / 'CHANGELOG.txt', f'versão {i}\n')
+            git('add', 'CHANGELOG.txt')
+            git('commit', '-q', '-m', f'commit {i}')
+
+
+def count_scanned_dirs(root: Path, max_depth: int) -> int:
+    """Diretórios que o scanner visita (mesmos IGNORE_DIRS e limite de profundidade)."""
+    sys.path.insert(0, str(INDEX_DIR))
+    from scanner import ProjectScanner
+
+    total = 0
+    stack = [(Path(root), 0)]
+    while stack:
+        path, depth = stack.pop()
+        total += 1
+        if depth + 1 > max_depth:
+            continue
+        try:
+            with os.scandir(path) as entries:
+                for entry in entries:
+                    if entry.is_dir(follow_symlinks=True) and entry.name not in ProjectScanner.IGNORE_DIRS:
+                        stack.append((Path(entry.path), depth + 1))
+        except PermissionError:
+            pass
+    return total
+
+
+def measure(tree: str, db: str, mode: str, workers: int, batch_size: int, max_depth: int) -> Dict:
+    """Executa um scan neste processo (chamado pelo subcomando _measure)."""
+    import resource
+
+    sys.path.insert(0, str(INDEX_DIR))
+    from scanner import ProjectScanner
+
+    scanner = ProjectScanner(db_path=db, max_depth=max_depth, workers=workers,
+                             incremental=(mode == 'incremental'), batch_size=batch_size)
+    start = time.perf_counter()
+    stats = scanner.scan_location(tree)
+    wall = time.perf_counter() - start
+    scanner.close()
+
+    # ru_maxrss: KB no Linux, bytes no macOS
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    rss_mb = rss / (1024 * 1024) if sys.platform == 'darwin' else rss / 1024
+
+    return {
+        'wall_seconds': wall,
+        'peak_rss_mb': round(rss_mb, 1),
+        'projects_found': stats['projects_found'],
+        'rows_written': stats['rows_written'],
+    }
+
+
+def run_measure(tree: Path, db: Path, mode: str, args) -> Dict:
+    """Roda `measure` em um subprocesso novo e retorna o resultado."""
+    result = subprocess.run(
+        [sys.executable, str(Path(__file__).resolve()), '_measure',
+         '--tree', str(tree), '--db', str(db), '--mode', mode,
+         '--workers', str(args.workers), '--batch-size', str(args.batch_size),
+         '--max-depth', str(args.max_depth)],
+        capture_output=True, text=True, check=True
+    )
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def run_benchmark(args) -> Dict:
+    """Gera a árvore (ou reaproveita --tree) e mede os modos pedidos."""
+    config = {
+        'nodejs': args.nodejs,
+        'python': args.python,
+        'rust': args.rust,
+        'monorepos': args.monorepos,
+        'packages': args.packages,
+        'git_repos': args.git_repos,
+        'commits': args.commits,
+        'doc_lines': args.doc_lines,
+        'node_modules': args.node_modules,
+        'max_depth': args.max_depth,
+        'seed': args.seed,
+    }
+    modes = [m.strip() for m in args.modes.split(',') if m.strip()]
+    for mode in modes:
+        if mode not in MODES:
+            raise SystemExit(f"Modo inválido: {mode} (use {', '.join(MODES)})")
+
+    workdir = Path(tempfile.mkdtemp(prefix='bench-scanner-'))
+    db = workdir / 'bench.db'
+
+    try:
+        if args.tree:
+            tree = Path(args.tree).resolve()
+            tree_info = {'projects': None, 'dirs': count_scanned_dirs(tree, args.max_depth)}
+        else:
+            tree = workdir / 'tree'
+            print(f"Gerando árvore sintética em {tree}...", file=sys.stderr)
+            start = time.perf_counter()
+            tree_info = SyntheticTree(tree, config).build()
+            tree_info['build_seconds'] = round(time.perf_counter() - start, 2)
+
+        results = {}
+        for mode in modes:
+            runs = []
+            for _ in range(args.repeat):
+                if mode == 'cold' and db.exists():
+                    db.unlink()
+                elif mode != 'cold' and not db.exists():
+                    # warm/incremental partem de um banco já populado
+                    run_measure(tree, db, 'cold', args)
+                if mode == 'incremental':
+                    # Scan incremental não medido que grava os fingerprints atuais
+                    run_measure(tree, db, 'incremental', args)
+                runs.append(run_measure(tree, db, mode, args))
+
+            wall = statistics.median(r['wall_seconds'] for r in runs)
+            results[mode] = {
+                'wall_seconds': round(wall, 4),
+                'dirs_per_second': round(tree_info['dirs'] / wall, 1) if wall else None,
+                'peak_rss_mb': max(r['peak_rss_mb'] for r in runs),
+                'projects_found': runs[-1]['projects_found'],
+                'rows_written': runs[-1]['rows_written'],
+                'runs': [round(r['wall_seconds'], 4) for r in runs],
+            }
+            print(f"{mode:<12} {wall:8.3f}s  {results[mode]['dirs_per_second']} dirs/s  "
+                  f"{results[mode]['peak_rss_mb']} MB", file=sys.stderr)
+
+        return {
+            'created_at': datetime.now().isoformat(timespec='seconds'),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'workers': args.workers,
+            'batch_size': args.batch_size,
+            'config': config if not args.tree else {'tree': str(tree)},
+            'tree': tree_info,
+            'modes': results,
+        }
+    finally:
+        if args.keep:
+            print(f"Árvore e banco mantidos em {workdir}", file=sys.stderr)
+        else:
+            shutil.rmtree(workdir, ignore_errors=True)
+
+
+def compare_results(base: Dict, current: Dict, threshold: float) -> List[str]:
+    """
+    Compara dois resultados modo a modo.
+
+    Returns:
+        Lista de regressões (tempo ou RSS acima de `threshold` %)
+    """
+    regressions = []
+    print(f"{'Modo':<12}{'Métrica':<16}{'Base':>12}{'Atual':>12}{'Δ %':>9}")
+
+    for mode, current_metrics in current['modes'].items():
+        base_metrics = base['modes'].get(mode)
+        if not base_metrics:
+            continue
+
+        for metric in ('wall_seconds', 'dirs_per_second', 'peak_rss_mb'):
+            before, after = base_metrics.get(metric), current_metrics.get(metric)
+            if not before or after is None:
+                continue
+            delta = (after - before) / before * 100
+            # dirs/s é o inverso do tempo: regressão só é avaliada em tempo e memória
+            flag = ''
+            if metric != 'dirs_per_second' and delta > threshold:
+                flag = '  REGRESSÃO'
+                regressions.append(f"{mode} {metric}: {delta:+.1f}%")
+            print(f"{mode:<12}{metric:<16}{before:>12}{after:>12}{delta:>+8.1f}%{flag}")
+
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Benchmark do Scanner - Claude Projects Intelligence Hub'
+    )
+    subparsers = parser.add_subparsers(dest='command')
+
+    # Comando: run
+    run_parser = subparsers.add_parser('run', help='Gerar árvore sintética e medir os modos')
+    run_parser.add_argument('--nodejs', type=int, default=200, help='Projetos Node.js')
+    run_parser.add_argument('--python', type=int, default=100, help='Projetos Python')
+    run_parser.add_argument('--rust', type=int, default=50, help='Projetos Rust')
+    run_parser.add_argument('--monorepos', type=int, default=12,
+                            help='Monorepos (pnpm/turbo/nx, cada um com um workspace aninhado)')
+    run_parser.add_argument('--packages', type=int, default=8, help='Pacotes por monorepo')
+    run_parser.add_argument('--git-repos', type=int, default=50, help='Projetos com `git init` real')
+    run_parser.add_argument('--commits', type=int, default=5, help='Commits por repositório git')
+    run_parser.add_argument('--doc-lines', type=int, default=2000,
+                            help='Linhas de cada README.md/CLAUDE.md')
+    run_parser.add_argument('--node-modules', type=int, default=50,
+                            help='Pacotes em node_modules por projeto Node.js (ignorados pelo scan)')
+    run_parser.add_argument('--seed', type=int, default=42, help='Semente do gerador')
+    run_parser.add_argument('--tree', help='Usar uma árvore existente em vez de gerar')
+    run_parser.add_argument('--modes', default=','.join(MODES), help='Modos separados por vírgula')
+    run_parser.add_argument('--repeat', type=int, default=3, help='Execuções por modo (mediana)')
+    run_parser.add_argument('--workers', type=int, default=1, help='Threads do walker')
+    run_parser.add_argument('--batch-size', type=int, default=500, help='Projetos por transação')
+    run_parser.add_argument('--max-depth', type=int, default=10, help='Profundidade máxima')
+    run_parser.add_argument('--output', help='Gravar o resultado JSON neste arquivo')
+    run_parser.add_argument('--keep', action='store_true', help='Não apagar a árvore e o banco')
+
+    # Comando: compare
+    compare_parser = subparsers.add_parser('compare', help='Comparar dois resultados JSON')
+    compare_parser.add_argument('base', help='Resultado de referência')
+    compare_parser.add_argument('current', help='Resultado atual')
+    compare_parser.add_argument('--threshold', type=float, default=10.0,
+                                help='Piora percentual considerada regressão (padrão: 10)')
+
+    # Uso interno: uma medição por subprocesso
+    measure_parser = subparsers.add_parser('_measure')
+    measure_parser.add_argument('--tree', required=True)
+    measure_parser.add_argument('--db', required=True)
+    measure_parser.add_argument('--mode', choices=MODES, required=True)
+    measure_parser.add_argument('--workers', type=int, default=1)
+    measure_parser.add_argument('--batch-size', type=int, default=500)
+    measure_parser.add_argument('--max-depth', type=int, default=10)
+
+    args = parser.parse_args()
+
+    if args.command is None:
+        parser.print_help()
+        return
+
+    if args.command == '_measure':
+        print(json.dumps(measure(args.tree, args.db, args.mode, args.workers,
+                                 args.batch_size, args.max_depth)))
+
+    elif args.command == 'run':
+        results = run_benchmark(args)
+        output = json.dumps(results, indent=2)
+        if args.output:
+            Path(args.output).write_text(output + "\n", encoding='utf-8')
+            print(f"Resultado gravado em {args.output}", file=sys.stderr)
+        print(output)
+
+    elif args.command == 'compare':
+        base = json.loads(Path(args.base).read_text(encoding='utf-8'))
+        current = json.loads(Path(args.current).read_text(encoding='utf-8'))
+        regressions = compare_results(base, current, args.threshold)
+        if regressions:
+            print(f"\n{len(regressions)} regressão(ões) acima de {args.threshold}%:")
+            for r in regressions:
+                print(f"  - {r}")
+            sys.exit(1)
+        print("\nSem regressões.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,781 @@
+#!/usr/bin/env python3
+"""
+Leitor nativo de repositórios Git - Claude Projects Intelligence Hub
+
+Lê branch, remote, data do último commit e commits raiz diretamente de
+`.git`, sem subprocessos. Entende HEAD, config, refs soltas, packed-refs,
+objetos soltos, packfiles (índice v2, incluindo deltas) e commit-graph
+(arquivo único ou cadeia de camadas).
+
+Layouts não suportados (worktrees, alternates, reftable, SHA-256,
+reescrita de URL via insteadOf, includes de config, refs/replace) fazem
+as funções retornarem None, sinalizando ao chamador que deve usar o
+binário `git`.
+"""
+
+import mmap
+import os
+import re
+import struct
+import zlib
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+# Tipos de objeto nos packfiles
+OBJ_COMMIT = 1
+OBJ_OFS_DELTA = 6
+OBJ_REF_DELTA = 7
+
+PACK_TYPE_NAMES = {1: b'commit', 2: b'tree', 3: b'blob', 4: b'tag'}
+
+# Profundidade máxima de cadeias de delta / refs simbólicas
+MAX_DELTA_CHAIN = 64
+MAX_SYMREF_DEPTH = 5
+
+# Commits lidos como objetos (sem commit-graph, ou mais novos que ele) na
+# busca pelas raízes antes de desistir em favor do `git rev-list`
+MAX_ROOT_WALK = 1000
+
+# Commit-graph: pai ausente e marcadores de lista de pais extras (EDGE)
+GRAPH_PARENT_NONE = 0x70000000
+GRAPH_EDGE_FLAG = 0x80000000
+GRAPH_EDGE_MASK = 0x7fffffff
+
+# user@host:path (sintaxe scp do ssh; host de uma letra é drive do Windows, como no git)
+_SCP_REMOTE = re.compile(r'^(?:[^@/]+@)?([^:/]{2,}):(?!//)(.+)$')
+# scheme://[user[:senha]@]host[:porta]/path
+_URL_REMOTE = re.compile(r'^[a-z][a-z0-9+.-]*://(?:[^@/]*@)?([^/:]+)(?::[0-9]*)?(/.*)?$', re.IGNORECASE)
+
+_global_config_rewrites = None
+
+
+class UnsupportedRepository(Exception):
+    """Layout de repositório que o leitor nativo não trata."""
+
+
+def _has_url_rewrites(config_path: Path) -> bool:
+    """Verifica se um arquivo de config define insteadOf ou includes."""
+    try:
+        text = config_path.read_text(encoding='utf-8', errors='ignore').lower()
+    except OSError:
+        return False
+    return 'insteadof' in text or '[include' in text
+
+
+def _global_rewrites() -> bool:
+    """Verifica (uma vez por processo) configs globais que alteram URLs."""
+    global _global_config_rewrites
+
+    if _global_config_rewrites is None:
+        candidates = [Path('/etc/gitconfig'), Path.home() / '.gitconfig']
+        xdg = os.environ.get('XDG_CONFIG_HOME') or str(Path.home() / '.config')
+        candidates.append(Path(xdg) / 'git' / 'config')
+        _global_config_rewrites = any(_has_url_rewrites(p) for p in candidates)
+
+    return _global_config_rewrites
+
+
+def _parse_config(text: str) -> Dict[str, List[str]]:
+    """
+    Parser mínimo do formato git-config.
+
+    Returns:
+        Dicionário 'secao.subsecao.chave' -> lista de valores (na ordem)
+    """
+    values = {}
+    section = None
+
+    for raw_line in text.splitlines():
+        line = raw_line.strip()
+        if not line or line[0] in '#;':
+            continue
+
+        if line.startswith('['):
+            end = line.find(']')
+            header = line[1:end].strip()
+            if '"' in header:
+                name, _, sub = header.partition(' ')
+                sub = sub.strip().strip('"')
+                section = f"{name.lower()}.{sub}"
+            else:
+                section = header.lower()
+            line = line[end + 1:].strip()
+            if not line:
+                continue
+
+        if section is None or '=' not in line:
+            continue
+
+        key, _, value = line.partition('=')
+        value = value.strip()
+
+        # Remover comentário fora de aspas e as próprias aspas
+        result = []
+        in_quotes = False
+        for ch in value:
+            if ch == '"':
+                in_quotes = not in_quotes
+                continue
+            if ch in '#;' and not in_quotes:
+                break
+            result.append(ch)
+
+        values.setdefault(f"{section}.{key.strip().lower()}", []).append(''.join(result).strip())
+
+    return values
+
+
+class CommitGraph:
+    """
+    Commit-graph do repositório: pais de cada commit sem ler os objetos.
+
+    Cada camada é um arquivo CGPH (versão 1, SHA-1) com os chunks OIDF
+    (fanout), OIDL (SHAs ordenados), CDAT (pais) e, com merges de mais de
+    dois pais, EDGE. Posições são globais: as de uma camada começam depois
+    das de todas as camadas base.
+    """
+
+    def __init__(self, files: List[Path]):
+        self.layers = []  # (mmap, primeira posição, commits, OIDL, CDAT, EDGE)
+        self.count = 0
+
+        try:
+            for path in files:
+                with open(path, 'rb') as f:
+                    data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+                self.layers.append(self._parse_layer(data, self.count))
+                self.count += self.layers[-1][2]
+        except Exception:
+            self.close()
+            raise
+
+    @staticmethod
+    def _parse_layer(data: mmap.mmap, first: int) -> Tuple:
+        """Localiza os chunks de uma camada."""
+        if data[:4] != b'CGPH' or data[4] != 1 or data[5] != 1:
+            data.close()
+            raise UnsupportedRepository('commit-graph não suportado')
+
+        chunks = {}
+        for k in range(data[6]):
+            chunk_id, offset = struct.unpack_from('>4sQ', data, 8 + k * 12)
+            chunks[chunk_id] = offset
+        if not all(chunk in chunks for chunk in (b'OIDF', b'OIDL', b'CDAT')):
+            data.close()
+            raise UnsupportedRepository('commit-graph sem OIDF/OIDL/CDAT')
+
+        count = struct.unpack_from('>I', data, chunks[b'OIDF'] + 255 * 4)[0]
+        return data, first, count, chunks[b'OIDF'], chunks[b'OIDL'], chunks[b'CDAT'], chunks.get(b'EDGE')
+
+    @classmethod
+    def load(cls, objects_dir: Path) -> Optional['CommitGraph']:
+        """
+        Abre o commit-graph como o git: o arquivo único ou, sem ele, a cadeia.
+
+        Returns:
+            CommitGraph ou None se o repositório não tem commit-graph
+        """
+        single = objects_dir / 'info' / 'commit-graph'
+        if single.is_file():
+            return cls([single])
+
+        graphs_dir = objects_dir / 'info' / 'commit-graphs'
+        try:
+            chain = (graphs_dir / 'commit-graph-chain').read_text(encoding='ascii').split()
+        except FileNotFoundError:
+            return None
+        if not chain:
+            return None
+        return cls([graphs_dir / f'graph-{name}.graph' for name in chain])
+
+    def position(self, sha: str) -> Optional[int]:
+        """Posição global do commit no grafo (None se ele não está no grafo)."""
+        oid = bytes.fromhex(sha)
+        first_byte = oid[0]
+
+        for data, first, _, oidf, oidl, _, _ in self.layers:
+            lo = struct.unpack_from('>I', data, oidf + (first_byte - 1) * 4)[0] if first_byte else 0
+            hi = struct.unpack_from('>I', data, oidf + first_byte * 4)[0]
+            while lo < hi:
+                mid = (lo + hi) // 2
+                entry = data[oidl + mid * 20:oidl + mid * 20 + 20]
+                if entry < oid:
+                    lo = mid + 1
+                elif entry > oid:
+                    hi = mid
+                else:
+                    return first + mid
+
+        return None
+
+    def _layer(self, position: int) -> Tuple:
+        for layer in reversed(self.layers):
+            if position >= layer[1]:
+                return layer
+        raise ValueError(f'posição fora do commit-graph: {position}')
+
+    def oid(self, position: int) -> str:
+        """SHA do commit na posição."""
+        data, first, _, _, oidl, _, _ = self._layer(position)
+        local = position - first
+        return data[oidl + local * 20:oidl + local * 20 + 20].hex()
+
+    def parents(self, position: int) -> List[int]:
+        """Posições dos pais do commit (lista vazia em commit raiz)."""
+        data, first, _, _, _, cdat, edge = self._layer(position)
+        parent1, parent2 = struct.unpack_from('>II', data, cdat + (position - first) * 36 + 20)
+
+        if parent1 == GRAPH_PARENT_NONE:
+            return []
+        if parent2 == GRAPH_PARENT_NONE:
+            return [parent1]
+        if not parent2 & GRAPH_EDGE_FLAG:
+            return [parent1, parent2]
+
+        # Octopus: do segundo pai em diante numa lista do EDGE, com o último marcado
+        if edge is None:
+            raise UnsupportedRepository('commit-graph sem EDGE')
+        parents = [parent1]
+        offset = edge + (parent2 & GRAPH_EDGE_MASK) * 4
+        while True:
+            value = struct.unpack_from('>I', data, offset)[0]
+            parents.append(value & GRAPH_EDGE_MASK)
+            if value & GRAPH_EDGE_FLAG:
+                return parents
+            offset += 4
+
+    def close(self):
+        for layer in self.layers:
+            layer[0].close()
+        self.layers = []
+
+
+class GitRepoReader:
+    """Leitor de um único diretório `.git`."""
+
+    def __init__(self, git_dir: Path):
+        self.git_dir = Path(git_dir)
+
+        if not self.git_dir.is_dir():
+            # Arquivo `.git` (worktree/submódulo) aponta para outro lugar
+            raise UnsupportedRepository('gitdir indireto')
+
+        for marker in ('commondir', 'objects/info/alternates', 'reftable'):
+            if (self.git_dir / marker).exists():
+                raise UnsupportedRepository(marker)
+
+        self._config = None
+        self._packed_refs = None
+        self._packs = None
+        self._pack_files = {}  # packfile -> handle aberto (reusado entre objetos)
+        self._commit_graph = None
+        self._commit_graph_loaded = False
+        self.bytes_read = 0  # Bytes lidos de .git (perfil do scan)
+
+    # ------------------------------------------------------------------
+    # Config e refs
+    # ------------------------------------------------------------------
+
+    @property
+    def config(self) -> Dict[str, List[str]]:
+        if self._config is None:
+            try:
+                text = (self.git_dir / 'config').read_text(encoding='utf-8', errors='ignore')
+            except OSError:
+                text = ''
+            self.bytes_read += len(text)
+            lowered = text.lower()
+            if 'insteadof' in lowered or '[include' in lowered:
+                raise UnsupportedRepository('reescrita de URL/include')
+            self._config = _parse_config(text)
+
+            fmt = self._config.get('extensions.objectformat', ['sha1'])[0].lower()
+            if fmt != 'sha1':
+                raise UnsupportedRepository(f'objectformat {fmt}')
+            storage = self._config.get('extensions.refstorage', ['files'])[0].lower()
+            if storage != 'files':
+                raise UnsupportedRepository(f'refstorage {storage}')
+
+        return self._config
+
+    @property
+    def packed_refs(self) -> Dict[str, str]:
+        if self._packed_refs is None:
+            self._packed_refs = {}
+            try:
+                with open(self.git_dir / 'packed-refs', 'r', encoding='utf-8', errors='ignore') as f:
+                    for line in f:
+                        self.bytes_read += len(line)
+                        if not line or line[0] in '#^':
+                            continue
+                        sha, _, ref = line.strip().partition(' ')
+                        if ref:
+                            self._packed_refs[ref] = sha
+            except FileNotFoundError:
+                pass
+        return self._packed_refs
+
+    def read_head(self) -> str:
+        """Conteúdo bruto de HEAD."""
+        content = (self.git_dir / 'HEAD').read_text(encoding='utf-8', errors='ignore')
+        self.bytes_read += len(content)
+        return content.strip()
+
+    def resolve_ref(self, ref: str) -> Optional[str]:
+        """Resolve uma ref (seguindo refs simbólicas) para um SHA ou None."""
+        for _ in range(MAX_SYMREF_DEPTH):
+            ref_file = self.git_dir / ref
+            if ref_file.is_file():
+                content = ref_file.read_text(encoding='utf-8', errors='ignore').strip()
+                self.bytes_read += len(content)
+            else:
+                content = self.packed_refs.get(ref)
+                if content is None:
+                    return None
+
+            if content.startswith('ref:'):
+                ref = content[4:].strip()
+                continue
+
+            return content if len(content) == 40 else None
+
+        return None
+
+    def head_commit(self) -> Optional[str]:
+        """SHA do commit apontado por HEAD (None em repositório vazio)."""
+        head = self.read_head()
+        if head.startswith('ref:'):
+            return self.resolve_ref(head[4:].strip())
+        return head if len(head) == 40 else None
+
+    def current_branch(self) -> str:
+        """Equivalente a `git branch --show-current` ('' se HEAD destacado)."""
+        head = self.read_head()
+        if head.startswith('ref:'):
+            ref = head[4:].strip()
+            if ref.startswith('refs/heads/'):
+                return ref[len('refs/heads/'):]
+        return ''
+
+    def remote_url(self, name: str = 'origin') -> Optional[str]:
+        """Equivalente a `git remote get-url <name>`."""
+        urls = self.config.get(f'remote.{name}.url')
+        return urls[0] if urls else None
+
+    # ------------------------------------------------------------------
+    # Objetos
+    # ------------------------------------------------------------------
+
+    def _load_packs(self) -> List[Tuple[mmap.mmap, int, Path]]:
+        """Mapeia os índices (v2) dos packfiles em memória."""
+        if self._packs is None:
+            self._packs = []
+            pack_dir = self.git_dir / 'objects' / 'pack'
+            try:
+                idx_files = sorted(pack_dir.glob('*.idx'))
+            except OSError:
+                idx_files = []
+
+            for idx_path in idx_files:
+                with open(idx_path, 'rb') as f:
+                    if os.fstat(f.fileno()).st_size == 0:
+                        continue
+                    idx = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+                if idx[:4] != b'\377tOc' or struct.unpack('>I', idx[4:8])[0] != 2:
+                    idx.close()
+                    raise UnsupportedRepository(f'índice de pack não-v2: {idx_path.name}')
+                count = struct.unpack('>I', idx[8 + 255 * 4:8 + 256 * 4])[0]
+                self._packs.append((idx, count, idx_path.with_suffix('.pack')))
+
+        return self._packs
+
+    def _pack_file(self, pack_path: Path):
+        """Handle do packfile, aberto na primeira leitura e mantido até close()."""
+        f = self._pack_files.get(pack_path)
+        if f is None:
+            f = self._pack_files[pack_path] = open(pack_path, 'rb')
+        return f
+
+    @property
+    def commit_graph(self) -> Optional[CommitGraph]:
+        if not self._commit_graph_loaded:
+            self._commit_graph_loaded = True
+            try:
+                self._commit_graph = CommitGraph.load(self.git_dir / 'objects')
+            except (UnsupportedRepository, OSError, ValueError, struct.error):
+                # Grafo ilegível só tira o atalho: as raízes vêm do `git`
+                self._commit_graph = None
+        return self._commit_graph
+
+    def _find_in_pack(self, sha: bytes) -> Optional[Tuple[Path, int]]:
+        """Busca binária do SHA nos índices; retorna (packfile, offset)."""
+        first = sha[0]
+
+        for idx, count, pack_path in self._load_packs():
+            lo = struct.unpack('>I', idx[8 + (first - 1) * 4:8 + first * 4])[0] if first else 0
+            hi = struct.unpack('>I', idx[8 + first * 4:12 + first * 4])[0]
+            names = 8 + 256 * 4
+
+            while lo < hi:
+                mid = (lo + hi) // 2
+                entry = idx[names + mid * 20:names + mid * 20 + 20]
+                if entry < sha:
+                    lo = mid + 1
+                elif entry > sha:
+                    hi = mid
+                else:
+                    offsets = names + count * 24
+                    offset = struct.unpack('>I', idx[offsets + mid * 4:offsets + mid * 4 + 4])[0]
+                    if offset & 0x80000000:
+                        large = offsets + count * 4 + (offset & 0x7fffffff) * 8
+                        offset = struct.unpack('>Q', idx[large:large + 8])[0]
+                    return pack_path, offset
+
+        return None
+
+    @staticmethod
+    def _inflate(f, size_hint: int = 0) -> bytes:
+        """Descomprime um stream zlib a partir da posição atual do arquivo."""
+        decompressor = zlib.decompressobj()
+        chunks = []
+        while not decompressor.eof:
+            data = f.read(max(4096, size_hint))
+            if not data:
+                break
+            chunks.append(decompressor.decompress(data))
+        return b''.join(chunks)
+
+    @staticmethod
+    def _apply_delta(base: bytes, delta: bytes) -> bytes:
+        """Aplica uma instrução de delta do git sobre o objeto base."""
+        pos = 0
+
+        def varint():
+            nonlocal pos
+            value = shift = 0
+            while True:
+                byte = delta[pos]
+                pos += 1
+                value |= (byte & 0x7f) << shift
+                shift += 7
+                if not byte & 0x80:
+                    return value
+
+        varint()  # tamanho do base
+        target_size = varint()
+        out = bytearray()
+
+        while pos < len(delta):
+            op = delta[pos]
+            pos += 1
+            if op & 0x80:
+                offset = size = 0
+                for i in range(4):
+                    if op & (1 << i):
+                        offset |= delta[pos] << (8 * i)
+                        pos += 1
+                for i in range(3):
+                    if op & (1 << (4 + i)):
+                        size |= delta[pos] << (8 * i)
+                        pos += 1
+                out += base[offset:offset + (size or 0x10000)]
+            elif op:
+                out += delta[pos:pos + op]
+                pos += op
+            else:
+                raise ValueError('instrução de delta inválida')
+
+        if len(out) != target_size:
+            raise ValueError('delta com tamanho inconsistente')
+        return bytes(out)
+
+    def _read_packed(self, pack_path: Path, offset: int, depth: int = 0) -> Tuple[int, bytes]:
+        """Lê (tipo, conteúdo) de um objeto do packfile, resolvendo deltas."""
+        if depth > MAX_DELTA_CHAIN:
+            raise UnsupportedRepository('cadeia de delta muito longa')
+
+        f = self._pack_file(pack_path)
+        f.seek(offset)
+        byte = f.read(1)[0]
+        obj_type = (byte >> 4) & 7
+        size = byte & 0x0f
+        shift = 4
+        while byte & 0x80:
+            byte = f.read(1)[0]
+            size |= (byte & 0x7f) << shift
+            shift += 7
+
+        if obj_type == OBJ_OFS_DELTA:
+            byte = f.read(1)[0]
+            rel = byte & 0x7f
+            while byte & 0x80:
+                byte = f.read(1)[0]
+                rel = ((rel + 1) << 7) | (byte & 0x7f)
+            delta = self._inflate(f, size)
+            self.bytes_read += f.tell() - offset
+            base_type, base = self._read_packed(pack_path, offset - rel, depth + 1)
+            return base_type, self._apply_delta(base, delta)
+
+        if obj_type == OBJ_REF_DELTA:
+            base_sha = f.read(20)
+            delta = self._inflate(f, size)
+            self.bytes_read += f.tell() - offset
+            base_type, base = self._read_object(base_sha.hex(), depth + 1)
+            return base_type, self._apply_delta(base, delta)
+
+        content = self._inflate(f, size)
+        self.bytes_read += f.tell() - offset
+        return obj_type, content
+
+    def _read_object(self, sha: str, depth: int = 0) -> Tuple[int, bytes]:
+        """Lê um objeto (solto ou empacotado) e retorna (tipo, conteúdo)."""
+        loose = self.git_dir / 'objects' / sha[:2] / sha[2:]
+        try:
+            data = loose.read_bytes()
+        except FileNotFoundError:
+            found = self._find_in_pack(bytes.fromhex(sha))
+            if found is None:
+                raise UnsupportedRepository(f'objeto não encontrado: {sha}')
+            return self._read_packed(found[0], found[1], depth)
+
+        self.bytes_read += len(data)
+        header, _, body = zlib.decompress(data).partition(b'\0')
+        type_name = header.split(b' ', 1)[0]
+        for obj_type, name in PACK_TYPE_NAMES.items():
+            if name == type_name:
+                return obj_type, body
+        raise UnsupportedRepository(f'tipo de objeto desconhecido: {type_name!r}')
+
+    def root_commits(self, start: str, known_head: Optional[str] = None,
+                     limit: int = MAX_ROOT_WALK) -> Optional[Tuple[List[str], bool]]:
+        """
+        Commits sem pais alcançáveis a partir de `start`, por todos os pais.
+
+        Os pais vêm do commit-graph quando ele existe; os commits fora dele
+        (todos, num repositório sem commit-graph) são lidos como objetos.
+
+        Args:
+            start: Commit inicial (HEAD)
+            known_head: Commit cujas raízes o chamador já conhece; a busca
+                não desce por ele
+            limit: Máximo de commits lidos como objetos
+
+        Returns:
+            (raízes encontradas, se known_head foi alcançado) ou None se os
+            commits lidos como objetos passaram do limite
+        """
+        graph = self.commit_graph
+        roots = []
+        reached = False
+
+        # Commits fora do grafo: lidos dos objetos até entrar nele
+        positions = []
+        seen = {start}
+        stack = [start]
+        read = 0
+        while stack:
+            sha = stack.pop()
+            if sha == known_head:
+                reached = True
+                continue
+
+            position = graph.position(sha) if graph else None
+            if position is not None:
+                positions.append(position)
+                continue
+
+            read += 1
+            if read > limit:
+                return None
+
+            parents = self.read_commit(sha)['parents']
+            if not parents:
+                roots.append(sha)
+            for parent in parents:
+                if parent not in seen:
+                    seen.add(parent)
+                    stack.append(parent)
+
+        if not positions:
+            return sorted(roots), reached
+        positions = sorted(set(positions))  # dois commits novos podem entrar no grafo pelo mesmo pai
+
+        # Dentro do grafo: só posições, sem ler objetos
+        known_position = graph.position(known_head) if known_head else None
+        visited = bytearray(graph.count)
+        for position in positions:
+            visited[position] = 1
+        while positions:
+            position = positions.pop()
+            if position == known_position:
+                reached = True
+                continue
+
+            parents = graph.parents(position)
+            if not parents:
+                roots.append(graph.oid(position))
+            for parent in parents:
+                if not visited[parent]:
+                    visited[parent] = 1
+                    positions.append(parent)
+
+        return sorted(roots), reached
+
+    def read_commit(self, sha: str) -> Dict[str, object]:
+        """Lê os cabeçalhos de um commit (parents, committer)."""
+        obj_type, body = self._read_object(sha)
+        if obj_type != OBJ_COMMIT:
+            raise UnsupportedRepository(f'{sha} não é um commit')
+
+        parents = []
+        committer = None
+        for line in body.split(b'\n'):
+            if not line:
+                break
+            if line.startswith(b'parent '):
+                parents.append(line[7:].decode('ascii'))
+            elif line.startswith(b'committer '):
+                committer = line[10:].decode('utf-8', errors='replace')
+
+        return {'parents': parents, 'committer': committer}
+
+    @staticmethod
+    def format_commit_date(committer: str) -> Optional[str]:
+        """Converte o cabeçalho committer no formato de `git log --format=%ci`."""
+        try:
+            _, _, stamp = committer.rpartition('> ')
+            seconds, tz = stamp.split()
+            sign = -1 if tz[0] == '-' else 1
+            offset = timedelta(hours=int(tz[1:3]), minutes=int(tz[3:5])) * sign
+            moment = datetime.fromtimestamp(int(seconds), timezone(offset))
+        except (ValueError, IndexError, OverflowError):
+            return None
+        return f"{moment.strftime('%Y-%m-%d %H:%M:%S')} {tz}"
+
+    def close(self):
+        for idx, _, _ in self._packs or []:
+            idx.close()
+        self._packs = None
+        for f in self._pack_files.values():
+            f.close()
+        self._pack_files = {}
+        if self._commit_graph:
+            self._commit_graph.close()
+        self._commit_graph = None
+
+
+def canonical_remote(url: Optional[str]) -> Optional[str]:
+    """
+    Forma canônica de uma URL de remote, para comparar clones entre si.
+
+    Scheme, usuário, porta, 'www.', barra e '.git' finais saem, e tudo vai
+    para minúsculas: `git@github.com:Org/Repo.git` e
+    `https://github.com/org/repo` viram `github.com/org/repo`. Paths locais
+    (remote para outro diretório) só perdem '.git' e as barras finais.
+    """
+    if not url or not url.strip():
+        return None
+    url = url.strip()
+
+    match = _URL_REMOTE.match(url)
+    if match and not url.lower().startswith('file://'):
+        host, path = match.group(1), match.group(2) or ''
+    else:
+        match = _SCP_REMOTE.match(url)
+        if match and not os.path.isabs(url):
+            host, path = match.group(1), '/' + match.group(2)
+        else:
+            host, path = '', url[len('file://'):] if url.lower().startswith('file://') else url
+
+    path = path.rstrip('/')
+    if path.lower().endswith('.git'):
+        path = path[:-4].rstrip('/')
+    host = host.lower()
+    if host.startswith('www.'):
+        host = host[4:]
+    return (host + path).lower()
+
+
+def read_git_info(repo_path: Path, counters: Optional[Dict[str, int]] = None,
+                  known_roots: Optional[Tuple[str, str]] = None) -> Optional[Dict]:
+    """
+    Extrai branch, remote origin, data do último commit e commits raiz sem chamar `git`.
+
+    As raízes identificam a história: clones, forks e mirrors de um mesmo
+    repositório têm as mesmas, mesmo com remotes diferentes.
+
+    Args:
+        repo_path: Diretório de trabalho do repositório (que contém `.git`)
+        counters: Se informado, recebe em 'bytes_read' o volume lido de `.git`
+        known_roots: (git_head_commit, git_root_commits) do scan anterior; com
+            o mesmo HEAD as raízes são reaproveitadas, com HEAD novo só os
+            commits novos são lidos
+
+    Returns:
+        Dicionário com git_branch, git_remote, git_remote_canonical,
+        git_last_commit_date, git_head_commit e git_root_commits (SHAs
+        ordenados, separados por vírgula; None em repositório vazio ou
+        shallow), ou None se o layout não for suportado (o chamador deve
+        usar o `git`). git_root_commits fica ausente quando mais de
+        MAX_ROOT_WALK commits precisam ser lidos como objetos (história longa
+        sem commit-graph): o chamador usa `git rev-list`.
+    """
+    if _global_rewrites():
+        return None
+
+    reader = None
+    try:
+        reader = GitRepoReader(Path(repo_path) / '.git')
+
+        if (reader.git_dir / 'info' / 'grafts').exists() or \
+                (reader.git_dir / 'refs' / 'replace').is_dir() or \
+                any(ref.startswith('refs/replace/') for ref in reader.packed_refs):
+            return None
+
+        remote = reader.remote_url('origin')
+        branch = reader.current_branch()
+
+        last_commit = None
+        head = reader.head_commit()
+        if head:
+            commit = reader.read_commit(head)
+            if commit['committer']:
+                last_commit = reader.format_commit_date(commit['committer'])
+
+        info = {
+            'git_remote': remote,
+            'git_remote_canonical': canonical_remote(remote),
+            'git_branch': branch,
+            'git_last_commit_date': last_commit,
+            'git_head_commit': head,
+            'git_root_commits': None,
+        }
+
+        # Clone shallow: os commits da borda parecem raízes, mas não são
+        if not head or (reader.git_dir / 'shallow').exists():
+            return info
+
+        known_head, known = known_roots if known_roots and known_roots[1] else (None, None)
+        if head == known_head:
+            info['git_root_commits'] = known
+            return info
+
+        walked = reader.root_commits(head, known_head, MAX_ROOT_WALK)
+        if walked is None:
+            del info['git_root_commits']
+            return info
+
+        roots, reached = walked
+        if reached:
+            # Raízes novas vêm só de histórias não relacionadas mescladas depois
+            roots = sorted(set(roots) | set(known.split(',')))
+        info['git_root_commits'] = ','.join(roots)
+        return info
+    except (UnsupportedRepository, OSError, ValueError, IndexError, zlib.error, struct.error):
+        return None
+    finally:
+        if reader:
+            if counters is not None:
+                counters['bytes_read'] = counters.get('bytes_read', 0) + reader.bytes_read
+            reader.close()
@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+"""
+Matcher de .gitignore - Claude Projects Intelligence Hub
+
+Compila os padrões de um .gitignore (ou .git/info/exclude) em expressões
+regulares, para o walker do scanner.py podar diretórios ignorados antes de
+descer neles. Só diretórios são testados: padrões com '/' final valem igual.
+"""
+
+import re
+from pathlib import Path
+from typing import Iterable, List, Optional, Sequence
+
+
+class GitIgnore:
+    """Padrões de um arquivo de ignore, relativos ao diretório onde ele está."""
+
+    def __init__(self, base: str, lines: Iterable[str]):
+        """
+        Args:
+            base: Diretório do arquivo (os padrões são relativos a ele)
+            lines: Linhas do arquivo
+        """
+        self.base = base
+        self.rules = []  # (regex, negado), na ordem do arquivo
+
+        for line in lines:
+            rule = _parse_line(line)
+            if rule is not None:
+                self.rules.append(rule)
+
+        # Sem '!' a ordem não importa: uma única regex com todas as alternativas
+        self._combined = None
+        if self.rules and not any(negated for _, negated in self.rules):
+            self._combined = re.compile('|'.join(f'(?:{regex.pattern})' for regex, _ in self.rules))
+
+    @classmethod
+    def from_file(cls, base: str, path: Path) -> Optional['GitIgnore']:
+        """Lê e compila o arquivo; None se não existe, não é legível ou não tem padrões."""
+        try:
+            with open(path, 'r', encoding='utf-8', errors='surrogateescape') as f:
+                ignore = cls(base, f.read().splitlines())
+        except OSError:
+            return None
+        return ignore if ignore.rules else None
+
+    def match(self, relative: str) -> Optional[bool]:
+        """
+        Testa um diretório pelo path relativo à base.
+
+        Returns:
+            True (ignorado), False (reincluído por '!') ou None (nenhum padrão casa)
+        """
+        if self._combined is not None:
+            return True if self._combined.fullmatch(relative) else None
+
+        # O último padrão que casa decide
+        for regex, negated in reversed(self.rules):
+            if regex.fullmatch(relative):
+                return not negated
+        return None
+
+
+def is_ignored(chain: Sequence[GitIgnore], path: str) -> bool:
+    """
+    Decide se um diretório é ignorado pela cadeia de arquivos de um repositório.
+
+    Args:
+        chain: Arquivos do mais raso ao mais profundo (info/exclude primeiro);
+            o mais profundo que tiver um padrão casando decide, como no git
+        path: Path absoluto do diretório
+    """
+    for ignore in reversed(chain):
+        if not path.startswith(ignore.base + '/'):
+            continue
+        result = ignore.match(path[len(ignore.base) + 1:])
+        if result is not None:
+            return result
+    return False
+
+
+def _parse_line(line: str):
+    if not line or line.startswith('#'):
+        return None
+
+    # Espaços finais são descartados, a menos que escapados com '\'
+    while line.endswith(' ') and not line.endswith('\\ '):
+        line = line[:-1]
+
+    negated = line.startswith('!')
+    if negated:
+        line = line[1:]
+
+    # Com '/' no início ou no meio o padrão é relativo à base; sem, casa em qualquer nível
+    pattern = line.rstrip('/')
+    anchored = '/' in pattern
+    pattern = pattern.lstrip('/')
+    if not pattern:
+        return None
+
+    body = _translate(pattern)
+    if not anchored:
+        body = '(?:.*/)?' + body
+
+    try:
+        return re.compile(body), negated
+    except re.error:
+        return None
+
+
+def _translate(pattern: str) -> str:
+    """Glob do gitignore ('*', '?', '[...]', '**') para o corpo de uma regex."""
+    regex: List[str] = []
+    i, n = 0, len(pattern)
+
+    while i < n:
+        c = pattern[i]
+
+        if c == '*':
+            # '**' só é especial como componente inteiro do path
+            if pattern.startswith('**', i) and (i == 0 or pattern[i - 1] == '/') \
+                    and (i + 2 == n or pattern[i + 2] == '/'):
+                if i + 2 == n:
+                    regex.append('.*')
+                    i += 2
+                else:
+                    regex.append('(?:.*/)?')
+                    i += 3
+                continue
+            regex.append('[^/]*')
+        elif c == '?':
+            regex.append('[^/]')
+        elif c == '[':
+            start = i + 1
+            negated = start < n and pattern[start] in '!^'
+            if negated:
+                start += 1
+            # ']' logo no início da classe é literal
+            end = pattern.find(']', start + 1)
+            if end == -1:
+                regex.append(re.escape(c))
+            else:
+                members = pattern[start:end].replace('\\', '\\\\')
+                regex.append('[' + ('^' if negated else '') + members + ']')
+                i = end + 1
+                continue
+        elif c == '\\' and i + 1 < n:
+            regex.append(re.escape(pattern[i + 1]))
+            i += 2
+            continue
+        else:
+            regex.append(re.escape(c))
+
+        i += 1
+
+    return ''.join(regex)
@@ -7,23 +7,60 @@ Escaneia diretórios recursivamente em busca de projetos e atualiza o banco SQLi
 Uso:
     python3 scanner.py scan --location /caminho/para/diretorio
     python3 scanner.py update --path /caminho/para/projeto/especifico
+    find ~/projetos -maxdepth 2 -name .git -printf '%h\\0' | python3 scanner.py update --paths-from -
     python3 scanner.py full-scan
+    python3 scanner.py full-scan --roots roots.json
+    python3 scanner.py resume
+    python3 scanner.py update-recent --days 7
+    python3 scanner.py watch
 """
 
 import sqlite3
 import os
+import stat
+import sys
 import json
+import hashlib
+import re
+import queue
+import threading
 import subprocess
 from pathlib import Path
 from datetime import datetime
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, Iterator, List, Optional, Set, Tuple
+from collections import deque
+from contextlib import contextmanager, nullcontext
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
 import argparse
 import time
 
+from git_reader import canonical_remote, read_git_info
+from gitignore import GitIgnore, is_ignored
+from schema import ensure_schema
+from workspaces import read_member_globs, expand_member_globs
+import watcher as inotify
+
 class ProjectScanner:
     """Scanner de projetos que indexa metadados no banco SQLite."""
 
-    # Arquivos que indicam tipos de projeto
+    # Configuração de raízes do full-scan (ver roots.example.json); sem ela valem
+    # as DEFAULT_LOCATIONS com a profundidade e os workers do scanner
+    ROOTS_CONFIG = Path(__file__).parent / 'roots.json'
+
+    # Pontos de montagem do processo (bind mounts são visitados depois da árvore real)
+    MOUNTINFO = Path('/proc/self/mountinfo')
+
+    # Segundos que uma conexão espera pelo lock de escrita (full-scan grava
+    # raízes de dispositivos diferentes em paralelo, uma conexão por raiz)
+    SQLITE_BUSY_TIMEOUT = 60
+
+    # Localizações escaneadas por full-scan e observadas por watch
+    DEFAULT_LOCATIONS = [
+        '/Users/victorvilanova/projetos/',
+        '/Users/victorvilanova/Downloads/',
+    ]
+
+    # Arquivos que indicam tipos de projeto ('*.ext' casa por sufixo)
     PROJECT_MARKERS = {
         'nodejs': ['package.json'],
         'python': ['requirements.txt', 'setup.py', 'pyproject.toml', 'Pipfile'],
@@ -31,7 +68,7 @@ class ProjectScanner:
         'rust': ['Cargo.toml'],
         'go': ['go.mod'],
         'java': ['pom.xml', 'build.gradle', 'build.gradle.kts'],
-        'csharp': ['.csproj', '.sln'],
+        'csharp': ['*.csproj', '*.sln'],
         'ruby': ['Gemfile'],
     }
 
@@ -54,6 +91,41 @@ class ProjectScanner:
         'AUTOLOAD.md': 'AUTOLOAD.md',
     }
 
+    # Colunas de `projects` gravadas a partir do dicionário do projeto (ordem dos INSERT/UPDATE)
+    PROJECT_COLUMNS = [
+        'name', 'path', 'type', 'depth_level', 'parent_project_id', 'is_subproject',
+        'is_monorepo', 'has_workspace_config', 'workspace_type',
+        'has_git', 'git_remote', 'git_remote_canonical', 'git_branch', 'git_last_commit_date',
+        'git_head_commit', 'git_root_commits',
+        'has_readme', 'has_claude_md', 'has_context_md', 'has_memory_system',
+        'package_manager', 'framework', 'dir_device', 'dir_inode',
+        'disk_size_source', 'disk_size_ignored',
+    ]
+
+    # Colunas que um UPDATE sem valor (None) não apaga: os tamanhos só são
+    # medidos com --disk-usage e continuam valendo nos scans sem a opção
+    KEEP_IF_NULL_COLUMNS = {'disk_size_source', 'disk_size_ignored'}
+
+    # O que fazer com projetos não vistos no scan de uma localização. O padrão
+    # arquiva: 'delete' é opt-in e mesmo assim só apaga projetos sem tarefas
+    # nem histórico de análise (os demais são arquivados)
+    PRUNE_MODES = ['archive', 'delete', 'none']
+
+    # Bloco de leitura da contagem binária de linhas dos docs
+    DOC_READ_CHUNK = 1024 * 1024
+
+    # Capacidade da fila entre detecção e escrita (limita a memória do pipeline)
+    PIPELINE_QUEUE_SIZE = 256
+
+    # Intervalo padrão entre checkpoints da fronteira do walk (scanner.py resume)
+    CHECKPOINT_INTERVAL_SECONDS = 10.0
+
+    # Modos de visita do walker: árvore inteira, membro de workspace (só desce
+    # se também for workspace) ou só o diretório (retomada de um projeto em voo)
+    VISIT_TREE = 'tree'
+    VISIT_MEMBER = 'member'
+    VISIT_SELF = 'self'
+
     # Diretórios a ignorar
     IGNORE_DIRS = {
         'node_modules', '.git', 'dist', 'build', '__pycache__',
@@ -61,7 +133,42 @@ class ProjectScanner:
         '.cache', 'coverage', '.pytest_cache', 'vendor'
     }
 
-    def __init__(self, db_path: str = None, max_depth: int = 10, verbose: bool = False):
+    # Entradas cujo stat entra no fingerprint incremental (afetam a detecção)
+    FINGERPRINT_FILES = (
+        [marker for markers in PROJECT_MARKERS.values() for marker in markers if '*' not in marker]
+        + MONOREPO_MARKERS
+        + [doc for doc in DOC_FILES if '/' not in doc]
+        + ['.claude', '.memory', '.gitignore', 'pnpm-lock.yaml', 'yarn.lock', 'package-lock.json',
+           'poetry.lock', 'artisan', '.git']
+    )
+
+    # Arquivos dentro de subdiretórios, pela entrada que os contém: .git muda com
+    # commit/checkout (HEAD, reflog) e troca de remote (config); os docs em
+    # subdiretório (.claude/CLAUDE.md) podem ser editados sem tocar no mtime do projeto
+    FINGERPRINT_NESTED_FILES = {
+        '.git': ['.git/HEAD', '.git/logs/HEAD', '.git/config'],
+        '.claude': ['.claude/CLAUDE.md'],
+    }
+
+    # Entradas de .git cuja mudança afeta branch/remote/último commit (modo watch)
+    WATCH_GIT_FILES = {'HEAD', 'packed-refs', 'config'}
+
+    # Resultados por path de update_projects (linhas impressas por `update`)
+    UPDATE_ADDED = 'adicionado'
+    UPDATE_UPDATED = 'atualizado'
+    UPDATE_NOT_FOUND = 'não encontrado'
+    UPDATE_NOT_PROJECT = 'não é projeto'
+
+    # Entradas de .git tocadas por commit, checkout, merge e rebase (update-recent).
+    # Refs remotas ficam de fora: um fetch não é atividade no projeto.
+    GIT_ACTIVITY_FILES = ['logs/HEAD', 'HEAD', 'ORIG_HEAD', 'packed-refs']
+    GIT_ACTIVITY_DIRS = ['refs/heads', 'logs/refs/heads']
+
+    def __init__(self, db_path: str = None, max_depth: int = 10, verbose: bool = False,
+                 workers: int = 1, incremental: bool = False, batch_size: int = 500,
+                 prune: str = 'archive', profile: bool = False, ignore: List[str] = None,
+                 checkpoint_interval: float = CHECKPOINT_INTERVAL_SECONDS, workspace_members: bool = False,
+                 gitignore: bool = False, disk_usage: bool = False):
         """
         Inicializa o scanner.
 
@@ -69,7 +176,29 @@ class ProjectScanner:
             db_path: Path para o banco de dados SQLite.
             max_depth: Profundidade máxima de busca recursiva.
             verbose: Modo verbose para logging.
+            workers: Número de threads do walker (1 = walker serial).
+            incremental: Reaproveita diretórios cujo fingerprint não mudou.
+            batch_size: Projetos por transação na escrita em lote (0 = um commit por localização).
+            prune: Projetos não vistos no scan: 'archive' (status = archived,
+                restaurado se o projeto reaparecer), 'delete' (remove os que não
+                têm tarefas nem histórico; os demais são arquivados) ou 'none' (mantém).
+            profile: Mede tempo e operações de cada fase (walk, git, docs, manifest, write).
+            ignore: Nomes de diretório ignorados além de IGNORE_DIRS.
+            checkpoint_interval: Segundos entre checkpoints do scan (0 = sem
+                checkpoints). Exige batch_size > 0: o checkpoint vai no commit de um lote.
+            workspace_members: Nos monorepos, visita só os membros declarados
+                nos manifests de workspace em vez da árvore inteira (subprojetos
+                fora dos globs deixam de ser indexados).
+            gitignore: Não desce em diretórios ignorados pelo .gitignore (e
+                .git/info/exclude) do repositório em que estão.
+            disk_usage: Mede o tamanho em disco de cada projeto (fontes e
+                diretórios ignorados) para as estimativas de consolidação,
+                durante o walk do scan (no incremental, os diretórios
+                inalterados continuam sendo listados; a detecção é reaproveitada).
         """
+        if prune not in self.PRUNE_MODES:
+            raise ValueError(f"prune inválido: {prune} (use {', '.join(self.PRUNE_MODES)})")
+
         if db_path is None:
             script_dir = Path(__file__).parent
             db_path = script_dir / "projects.db"
@@ -77,7 +206,45 @@ class ProjectScanner:
         self.db_path = Path(db_path)
         self.max_depth = max_depth
         self.verbose = verbose
+        self.workers = max(1, workers)
+        self.incremental = incremental
+        self.batch_size = batch_size
+        self.prune = prune
+        self.profile = profile
+        self.ignore_dirs = self.IGNORE_DIRS | set(ignore or ())
+        self.checkpoint_interval = checkpoint_interval if batch_size else 0
+        self.workspace_members = workspace_members
+        self.gitignore = gitignore
+        self.disk_usage = disk_usage
+        self.profiler = ScanProfiler(enabled=profile)
         self.conn = None
+
+        # Estado do scan incremental (carregado por scan_location)
+        self._fingerprints = {}
+        self._new_fingerprints = []
+        self._known_depths = {}
+        self._known_roots = {}
+        self._doc_cache = {}
+        self._manifest_cache = {}
+        self._new_manifests = []
+        self._visited = {}
+        self._entered = set()
+        self._known_dirs = {}
+        self._mount_points = set()
+        self._deferred_links = []
+        self._aliases = []
+        self._pending = {}
+        self._inflight = {}
+        self._last_checkpoint = 0.0
+        self._cancel = threading.Event()  # Ctrl-C do full-scan, repassado aos scanners das raízes
+        self._ignore_chains = {}
+        self._rebuilt_chains = {}
+        self._gitignore_cache = {}
+        self._measuring = False
+        self._usage = {}
+        self._hardlinks = {}
+        self._walk_stats = {}
+        self._stats_lock = threading.Lock()
         self._init_database()
 
     def log(self, message: str, level: str = "INFO"):
@@ -87,37 +254,39 @@ class ProjectScanner:
             print(f"[{timestamp}] {level}: {message}")
 
     def _init_database(self):
-        """Inicializa o banco de dados usando schema.sql."""
-        schema_path = Path(__file__).parent / "schema.sql"
-
-        if not self.db_path.exists():
+        """Abre o banco e aplica o schema (schema.sql e migrações de coluna)."""
+        creating = not self.db_path.exists()
+        if creating:
             self.log(f"Criando banco de dados: {self.db_path}")
 
-            if schema_path.exists():
-                # Criar banco usando schema.sql
-                with open(schema_path, 'r') as f:
-                    schema_sql = f.read()
-
-                conn = sqlite3.connect(str(self.db_path))
-                conn.executescript(schema_sql)
-                conn.commit()
-                conn.close()
-                self.log("Banco de dados criado com sucesso")
-            else:
-                self.log(f"Schema não encontrado: {schema_path}", "ERROR")
-                raise FileNotFoundError(f"Schema SQL não encontrado: {schema_path}")
-
         # Conectar ao banco
-        self.conn = sqlite3.connect(str(self.db_path))
+        self.conn = sqlite3.connect(str(self.db_path), timeout=self.SQLITE_BUSY_TIMEOUT)
         self.conn.row_factory = sqlite3.Row
+        # Necessário para o ON DELETE CASCADE de project_docs/project_dependencies
+        self.conn.execute("PRAGMA foreign_keys = ON")
+
+        try:
+            ensure_schema(self.conn, self.log)
+        except FileNotFoundError as e:
+            self.log(str(e), "ERROR")
+            raise
+
+        if creating:
+            self.log("Banco de dados criado com sucesso")
 
-    def scan_location(self, location: str, update_existing: bool = True) -> Dict:
+    def scan_location(self, location: str, update_existing: bool = True,
+                      checkpoint: Dict = None) -> Dict:
         """
         Escaneia uma localização em busca de projetos.
 
+        Com checkpoint_interval > 0, a fronteira do walk é gravada em
+        scan_checkpoints junto com os lotes; um scan interrompido continua
+        com `resume()`.
+
         Args:
             location: Path do diretório para escanear
             update_existing: Se True, atualiza projetos existentes
+            checkpoint: Linha de scan_checkpoints a retomar (usado por resume)
 
         Returns:
             Dicionário com estatísticas do scan
@@ -139,97 +308,1239 @@ class ProjectScanner:
             'location': str(location_path),
         }
 
-        # Escanear recursivamente
-        projects = self._scan_recursive(location_path, depth=0)
-        stats['projects_found'] = len(projects)
-
-        # === PASSE 1: Inserir/atualizar todos os projetos (sem hierarquia) ===
-        path_to_id = {}
+        # Retomada: contadores do que já foi gravado antes da interrupção
+        frontier = None
+        if checkpoint is not None:
+            frontier = json.loads(checkpoint['frontier'])
+            stats['projects_found'] = checkpoint['projects_committed']
+            stats['max_depth_found'] = checkpoint['max_depth_found']
+            stats['resumed'] = True
+            self.log(f"Retomando scan: {checkpoint['projects_committed']} projetos já gravados, "
+                     f"{len(frontier['pending'])} diretórios pendentes")
+
+        self._walk_stats = {'dirs_skipped': 0, 'dirs_examined': 0,
+                            'manifest_cache_hits': 0, 'manifest_cache_misses': 0,
+                            'workspace_roots': 0, 'workspace_members': 0, 'dirs_pruned': 0}
+        self.profiler.reset()
+        # Tamanhos só de um walk completo: a retomada não revisita o que já foi gravado
+        self._measuring = self.disk_usage and checkpoint is None
+        if self.disk_usage and checkpoint is not None:
+            self.log("Retomada: tamanhos em disco não são medidos (rode um novo scan)", "WARN")
+        self._usage = {}
+        self._hardlinks = {}
+        self._load_doc_cache(location_path)
+        self._load_manifest_cache(location_path)
+        self._load_known_roots(location_path)
+        if self.incremental:
+            self._load_fingerprints(location_path)
+
+        # Mark-and-sweep: todo projeto visto neste scan recebe a nova geração
+        # (a retomada continua a geração do scan interrompido)
+        generation = checkpoint['scan_generation'] if checkpoint else None
+        if generation is None:
+            generation = self._next_generation()
+        stats['scan_generation'] = generation
+
+        # Pipeline: walker (gera candidatos) → detecção (workers) → fila limitada → escrita
+        writer = ProjectBatchWriter(self.conn, batch_size=self.batch_size,
+                                    update_existing=update_existing, log=self.log,
+                                    generation=generation)
+        writer.before_commit.append(self._save_manifest_cache)
+        writer.before_commit.append(lambda: self._save_aliases(generation))
+        if self.incremental:
+            writer.before_commit.append(self._save_fingerprints)
+
+        if self.checkpoint_interval:
+            base = {
+                'projects_added': checkpoint['projects_added'] if checkpoint else 0,
+                'projects_updated': checkpoint['projects_updated'] if checkpoint else 0,
+            }
+            save = lambda force=False: self._save_checkpoint(location_path, generation, stats,
+                                                             writer, base, force)
+            writer.before_commit.append(save)
 
-        for project_info in projects:
-            if project_info['depth_level'] > stats['max_depth_found']:
-                stats['max_depth_found'] = project_info['depth_level']
+        def on_idle():
+            if self._cancel.is_set():
+                raise KeyboardInterrupt
+            # Walk sem projetos por muito tempo: lote vazio só para gravar a fronteira
+            if self.checkpoint_interval and self._checkpoint_due():
+                writer.flush()
 
-            existing = self._get_project_by_path(project_info['path'])
+        detected = self._detect_stage(self._walk(location_path, frontier))
 
-            if existing:
-                if update_existing:
-                    self._update_project(existing['id'], project_info)
-                    stats['projects_updated'] += 1
-                    self.log(f"Atualizado: {project_info['name']}")
-                path_to_id[project_info['path']] = existing['id']
-            else:
-                project_id = self._insert_project(project_info)
-                stats['projects_added'] += 1
-                self.log(f"Adicionado: {project_info['name']}")
-                path_to_id[project_info['path']] = project_id
-
-        # === PASSE 2: Resolver hierarquia pai/filho com IDs reais ===
-        hierarchy_updates = 0
-        for project_info in projects:
-            parent_path = project_info.get('parent_path')
-            if parent_path and parent_path in path_to_id:
-                project_path = project_info['path']
-                if project_path in path_to_id:
-                    parent_db_id = path_to_id[parent_path]
-                    project_db_id = path_to_id[project_path]
-                    self.conn.execute(
-                        "UPDATE projects SET parent_project_id = ?, is_subproject = 1 WHERE id = ?",
-                        (parent_db_id, project_db_id)
-                    )
-                    hierarchy_updates += 1
-
-        if hierarchy_updates > 0:
-            self.conn.commit()
-            self.log(f"Hierarquia resolvida: {hierarchy_updates} relações pai/filho")
+        try:
+            if self.checkpoint_interval:
+                save(force=True)
+                self.conn.commit()
+
+            for project_info in self._drain_pipeline(detected, on_idle):
+                if self._cancel.is_set():
+                    raise KeyboardInterrupt
+                stats['projects_found'] += 1
+                if project_info['depth_level'] > stats['max_depth_found']:
+                    stats['max_depth_found'] = project_info['depth_level']
+                with self._stats_lock:
+                    self._inflight.pop(project_info['path'], None)
+                writer.add(project_info)
+        except KeyboardInterrupt:
+            # Lote incompleto descartado; o último checkpoint é coerente com o banco
+            self.conn.rollback()
+            if self.checkpoint_interval:
+                self.log("Scan interrompido; continue com: scanner.py resume", "ERROR")
+            raise
+
+        writer.close()
+        if self._measuring:
+            with self.profiler.phase('write'):
+                self._save_disk_usage()
+        stats.update(writer.stats())
+        if checkpoint is not None:
+            stats['projects_added'] += checkpoint['projects_added']
+            stats['projects_updated'] += checkpoint['projects_updated']
+        stats.update(self._manifest_cache_stats())
+        stats['workspace_roots'] = self._walk_stats['workspace_roots']
+        stats['workspace_members'] = self._walk_stats['workspace_members']
+        stats['dirs_pruned'] = self._walk_stats['dirs_pruned']
+        stats['aliases_found'] = self._sweep_aliases(location_path, generation)
+        self._doc_cache = {}
+        self._manifest_cache = {}
+
+        if writer.hierarchy_updates > 0:
+            self.log(f"Hierarquia resolvida: {writer.hierarchy_updates} relações pai/filho")
+
+        with self.profiler.phase('write'):
+            stats['projects_removed'] = self._sweep_unseen(location_path, generation)
+        self._clear_checkpoint(location_path)
+        self.profiler.add('write', seconds=writer.write_seconds, calls=writer.flushes,
+                          rows_written=writer.rows_written + stats['projects_removed'])
+
+        if self.incremental:
+            stats.update(self._walk_stats)
+            self.log(f"Incremental: {stats['dirs_skipped']} diretórios inalterados, "
+                     f"{stats['dirs_examined']} reexaminados")
 
         # Salvar histórico de scan
         duration = time.time() - start_time
         stats['scan_duration_seconds'] = duration
+        if self.profiler.enabled:
+            stats['profile'] = self.profiler.summary()
         self._save_scan_history(stats)
 
         self.log(f"Scan completo: {stats['projects_found']} encontrados, "
-                f"{stats['projects_added']} novos, {stats['projects_updated']} atualizados "
-                f"em {duration:.2f}s")
+                f"{stats['projects_added']} novos, {stats['projects_updated']} atualizados, "
+                f"{stats['projects_removed']} não vistos em {duration:.2f}s")
 
         return stats
 
-    def _scan_recursive(self, path: Path, depth: int, parent_path: str = None) -> List[Dict]:
+    def _walk(self, root: Path, frontier: Dict = None) -> Iterator[Dict]:
         """
-        Escaneia recursivamente em busca de projetos.
+        Percorre a árvore gerando candidatos a projeto à medida que são encontrados.
+
+        Com workers > 1 usa o walker paralelo; caso contrário, uma DFS
+        iterativa (pilha explícita, pré-ordem) sem listas intermediárias.
+        A fronteira é montada já na chamada, antes da primeira iteração,
+        para o checkpoint inicial do scan.
 
         Args:
-            path: Caminho atual
-            depth: Profundidade atual
-            parent_path: Path do projeto pai (para resolução posterior)
+            root: Diretório raiz do scan
+            frontier: Fronteira de um checkpoint ({'pending', 'deferred'}) a retomar
 
         Returns:
-            Lista de dicionários com informações de projetos
+            Iterador de projetos identificados (ainda sem metadados) ou reaproveitados
         """
-        if depth > self.max_depth:
-            return []
+        self._visited = {}
+        self._entered = set()
+        self._known_dirs = self._load_known_dirs(root)
+        self._mount_points = self._read_mount_points(root)
+        self._aliases = []
+        self._inflight = {}
+        self._walk_root = root
+        self._ignore_chains = {}
+        self._rebuilt_chains = {}
+
+        # Entradas da fronteira: (path, profundidade, path do pai, segue symlink, modo de visita)
+        if frontier is None:
+            start = [(str(root), 0, None, False, self.VISIT_TREE)]
+            self._deferred_links = []
+        else:
+            start = [tuple(entry) for entry in frontier['pending']]
+            self._deferred_links = [(Path(path), depth, parent_path)
+                                    for path, depth, parent_path in frontier['deferred']]
+        self._pending = {entry[0]: entry for entry in start}
+
+        if self.workers > 1:
+            return self._walk_parallel(start)
+        return self._walk_serial(start)
+
+    def _walk_serial(self, start: List[Tuple]) -> Iterator[Dict]:
+        """DFS iterativa (pilha explícita, pré-ordem) a partir das entradas da fronteira."""
+        stack = [(Path(path), *rest) for path, *rest in reversed(start)]
+
+        while True:
+            # Árvore real esgotada: symlinks adiados, cujo alvo pode já ter sido visitado
+            if not stack:
+                stack = [(link, link_depth, link_parent, True, self.VISIT_TREE)
+                         for link, link_depth, link_parent in reversed(self._take_deferred_links())]
+                if not stack:
+                    break
+
+            path, depth, parent_path, follow_link, visit = stack.pop()
+
+            # Verificar se este diretório é um projeto e listar os filhos a visitar
+            project_info, children, current_parent_path = self._visit_directory(
+                path, depth, parent_path, follow_link, visit
+            )
+
+            if project_info:
+                yield project_info
+
+            for child, child_depth, child_visit in reversed(children):
+                stack.append((child, child_depth, current_parent_path, False, child_visit))
+
+    def _walk_parallel(self, start: List[Tuple]) -> Iterator[Dict]:
+        """
+        Walker com pool de threads, distribuindo subárvores entre os workers.
+
+        Cada diretório é uma tarefa independente (identificação + listagem
+        via os.scandir). Os projetos saem na ordem em que as tarefas terminam;
+        um pai sempre sai antes dos filhos, pois as tarefas dos filhos só são
+        criadas depois que a dele termina.
+        """
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            pending = {executor.submit(self._visit_directory, Path(path), *rest)
+                       for path, *rest in start}
+            if not pending:
+                pending = {
+                    executor.submit(self._visit_directory, link, depth, parent_path, True)
+                    for link, depth, parent_path in self._take_deferred_links()
+                }
+
+            while pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+
+                for future in done:
+                    project_info, children, current_parent_path = future.result()
+
+                    for child, child_depth, child_visit in children:
+                        pending.add(executor.submit(
+                            self._visit_directory, child, child_depth, current_parent_path,
+                            False, child_visit
+                        ))
+
+                    if project_info:
+                        yield project_info
+
+                if not pending:
+                    pending = {
+                        executor.submit(self._visit_directory, link, depth, parent_path, True)
+                        for link, depth, parent_path in self._take_deferred_links()
+                    }
+
+    def _detect_stage(self, candidates: Iterator[Dict]) -> Iterator[Dict]:
+        """
+        Completa os metadados (git, docs, package.json) dos candidatos.
+
+        Com workers > 1 roda em um pool com janela limitada, preservando a
+        ordem de entrada (o pai continua chegando antes dos filhos à escrita).
+        """
+        if self.workers <= 1:
+            for candidate in candidates:
+                yield self._complete_project(candidate)
+            return
+
+        window = deque()
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            for candidate in candidates:
+                window.append(executor.submit(self._complete_project, candidate))
+                if len(window) >= self.workers * 4:
+                    yield window.popleft().result()
+
+            while window:
+                yield window.popleft().result()
+
+    def _drain_pipeline(self, producer: Iterator[Dict], on_idle=None) -> Iterator[Dict]:
+        """
+        Roda o produtor (walk + detecção) em outra thread e entrega os projetos
+        pela fila limitada; quem consome (a thread que escreve no SQLite) é
+        a única que toca a conexão.
+
+        Args:
+            on_idle: Chamada na thread consumidora a cada segundo sem projetos
+        """
+        channel = queue.Queue(maxsize=self.PIPELINE_QUEUE_SIZE)
+        finished = object()
+        stop = threading.Event()
+        errors = []
 
-        projects = []
+        def put(item) -> bool:
+            while not stop.is_set():
+                try:
+                    channel.put(item, timeout=0.1)
+                    return True
+                except queue.Full:
+                    continue
+            return False
+
+        def produce():
+            try:
+                for item in producer:
+                    if not put(item):
+                        return
+            except BaseException as e:
+                errors.append(e)
+            finally:
+                put(finished)
+
+        thread = threading.Thread(target=produce, name='scanner-producer', daemon=True)
+        thread.start()
+
+        try:
+            while True:
+                try:
+                    item = channel.get(timeout=1.0 if on_idle else None)
+                except queue.Empty:
+                    on_idle()
+                    continue
+                if item is finished:
+                    break
+                yield item
+        finally:
+            stop.set()
+            thread.join()
+
+        if errors:
+            raise errors[0]
+
+    def _visit_directory(self, path: Path, depth: int, parent_path: str = None,
+                         follow_link: bool = False,
+                         visit: str = VISIT_TREE) -> Tuple[Optional[Dict], List[Tuple], str]:
+        """
+        Processa um único diretório (identificação + listagem) para os walkers.
+
+        Symlinks e pontos de montagem ficam para depois do walk principal,
+        para que o path real seja visitado primeiro. Um diretório já visitado
+        (mesmo st_dev/st_ino por outro path) ou já indexado por outro path
+        não é descido de novo e vira alias em project_aliases.
+
+        Args:
+            follow_link: Visita de um symlink adiado (segue o link)
+            visit: VISIT_TREE, VISIT_MEMBER (membro de workspace) ou VISIT_SELF
+                (só reidentifica o projeto: retomada de um checkpoint, com os
+                filhos já na fronteira)
+
+        Returns:
+            Tupla (projeto identificado ou None, filhos a visitar como
+            (path, profundidade, modo de visita), path do projeto pai para os filhos)
+        """
+        project_info = None
+        children = []
+        gitignored = set()
+        deferred = False
+        target = None
+
+        with self.profiler.phase('walk'):
+            self.profiler.add('walk', stats=1)
+            try:
+                st = os.stat(path) if follow_link else os.lstat(path)
+            except OSError:
+                st = None
+
+            if st is None:
+                pass
+            elif stat.S_ISLNK(st.st_mode) or (not follow_link and str(path) in self._mount_points):
+                deferred = True
+            else:
+                via = 'symlink' if follow_link and str(path) not in self._mount_points else 'mount'
+                target = self._claim_directory(path, st, via)
+
+            if target is None:
+                pass
+            elif visit == self.VISIT_SELF:
+                # Na retomada de um projeto em voo o fingerprint pode ter sido
+                # gravado antes do projeto, então a detecção é sempre refeita
+                names, files, _ = self._list_directory(target)
+                project_info = self._identify_project(target, depth, parent_path, (names, files), st)
+            else:
+                if self.incremental:
+                    project_info, subdirs, names = self._visit_incremental(target, depth, parent_path, st)
+                else:
+                    # Uma única listagem serve para a detecção e para a descida
+                    names, files, subdirs = self._list_directory(target)
+                    project_info = self._identify_project(target, depth, parent_path, (names, files), st)
+                children = self._children(target, depth, names, subdirs, visit)
+                if self.gitignore:
+                    kept = self._prune_ignored(target, names, children)
+                    gitignored = {str(child) for child, _, _ in children} - {str(child) for child, _, _ in kept}
+                    children = kept
+        self.profiler.add('walk', dirs=1)
+
+        current_parent_path = project_info['path'] if project_info else parent_path
+
+        # Filhos além de max_depth seriam descartados pelo walker
+        children = [child for child in children if child[1] <= self.max_depth]
+
+        if self._measuring and target is not None and visit != self.VISIT_SELF \
+                and current_parent_path is not None:
+            with self.profiler.phase('walk'):
+                self._add_usage(target, names, subdirs, children, gitignored, current_parent_path)
+
+        # Fronteira atualizada em um passo: um checkpoint nunca vê o diretório
+        # fora da fronteira sem os filhos e o projeto já registrados
+        with self._stats_lock:
+            self._pending.pop(str(path), None)
+            if deferred:
+                self._deferred_links.append((path, depth, parent_path))
+            for child, child_depth, child_visit in children:
+                self._pending[str(child)] = (str(child), child_depth, current_parent_path,
+                                             False, child_visit)
+            if project_info:
+                self._inflight[project_info['path']] = (str(target), depth, parent_path,
+                                                        follow_link, self.VISIT_SELF)
+
+        return project_info, children, current_parent_path
+
+    def _add_usage(self, path: Path, names: Set[str], subdirs: List[Path], children: List[Tuple],
+                   gitignored: Set[str], owner: str):
+        """
+        Soma ao projeto dono os arquivos do diretório e as subárvores que o walk não desce.
+
+        O dono é o próprio diretório, se for projeto, ou o projeto ancestral
+        mais próximo: diretórios indexados como projeto têm o próprio
+        tamanho. Subárvores fora do walk (IGNORE_DIRS, .gitignore, além de
+        max_depth, fora dos membros do workspace) são medidas aqui, sem
+        seguir symlinks nem atravessar dispositivos; as duas primeiras contam
+        como diretórios ignorados. Arquivos com hardlinks ficam com o menor
+        path (resolvidos em _save_disk_usage), independente da ordem das threads.
+        """
+        totals = [0, 0]  # bytes de fontes, bytes em diretórios ignorados
+        hardlinks = []
+        walked = {str(child) for child, _, _ in children}
+        subtrees = []
+
+        self.profiler.add('walk', stats=len(names))
+        for name in names:
+            entry = os.path.join(path, name)
+            try:
+                st = os.lstat(entry)
+            except OSError:
+                continue
+            if stat.S_ISREG(st.st_mode):
+                self._count_file(entry, st, 0, totals, hardlinks)
+            elif stat.S_ISDIR(st.st_mode) and name in self.ignore_dirs:
+                subtrees.append((entry, 1, st.st_dev))
 
-        # Verificar se este diretório é um projeto
-        project_info = self._detect_project(path, depth, parent_path)
+        for subdir in subdirs:
+            if str(subdir) in walked:
+                continue
+            try:
+                st = os.lstat(subdir)
+            except OSError:
+                continue
+            if stat.S_ISDIR(st.st_mode):
+                subtrees.append((str(subdir), 1 if str(subdir) in gitignored else 0, st.st_dev))
+
+        for root, kind, device in subtrees:
+            self._subtree_usage(root, kind, device, walked, totals, hardlinks)
+
+        with self._stats_lock:
+            usage = self._usage.setdefault(owner, [0, 0])
+            usage[0] += totals[0]
+            usage[1] += totals[1]
+            for key, candidate in hardlinks:
+                current = self._hardlinks.get(key)
+                if current is None or candidate[0] < current[0]:
+                    self._hardlinks[key] = (candidate[0], owner, candidate[1], candidate[2])
+
+    def _subtree_usage(self, root: str, kind: int, device: int, walked: Set[str],
+                       totals: List[int], hardlinks: List):
+        """Mede uma subárvore fora do walk (sem descer nos diretórios que o walk visita)."""
+        stack = [(root, kind)]
+        while stack:
+            directory, directory_kind = stack.pop()
+            try:
+                with os.scandir(directory) as it:
+                    entries = list(it)
+            except OSError:
+                continue
+            self.profiler.add('walk', dirs=1, stats=len(entries))
 
-        if project_info:
-            projects.append(project_info)
-            current_parent_path = project_info['path']
+            for entry in entries:
+                try:
+                    st = entry.stat(follow_symlinks=False)
+                except OSError:
+                    continue
+                if stat.S_ISREG(st.st_mode):
+                    self._count_file(entry.path, st, directory_kind, totals, hardlinks)
+                elif stat.S_ISDIR(st.st_mode) and st.st_dev == device and entry.path not in walked:
+                    stack.append((entry.path, 1 if entry.name in self.ignore_dirs else directory_kind))
+
+    @staticmethod
+    def _count_file(path: str, st: os.stat_result, kind: int, totals: List[int], hardlinks: List):
+        """Soma um arquivo regular; com hardlinks, guarda o candidato (path, tipo, bytes) por inode."""
+        size = st.st_blocks * 512
+        if st.st_nlink > 1:
+            hardlinks.append(((st.st_dev, st.st_ino), (path, kind, size)))
         else:
-            current_parent_path = parent_path
+            totals[kind] += size
+
+    def _save_disk_usage(self):
+        """Grava os tamanhos medidos no walk (hardlinks contados uma vez, no menor path)."""
+        with self._stats_lock:
+            usage, self._usage = self._usage, {}
+            hardlinks, self._hardlinks = self._hardlinks, {}
+
+        for _, owner, kind, size in hardlinks.values():
+            usage.setdefault(owner, [0, 0])[kind] += size
+
+        self.conn.executemany(
+            "UPDATE projects SET disk_size_source = ?, disk_size_ignored = ? WHERE path = ?",
+            [(source, ignored, owner) for owner, (source, ignored) in usage.items()]
+        )
+        self.conn.commit()
+
+    def _children(self, path: Path, depth: int, names: Set[str], subdirs: List[Path],
+                  visit: str) -> List[Tuple[Path, int, str]]:
+        """
+        Filhos a visitar a partir de um diretório.
 
-        # Escanear subdiretórios (exceto os ignorados)
+        Com workspace_members, num monorepo só os membros declarados nos
+        manifests de workspace (pnpm-workspace.yaml, package.json, lerna.json,
+        nx.json); cada membro é visitado sem descer, a não ser que seja um
+        workspace também. Sem globs declarados (ex.: só turbo.json) ou sem
+        workspace_members (padrão), desce a árvore inteira.
+        """
+        if self.workspace_members and any(marker in names for marker in self.MONOREPO_MARKERS):
+            globs = read_member_globs(path, names)
+            if globs:
+                members = expand_member_globs(path, globs, lambda d: self._list_directory(d)[2])
+                self._count('workspace_roots')
+                self._count('workspace_members', len(members))
+                self.log(f"Workspace {path}: {len(members)} membros")
+                return [(member, depth + len(member.relative_to(path).parts), self.VISIT_MEMBER)
+                        for member in members]
+            self.log(f"Workspace sem globs de membros, descendo a árvore inteira: {path}")
+
+        if visit == self.VISIT_MEMBER:
+            return []
+        return [(subdir, depth + 1, self.VISIT_TREE) for subdir in subdirs]
+
+    def _prune_ignored(self, path: Path, names: Set[str],
+                       children: List[Tuple[Path, int, str]]) -> List[Tuple[Path, int, str]]:
+        """
+        Remove os filhos ignorados pelo .gitignore do repositório (--gitignore).
+
+        A cadeia de arquivos de ignore do diretório é herdada do pai e passada
+        adiante aos filhos mantidos. Um diretório ignorado que é repositório
+        próprio (tem .git) continua sendo visitado.
+        """
+        chain = self._extend_ignore_chain(self._inherited_ignore_chain(path), path, names)
+
+        kept = []
+        for child in children:
+            if chain and is_ignored(chain, str(child[0])) and not os.path.lexists(child[0] / '.git'):
+                self._count('dirs_pruned')
+                self.log(f"Ignorado pelo .gitignore: {child[0]}")
+                continue
+            kept.append(child)
+
+        with self._stats_lock:
+            for child in kept:
+                self._ignore_chains[str(child[0])] = chain
+        return kept
+
+    def _inherited_ignore_chain(self, path: Path) -> Tuple[GitIgnore, ...]:
+        """
+        Cadeia herdada do pai, registrada quando ele foi visitado.
+
+        Sem registro (raiz do scan, symlink adiado, fronteira de uma retomada)
+        a cadeia é remontada a partir dos ancestrais até a raiz do scan.
+        """
+        with self._stats_lock:
+            chain = self._ignore_chains.pop(str(path), None)
+        if chain is not None:
+            return chain
+
+        chain = ()
+        ancestors = [ancestor for ancestor in reversed(path.parents)
+                     if ancestor == self._walk_root or self._walk_root in ancestor.parents]
+        for ancestor in ancestors:
+            cached = self._rebuilt_chains.get(str(ancestor))
+            if cached is None:
+                names = {name for name in ('.git', '.gitignore') if os.path.lexists(ancestor / name)}
+                cached = self._extend_ignore_chain(chain, ancestor, names)
+                self._rebuilt_chains[str(ancestor)] = cached
+            chain = cached
+        return chain
+
+    def _extend_ignore_chain(self, chain: Tuple[GitIgnore, ...], path: Path,
+                             names: Set[str]) -> Tuple[GitIgnore, ...]:
+        """
+        Cadeia do diretório: um .git inicia a de um novo repositório
+        (info/exclude + .gitignore); fora de um repositório não há regras.
+        """
+        if '.git' in names:
+            chain = ()
+            if os.path.isdir(path / '.git'):
+                chain += self._load_gitignore(path, path / '.git' / 'info' / 'exclude')
+        elif not chain:
+            return chain
+
+        if '.gitignore' in names:
+            chain += self._load_gitignore(path, path / '.gitignore')
+        return chain
+
+    def _load_gitignore(self, base: Path, file_path: Path) -> Tuple[GitIgnore, ...]:
+        """Arquivo de ignore compilado, em cache por path enquanto size/mtime não mudam."""
         try:
-            for item in path.iterdir():
-                if item.is_dir() and item.name not in self.IGNORE_DIRS:
-                    sub_projects = self._scan_recursive(item, depth + 1, current_parent_path)
-                    projects.extend(sub_projects)
+            st = os.stat(file_path)
+        except OSError:
+            return ()
+
+        key = (st.st_size, st.st_mtime_ns)
+        cached = self._gitignore_cache.get(str(file_path))
+        if cached is None or cached[0] != key:
+            cached = (key, GitIgnore.from_file(str(base), file_path))
+            with self._stats_lock:
+                self._gitignore_cache[str(file_path)] = cached
+        return (cached[1],) if cached[1] else ()
+
+    def _list_directory(self, path: Path) -> Tuple[Set[str], Set[str], List[Path]]:
+        """
+        Lista um diretório com os.scandir, usando o tipo em cache do DirEntry.
+
+        Todas as checagens de marcadores, monorepo, docs e lockfiles são
+        feitas sobre esses conjuntos, sem um stat por arquivo candidato.
+
+        Returns:
+            Tupla (nomes de todas as entradas, nomes de arquivos regulares,
+            subdiretórios não ignorados)
+        """
+        names = set()
+        files = set()
+        subdirs = []
+
+        try:
+            with os.scandir(path) as entries:
+                for entry in entries:
+                    names.add(entry.name)
+                    try:
+                        is_dir = entry.is_dir()
+                        if not is_dir and entry.is_file():
+                            files.add(entry.name)
+                    except OSError:
+                        is_dir = False
+                    if is_dir and entry.name not in self.ignore_dirs:
+                        subdirs.append(path / entry.name)
         except PermissionError:
             self.log(f"Sem permissão: {path}", "WARN")
 
-        return projects
+        return names, files, subdirs
+
+    def _claim_directory(self, path: Path, st: os.stat_result, via: str) -> Optional[Path]:
+        """
+        Registra o diretório como visitado pelo (st_dev, st_ino).
+
+        O path canônico não depende da ordem das threads: o path já indexado
+        para o inode ganha enquanto ainda for o mesmo diretório (e é visitado
+        no lugar do path que chegou primeiro); symlinks e pontos de montagem
+        só são visitados depois da árvore real e, entre eles, o menor path é
+        reservado antes (_take_deferred_links).
+
+        Returns:
+            Path canônico a visitar na primeira chegada ao diretório (o próprio
+            `path`, o já indexado ou o reservado), ou None se já foi visitado.
+            Se o canônico não é `path`, o alias é guardado para project_aliases
+        """
+        key = (st.st_dev, st.st_ino)
+        known = self._known_canonical(path, key)
+        with self._stats_lock:
+            canonical = self._visited.setdefault(key, known or str(path))
+            target = None
+            if key not in self._entered:
+                self._entered.add(key)
+                target = Path(canonical)
+            if canonical != str(path):
+                self._aliases.append((str(path), canonical, st.st_dev, st.st_ino, via))
+
+        if canonical != str(path):
+            self.log(f"Já visitado por outro path ({via}): {path} -> {canonical}")
+        return target
+
+    def _known_canonical(self, path: Path, key: Tuple[int, int]) -> Optional[str]:
+        """Path já indexado para o (st_dev, st_ino), se for outro e ainda for o mesmo diretório."""
+        known = self._known_dirs.get(key)
+        if known is None or known == str(path):
+            return None
+        try:
+            st = os.stat(known)
+        except OSError:
+            return None
+        return known if (st.st_dev, st.st_ino) == key else None
+
+    def _take_deferred_links(self) -> List[Tuple[Path, int, Optional[str]]]:
+        """
+        Retira os symlinks e pontos de montagem adiados pelo walk, em ordem de path.
+
+        Antes de qualquer visita, cada diretório de destino é reservado para o
+        menor path adiado que chega nele, para que a disputa entre as threads
+        não decida qual path é o canônico.
+        """
+        with self._stats_lock:
+            links, self._deferred_links = self._deferred_links, []
+            links.sort(key=lambda link: str(link[0]))
+            for link, depth, parent_path in links:
+                self._pending[str(link)] = (str(link), depth, parent_path, True, self.VISIT_TREE)
+
+        for link, _, _ in links:
+            try:
+                st = os.stat(link)
+            except OSError:
+                continue
+            key = (st.st_dev, st.st_ino)
+            if self._known_canonical(link, key) is None:
+                with self._stats_lock:
+                    self._visited.setdefault(key, str(link))
+        return links
+
+    def _load_known_dirs(self, root: Path) -> Dict[Tuple[int, int], str]:
+        """(st_dev, st_ino) → path já indexado sob a raiz (projetos, depois aliases)."""
+        known = {}
+        under_location, params = self._under_location(root)
+        for row in self.conn.execute(
+            f"SELECT dir_device, dir_inode, path FROM projects "
+            f"WHERE dir_inode IS NOT NULL AND {under_location} ORDER BY path", params
+        ):
+            known.setdefault((row['dir_device'], row['dir_inode']), row['path'])
+
+        under_location, params = self._under_location(root, 'canonical_path')
+        for row in self.conn.execute(
+            f"SELECT device, inode, canonical_path FROM project_aliases "
+            f"WHERE {under_location} ORDER BY canonical_path", params
+        ):
+            known.setdefault((row['device'], row['inode']), row['canonical_path'])
+        return known
+
+    @classmethod
+    def _read_mount_points(cls, root: Path) -> Set[str]:
+        """Pontos de montagem abaixo da raiz, de /proc/self/mountinfo (vazio fora do Linux)."""
+        try:
+            with open(cls.MOUNTINFO, 'r', encoding='utf-8', errors='surrogateescape') as f:
+                lines = f.read().splitlines()
+        except OSError:
+            return set()
+
+        prefix = str(root).rstrip(os.sep) + os.sep
+        mount_points = set()
+        for line in lines:
+            fields = line.split(' ')
+            if len(fields) < 5:
+                continue
+            # Espaços e barras invertidas vêm escapados em octal (\040)
+            mount_point = re.sub(r'\\([0-7]{3})', lambda m: chr(int(m.group(1), 8)), fields[4])
+            if mount_point.startswith(prefix):
+                mount_points.add(mount_point)
+        return mount_points
+
+    def _save_aliases(self, generation: int):
+        """Grava os aliases coletados até aqui (commit fica com o writer)."""
+        with self._stats_lock:
+            rows, self._aliases = self._aliases, []
+
+        if not rows:
+            return
+
+        self.conn.executemany("""
+            INSERT OR REPLACE INTO project_aliases (
+                alias_path, canonical_path, device, inode, via, scan_generation, updated_at
+            ) VALUES (?, ?, ?, ?, ?, ?, CURRENT_TIMESTAMP)
+        """, [row + (generation,) for row in rows])
+
+    def _sweep_aliases(self, location_path: Path, generation: int) -> int:
+        """
+        Remove aliases sob a localização que o scan não viu de novo.
+
+        Returns:
+            Número de aliases vistos neste scan
+        """
+        under_location, params = self._under_location(location_path, 'alias_path')
+        self.conn.execute(
+            f"DELETE FROM project_aliases WHERE {under_location} AND scan_generation < ?",
+            params + (generation,)
+        )
+        self.conn.commit()
+        row = self.conn.execute(
+            f"SELECT COUNT(*) FROM project_aliases WHERE {under_location}", params
+        ).fetchone()
+        return row[0]
+
+    def _count(self, key: str, amount: int = 1):
+        """Incrementa um contador do walk (seguro entre threads)."""
+        with self._stats_lock:
+            self._walk_stats[key] = self._walk_stats.get(key, 0) + amount
+
+    # ------------------------------------------------------------------
+    # Checkpoints e retomada (scanner.py resume)
+    # ------------------------------------------------------------------
+
+    def _checkpoint_options(self) -> Dict:
+        """Opções do scanner gravadas no checkpoint (a retomada usa as mesmas)."""
+        return {
+            'max_depth': self.max_depth,
+            'workers': self.workers,
+            'incremental': self.incremental,
+            'batch_size': self.batch_size,
+            'prune': self.prune,
+            'profile': self.profile,
+            'ignore': sorted(self.ignore_dirs - self.IGNORE_DIRS),
+            'checkpoint_interval': self.checkpoint_interval,
+            'workspace_members': self.workspace_members,
+            'gitignore': self.gitignore,
+            'disk_usage': self.disk_usage,
+        }
+
+    def _checkpoint_due(self) -> bool:
+        return time.time() - self._last_checkpoint >= self.checkpoint_interval
+
+    def _save_checkpoint(self, location_path: Path, generation: Optional[int], stats: Dict,
+                         writer: 'ProjectBatchWriter' = None, base: Dict = None, force: bool = False):
+        """
+        Grava a fronteira do walk (commit fica com o writer).
+
+        Roda dentro da transação de um lote: os projetos do lote entram no
+        banco junto com a fronteira que já não os contém. Projetos ainda na
+        detecção ou na fila voltam à fronteira para serem reidentificados
+        (sem nova descida).
+        """
+        if not force and not self._checkpoint_due():
+            return
+
+        with self._stats_lock:
+            pending = list(self._inflight.values()) + list(self._pending.values())
+            deferred = [(str(link), depth, parent_path) for link, depth, parent_path in self._deferred_links]
+
+        base = base or {}
+        self.conn.execute("""
+            INSERT INTO scan_checkpoints (
+                location, scan_generation, frontier, projects_committed,
+                projects_added, projects_updated, max_depth_found, options
+            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+            ON CONFLICT(location) DO UPDATE SET
+                scan_generation = excluded.scan_generation,
+                frontier = excluded.frontier,
+                projects_committed = excluded.projects_committed,
+                projects_added = excluded.projects_added,
+                projects_updated = excluded.projects_updated,
+                max_depth_found = excluded.max_depth_found,
+                options = excluded.options,
+                updated_at = CURRENT_TIMESTAMP
+        """, (
+            str(location_path),
+            generation,
+            json.dumps({'pending': pending, 'deferred': deferred}),
+            stats['projects_found'] - (len(writer.pending) if writer else 0),
+            base.get('projects_added', 0) + (writer.added if writer else 0),
+            base.get('projects_updated', 0) + (writer.updated if writer else 0),
+            stats['max_depth_found'],
+            json.dumps(self._checkpoint_options()),
+        ))
+        self._last_checkpoint = time.time()
+
+    def _clear_checkpoint(self, location_path: Path):
+        """Remove o checkpoint de uma localização cujo scan terminou."""
+        self.conn.execute("DELETE FROM scan_checkpoints WHERE location = ?", (str(location_path),))
+        self.conn.commit()
+
+    def resume(self, location: str = None) -> List[Dict]:
+        """
+        Continua os scans interrompidos a partir do último checkpoint.
+
+        Só a fronteira gravada é percorrida; subárvores concluídas antes da
+        interrupção não são visitadas de novo. Cada localização usa as
+        opções do scan original e a mesma geração do mark-and-sweep.
+
+        Args:
+            location: Retoma só esta localização (padrão: todas com checkpoint)
+
+        Returns:
+            Estatísticas de cada scan retomado
+        """
+        query = "SELECT * FROM scan_checkpoints"
+        params = ()
+        if location is not None:
+            query += " WHERE location = ?"
+            params = (str(Path(location).resolve()),)
+
+        results = []
+        for row in self.conn.execute(query + " ORDER BY started_at, location", params).fetchall():
+            checkpoint = dict(row)
+            options = json.loads(checkpoint['options'])
+            if 'full_walk' in options:
+                # Checkpoints anteriores ao workspace_members opt-in
+                options['workspace_members'] = not options.pop('full_walk')
+            scanner = ProjectScanner(db_path=self.db_path, verbose=self.verbose, **options)
+            try:
+                results.append(scanner.scan_location(checkpoint['location'], checkpoint=checkpoint))
+            finally:
+                scanner.close()
+        return results
+
+    # ------------------------------------------------------------------
+    # Scan incremental (fingerprints por diretório)
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _under_location(location_path: Path, column: str = 'path') -> Tuple[str, Tuple]:
+        """Filtro SQL (e parâmetros) para paths iguais ou abaixo da localização."""
+        prefix = str(location_path).rstrip(os.sep) + os.sep
+        return (f"({column} = ? OR substr({column}, 1, ?) = ?)",
+                (str(location_path), len(prefix), prefix))
+
+    def _load_doc_cache(self, location_path: Path):
+        """Carrega tamanho, mtime e line_count dos docs já indexados sob a localização."""
+        under_location, params = self._under_location(location_path, 'file_path')
+        self._doc_cache = {
+            row['file_path']: (row['file_size'], row['last_modified'], row['line_count'])
+            for row in self.conn.execute(
+                f"SELECT file_path, file_size, last_modified, line_count FROM project_docs "
+                f"WHERE file_size IS NOT NULL AND {under_location}", params
+            )
+        }
+
+    def _load_known_roots(self, location_path: Path):
+        """Carrega HEAD e commits raiz já lidos dos repositórios sob a localização."""
+        under_location, params = self._under_location(location_path)
+        self._known_roots = {
+            row['path']: (row['git_head_commit'], row['git_root_commits'])
+            for row in self.conn.execute(
+                f"SELECT path, git_head_commit, git_root_commits FROM projects "
+                f"WHERE git_root_commits IS NOT NULL AND {under_location}", params
+            )
+        }
+
+    def _load_manifest_cache(self, location_path: Path):
+        """Carrega o cache de package.json já analisados sob a localização."""
+        under_location, params = self._under_location(location_path)
+        self._manifest_cache = {
+            row['path']: ((row['inode'], row['mtime_ns'], row['size']), {
+                'framework': row['framework'],
+                'package_manager': row['package_manager'],
+                'dependencies': json.loads(row['dependencies'] or '[]'),
+            })
+            for row in self.conn.execute(
+                f"SELECT * FROM manifest_cache WHERE {under_location}", params
+            )
+        }
+
+    def _load_path_caches(self, paths: List[str]):
+        """
+        Carrega os caches de docs, manifests e commits raiz só dos projetos em `paths`.
+
+        Equivale aos _load_*_cache por localização, para o update de projetos
+        avulsos (sem ler o cache da árvore inteira).
+        """
+        self._doc_cache = {}
+        self._manifest_cache = {}
+        self._known_roots = {}
+
+        for i in range(0, len(paths), ProjectBatchWriter.MAX_SQL_VARIABLES):
+            chunk = paths[i:i + ProjectBatchWriter.MAX_SQL_VARIABLES]
+            placeholders = ','.join('?' for _ in chunk)
+
+            for row in self.conn.execute(f"""
+                SELECT d.file_path, d.file_size, d.last_modified, d.line_count
+                FROM project_docs d JOIN projects p ON p.id = d.project_id
+                WHERE d.file_size IS NOT NULL AND p.path IN ({placeholders})
+            """, chunk):
+                self._doc_cache[row['file_path']] = (
+                    row['file_size'], row['last_modified'], row['line_count']
+                )
+
+            for row in self.conn.execute(f"""
+                SELECT path, git_head_commit, git_root_commits FROM projects
+                WHERE git_root_commits IS NOT NULL AND path IN ({placeholders})
+            """, chunk):
+                self._known_roots[row['path']] = (row['git_head_commit'], row['git_root_commits'])
+
+            manifests = [str(Path(path) / 'package.json') for path in chunk]
+            for row in self.conn.execute(
+                f"SELECT * FROM manifest_cache WHERE path IN ({placeholders})", manifests
+            ):
+                self._manifest_cache[row['path']] = ((row['inode'], row['mtime_ns'], row['size']), {
+                    'framework': row['framework'],
+                    'package_manager': row['package_manager'],
+                    'dependencies': json.loads(row['dependencies'] or '[]'),
+                })
+
+    def _save_manifest_cache(self):
+        """Grava os manifests parseados até aqui (commit fica com o writer)."""
+        with self._stats_lock:
+            rows, self._new_manifests = self._new_manifests, []
+
+        if not rows:
+            return
+
+        self.conn.executemany("""
+            INSERT OR REPLACE INTO manifest_cache (
+                path, inode, mtime_ns, size, framework, package_manager,
+                dependencies, parse_error, updated_at
+            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, CURRENT_TIMESTAMP)
+        """, rows)
+
+    def _manifest_cache_stats(self) -> Dict:
+        """Acertos e falhas do cache de manifests no scan atual."""
+        hits = self._walk_stats.get('manifest_cache_hits', 0)
+        misses = self._walk_stats.get('manifest_cache_misses', 0)
+        return {
+            'manifest_cache_hits': hits,
+            'manifest_cache_misses': misses,
+            'manifest_cache_hit_rate': round(hits / (hits + misses), 3) if hits + misses else None,
+        }
+
+    def _next_generation(self) -> int:
+        """Próximo número de geração do mark-and-sweep."""
+        row = self.conn.execute("SELECT COALESCE(MAX(scan_generation), 0) FROM projects").fetchone()
+        return row[0] + 1
+
+    def _sweep_unseen(self, location_path: Path, generation: int) -> int:
+        """
+        Remove (ou arquiva) os projetos sob a localização que o scan não viu.
+
+        Roda depois do último lote: toda linha vista já tem a geração atual,
+        então uma geração menor significa projeto apagado, movido ou só não
+        visitado (max_depth, ignore, gitignore, membros de workspace). Linhas
+        cujo diretório ainda existe e ainda é um projeto são mantidas, a não
+        ser que o path seja um alias registrado em project_aliases.
+
+        Args:
+            location_path: Localização escaneada
+            generation: Geração gravada neste scan
+
+        Returns:
+            Número de projetos removidos/arquivados
+        """
+        if self.prune == 'none':
+            return 0
+
+        under_location, params = self._under_location(location_path)
+        unseen = self.conn.execute(
+            f"SELECT id, path FROM projects WHERE {under_location} AND scan_generation < ? "
+            f"AND path NOT IN (SELECT alias_path FROM project_aliases) ORDER BY path",
+            params + (generation,)
+        ).fetchall()
+        skipped = [row['id'] for row in unseen if self._still_a_project(row['path'])]
+        if skipped:
+            self.log(f"Projetos não visitados mas ainda no disco (mantidos): {len(skipped)}")
+
+        # Pulados ficam com a geração atual, fora do filtro do prune
+        self.conn.executemany("UPDATE projects SET scan_generation = ? WHERE id = ?",
+                              [(generation, project_id) for project_id in skipped])
+        removed = self._prune_projects(f"{under_location} AND scan_generation < ?",
+                                       params + (generation,))
+        self.conn.commit()
+        return removed
+
+    def _still_a_project(self, path: str) -> bool:
+        """True se o diretório existe e os marcadores ainda o detectam como projeto."""
+        try:
+            names = set(os.listdir(path))
+        except OSError:
+            return False
+        return self._detect_type(names) is not None
+
+    def _prune_projects(self, where: str, params: Tuple) -> int:
+        """
+        Aplica o modo de prune às linhas de `projects` que casam com `where`.
+
+        'archive' guarda o status anterior em status_before_prune (o writer o
+        restaura se o projeto for visto de novo). 'delete' nunca apaga projetos
+        com tarefas ou histórico de análise: esses são arquivados. O commit
+        fica com quem chama.
+
+        Args:
+            where: Filtro SQL sobre `projects`
+            params: Parâmetros do filtro
+
+        Returns:
+            Número de projetos removidos ou arquivados
+        """
+        if self.prune == 'none':
+            return 0
+
+        archive_sql = (
+            "UPDATE projects SET status_before_prune = status, status = 'archived', "
+            "updated_at = CURRENT_TIMESTAMP WHERE status != 'archived' AND "
+        )
+
+        if self.prune == 'archive':
+            archived = self.conn.execute(archive_sql + f"({where})", params).rowcount
+            if archived > 0:
+                self.log(f"Projetos não vistos arquivados: {archived}")
+            return archived
+
+        owns_data = (
+            "(EXISTS (SELECT 1 FROM project_tasks t WHERE t.project_id = projects.id) "
+            "OR EXISTS (SELECT 1 FROM analysis_history h WHERE h.project_id = projects.id))"
+        )
+        doomed = f"({where}) AND NOT {owns_data}"
+
+        # Quem fica (vistos ou protegidos) não pode sair na cascata do pai apagado
+        self.conn.execute(
+            f"UPDATE projects SET parent_project_id = NULL, is_subproject = 0 "
+            f"WHERE parent_project_id IN (SELECT id FROM projects WHERE {doomed}) "
+            f"AND NOT ({doomed})", params + params
+        )
+        archived = self.conn.execute(archive_sql + f"({where}) AND {owns_data}", params).rowcount
+
+        # project_docs e project_dependencies saem via ON DELETE CASCADE
+        deleted = self.conn.execute(f"DELETE FROM projects WHERE {doomed}", params).rowcount
+        if deleted > 0:
+            suffix = os.sep + 'package.json'
+            self.conn.execute(
+                "DELETE FROM manifest_cache WHERE NOT EXISTS (SELECT 1 FROM projects p "
+                "WHERE p.path = substr(manifest_cache.path, 1, length(manifest_cache.path) - ?))",
+                (len(suffix),)
+            )
+            self.log(f"Projetos não vistos removidos: {deleted}")
+        if archived > 0:
+            self.log(f"Projetos não vistos com tarefas/histórico arquivados: {archived}")
+        return deleted + archived
+
+    def _load_fingerprints(self, location_path: Path):
+        """Carrega fingerprints e profundidades conhecidas sob a localização."""
+        under_location, params = self._under_location(location_path)
+
+        self._fingerprints = {
+            row['path']: dict(row)
+            for row in self.conn.execute(
+                f"SELECT * FROM dir_fingerprints WHERE {under_location}", params
+            )
+        }
+        self._known_depths = {
+            row['path']: row['depth_level']
+            for row in self.conn.execute(
+                f"SELECT path, depth_level FROM projects WHERE {under_location}", params
+            )
+        }
+        self._new_fingerprints = []
+
+    def _save_fingerprints(self):
+        """Grava os fingerprints coletados até aqui (commit fica com o writer)."""
+        with self._stats_lock:
+            rows, self._new_fingerprints = self._new_fingerprints, []
+
+        if not rows:
+            return
+
+        self.conn.executemany("""
+            INSERT OR REPLACE INTO dir_fingerprints (
+                path, mtime_ns, inode, listing_hash, watched_files, subdirs,
+                project_path, updated_at
+            ) VALUES (?, ?, ?, ?, ?, ?, ?, CURRENT_TIMESTAMP)
+        """, rows)
+
+    def _stat_watched(self, path: Path, names) -> Dict[str, List[int]]:
+        """Stat (mtime_ns, size) das entradas relevantes presentes em `names`."""
+        present = set(names)
+        watched = {}
+
+        candidates = [name for name in self.FINGERPRINT_FILES if name in present]
+        for parent, nested in self.FINGERPRINT_NESTED_FILES.items():
+            if parent in present:
+                candidates += nested
+
+        self.profiler.add('walk', stats=len(candidates))
+        for name in candidates:
+            try:
+                st = os.stat(path / name)
+            except OSError:
+                continue
+            watched[name] = [st.st_mtime_ns, st.st_size]
+
+        return watched
+
+    def _visit_incremental(self, path: Path, depth: int, parent_path: str,
+                           st: os.stat_result) -> Tuple[Optional[Dict], List[Path], Set[str]]:
+        """
+        Visita um diretório reaproveitando o fingerprint quando nada mudou.
+
+        O mtime de um diretório só muda quando entradas diretas são criadas,
+        removidas ou renomeadas, então a descida continua mesmo para
+        diretórios inalterados; o que se evita é a listagem e a detecção
+        (git, documentação, package.json).
+
+        Returns:
+            Tupla (projeto, subdiretórios, nomes das entradas). Sem listagem,
+            os nomes são só os de FINGERPRINT_FILES presentes (bastam para
+            achar os manifests de workspace).
+        """
+        key = str(path)
+        cached = self._fingerprints.get(key)
+
+        # Caminho rápido: mesmo inode/mtime e arquivos relevantes intactos (medindo
+        # tamanhos, a listagem é necessária: arquivos mudam sem mexer no mtime do diretório)
+        if cached and cached['inode'] == st.st_ino and cached['mtime_ns'] == st.st_mtime_ns \
+                and not self._measuring:
+            watched = json.loads(cached['watched_files'] or '{}')
+            if self._stat_watched(path, watched) == watched:
+                reused = self._reuse_project(cached, path, depth, parent_path)
+                if reused is not False:
+                    self._count('dirs_skipped')
+                    subdirs = [path / name for name in json.loads(cached['subdirs'] or '[]')]
+                    return reused, subdirs, set(watched)
+
+        names, files, subdirs = self._list_directory(path)
+        watched = self._stat_watched(path, names)
+        listing_hash = hashlib.sha1('\0'.join(sorted(names)).encode('utf-8', 'surrogateescape')).hexdigest()
+
+        # mtime mudou mas a listagem e os arquivos relevantes são os mesmos
+        project_info = False
+        if cached and cached['inode'] == st.st_ino and cached['listing_hash'] == listing_hash \
+                and json.loads(cached['watched_files'] or '{}') == watched:
+            project_info = self._reuse_project(cached, path, depth, parent_path)
+
+        if project_info is False:
+            self._count('dirs_examined')
+            project_info = self._identify_project(path, depth, parent_path, (names, files), st)
+        else:
+            self._count('dirs_skipped')
+
+        fingerprint = (
+            key,
+            st.st_mtime_ns,
+            st.st_ino,
+            listing_hash,
+            json.dumps(watched),
+            json.dumps([subdir.name for subdir in subdirs]),
+            project_info['path'] if project_info else None,
+        )
+        with self._stats_lock:
+            self._new_fingerprints.append(fingerprint)
+
+        return project_info, subdirs, names
+
+    def _reuse_project(self, cached: Dict, path: Path, depth: int, parent_path: str = None):
+        """
+        Monta o projeto reaproveitado de um fingerprint.
+
+        Returns:
+            Dicionário marcado com 'unchanged', None (não é projeto) ou
+            False quando a linha indexada não serve (removida/profundidade mudou)
+        """
+        project_path = cached['project_path']
+        if project_path is None:
+            return None
+
+        if self._known_depths.get(project_path) != depth:
+            return False
+
+        return {
+            'name': path.name,
+            'path': project_path,
+            'depth_level': depth,
+            'parent_path': parent_path,
+            'is_subproject': parent_path is not None,
+            'unchanged': True,
+        }
 
     def _detect_project(self, path: Path, depth: int, parent_path: str = None) -> Optional[Dict]:
         """
@@ -243,64 +1554,127 @@ class ProjectScanner:
         Returns:
             Dicionário com informações do projeto ou None
         """
-        project_type = self._detect_type(path)
+        project_info = self._identify_project(path, depth, parent_path)
+
+        if project_info is None:
+            return None
+
+        return self._complete_project(project_info)
+
+    def _identify_project(self, path: Path, depth: int, parent_path: str = None,
+                          listing: Tuple[Set[str], Set[str]] = None,
+                          st: os.stat_result = None) -> Optional[Dict]:
+        """
+        Etapa barata da detecção (usada pelo walker): tipo e informações básicas.
+
+        Args:
+            listing: (nomes, arquivos) já listados pelo walker; lista o diretório se ausente
+            st: stat do diretório já feito pelo walker; feito aqui se ausente
+
+        Returns:
+            Dicionário parcial do projeto (com o diretório e a listagem em
+            '_dir'/'_names'/'_files') ou None
+        """
+        if listing is None:
+            names, files, _ = self._list_directory(path)
+        else:
+            names, files = listing
+
+        project_type = self._detect_type(names)
 
         if project_type is None:
             return None
 
+        if st is None:
+            try:
+                st = os.stat(path)
+            except OSError:
+                return None
+
         # Informações básicas
-        project_info = {
+        return {
             'name': path.name,
             'path': str(path.resolve()),
             'type': project_type,
             'depth_level': depth,
-            'parent_path': parent_path,  # Path do pai para resolução em 2 passes
-            'parent_project_id': None,   # Será preenchido no passe 2
+            'parent_path': parent_path,  # Path do pai para resolução na escrita
+            'parent_project_id': None,   # Preenchido pelo ProjectBatchWriter
             'is_subproject': parent_path is not None,
+            'dir_device': st.st_dev,  # Identidade do diretório (aliases e bind mounts)
+            'dir_inode': st.st_ino,
+            '_dir': path,
+            '_names': names,
+            '_files': files,
         }
 
+    def _complete_project(self, project_info: Dict) -> Dict:
+        """
+        Etapa cara da detecção: monorepo, git, documentação e package manager.
+
+        Projetos reaproveitados pelo scan incremental passam direto.
+        """
+        if project_info.get('unchanged'):
+            return project_info
+
+        path = project_info.pop('_dir')
+        names = project_info.pop('_names')
+        files = project_info.pop('_files')
+        project_type = project_info['type']
+
         # Detectar monorepo
-        monorepo_info = self._detect_monorepo(path)
+        monorepo_info = self._detect_monorepo(names)
         project_info.update(monorepo_info)
 
         # Git info
-        git_info = self._extract_git_info(path)
+        with self.profiler.phase('git'):
+            git_info = self._extract_git_info(path, names)
         project_info.update(git_info)
 
         # Documentação
-        docs = self._extract_documentation(path)
+        with self.profiler.phase('docs'):
+            docs = self._extract_documentation(path, names, files)
         project_info['documentation'] = docs
         project_info['has_readme'] = any(d['doc_type'] == 'README' for d in docs)
         project_info['has_claude_md'] = any(d['doc_type'] == 'CLAUDE.md' for d in docs)
         project_info['has_context_md'] = any(d['doc_type'] == 'CONTEXT.md' for d in docs)
 
         # Memory system
-        project_info['has_memory_system'] = (path / '.memory').exists()
+        project_info['has_memory_system'] = '.memory' in names
 
         # Package manager e framework
-        pm_fw = self._detect_package_manager_framework(path, project_type)
+        with self.profiler.phase('manifest'):
+            pm_fw = self._detect_package_manager_framework(path, project_type, names)
         project_info.update(pm_fw)
 
+        # Tamanho em disco: medido no walk e gravado no fim do scan (_save_disk_usage);
+        # aqui fica None e o UPDATE mantém o anterior
         return project_info
 
-    def _detect_type(self, path: Path) -> Optional[str]:
-        """Detecta o tipo de projeto baseado em arquivos."""
+    @staticmethod
+    def _has_marker(names: Set[str], marker: str) -> bool:
+        """Verifica um marcador literal ou por sufixo ('*.csproj')."""
+        if marker.startswith('*'):
+            suffix = marker[1:]
+            return any(name.endswith(suffix) for name in names)
+        return marker in names
+
+    def _detect_type(self, names: Set[str]) -> Optional[str]:
+        """Detecta o tipo de projeto baseado nos nomes listados no diretório."""
         for proj_type, markers in self.PROJECT_MARKERS.items():
             for marker in markers:
-                if (path / marker).exists():
+                if self._has_marker(names, marker):
                     return proj_type
 
         # Se tem .git mas nenhum marcador de código, é git-only
-        if (path / '.git').exists():
+        if '.git' in names:
             return 'git-only'
 
         return None
 
-    def _detect_monorepo(self, path: Path) -> Dict:
+    def _detect_monorepo(self, names: Set[str]) -> Dict:
         """Detecta se é monorepo e qual tipo."""
         for marker in self.MONOREPO_MARKERS:
-            marker_path = path / marker
-            if marker_path.exists():
+            if marker in names:
                 workspace_type = marker.replace('.json', '').replace('.yaml', '').replace('-workspace', '')
                 return {
                     'is_monorepo': True,
@@ -314,81 +1688,167 @@ class ProjectScanner:
             'workspace_type': None,
         }
 
-    def _extract_git_info(self, path: Path) -> Dict:
+    def _extract_git_info(self, path: Path, names: Set[str]) -> Dict:
         """Extrai informações do repositório git."""
-        git_dir = path / '.git'
-
-        if not git_dir.exists():
+        if '.git' not in names:
             return {
                 'has_git': False,
                 'git_remote': None,
+                'git_remote_canonical': None,
                 'git_branch': None,
                 'git_last_commit_date': None,
+                'git_head_commit': None,
+                'git_root_commits': None,
             }
 
+        # Leitura direta de .git; subprocessos só para layouts não suportados
+        counters = {} if self.profiler.enabled else None
+        native_info = read_git_info(path, counters, self._known_roots.get(str(path)))
+        if counters:
+            self.profiler.add('git', bytes_read=counters['bytes_read'])
+        if native_info is not None:
+            # História longa fora do commit-graph: raízes pelo `git`
+            if 'git_root_commits' not in native_info:
+                self.profiler.add('git', subprocesses=1)
+                native_info['git_root_commits'] = self._git_root_commits(path)
+            return {'has_git': True, **native_info}
+
+        self.profiler.add('git', subprocesses=3)
+
         try:
-            # Branch atual
+            # Branch atual ('HEAD' = detached) e se o clone é shallow
             result = subprocess.run(
-                ['git', '-C', str(path), 'branch', '--show-current'],
+                ['git', '-C', str(path), 'rev-parse', '--is-shallow-repository', '--abbrev-ref', 'HEAD'],
                 capture_output=True, text=True, timeout=5
             )
-            branch = result.stdout.strip() if result.returncode == 0 else None
+            lines = result.stdout.split()
+            shallow = bool(lines) and lines[0] == 'true'
+            branch = None
+            if result.returncode == 0 and len(lines) == 2:
+                branch = '' if lines[1] == 'HEAD' else lines[1]
 
-            # Remote URL
+            # Remote URL (também a base da URL canônica)
             result = subprocess.run(
                 ['git', '-C', str(path), 'remote', 'get-url', 'origin'],
                 capture_output=True, text=True, timeout=5
             )
             remote = result.stdout.strip() if result.returncode == 0 else None
 
-            # Último commit
+            # HEAD e data do último commit (falha em repositório sem commits)
             result = subprocess.run(
-                ['git', '-C', str(path), 'log', '-1', '--format=%ci'],
+                ['git', '-C', str(path), 'log', '-1', '--format=%H%x00%ci'],
                 capture_output=True, text=True, timeout=5
             )
-            last_commit = result.stdout.strip() if result.returncode == 0 else None
+            head, last_commit = None, None
+            if result.returncode == 0:
+                head, _, last_commit = result.stdout.strip().partition('\0')
+
+            roots = None
+            if head and not shallow:
+                self.profiler.add('git', subprocesses=1)
+                roots = self._git_root_commits(path)
 
             return {
                 'has_git': True,
                 'git_remote': remote,
+                'git_remote_canonical': canonical_remote(remote),
                 'git_branch': branch,
-                'git_last_commit_date': last_commit,
+                'git_last_commit_date': last_commit or None,
+                'git_head_commit': head or None,
+                'git_root_commits': roots,
             }
         except (subprocess.TimeoutExpired, Exception) as e:
             self.log(f"Erro ao extrair git info de {path}: {e}", "WARN")
             return {
                 'has_git': True,
                 'git_remote': None,
+                'git_remote_canonical': None,
                 'git_branch': None,
                 'git_last_commit_date': None,
+                'git_head_commit': None,
+                'git_root_commits': None,
             }
 
-    def _extract_documentation(self, path: Path) -> List[Dict]:
+    def _git_root_commits(self, path: Path) -> Optional[str]:
+        """Commits raiz alcançáveis de HEAD pelo `git rev-list` (SHAs ordenados, separados por vírgula)."""
+        try:
+            result = subprocess.run(
+                ['git', '-C', str(path), 'rev-list', '--max-parents=0', 'HEAD'],
+                capture_output=True, text=True, timeout=30
+            )
+        except (subprocess.TimeoutExpired, OSError) as e:
+            self.log(f"Erro ao ler commits raiz de {path}: {e}", "WARN")
+            return None
+        roots = sorted(result.stdout.split()) if result.returncode == 0 else []
+        return ','.join(roots) or None
+
+    def _extract_documentation(self, path: Path, names: Set[str], files: Set[str]) -> List[Dict]:
         """Identifica arquivos de documentação."""
         docs = []
 
         for doc_file, doc_type in self.DOC_FILES.items():
             doc_path = path / doc_file
-            if doc_path.exists() and doc_path.is_file():
+            if '/' in doc_file:
+                # Doc em subdiretório (.claude/CLAUDE.md): só checa se o diretório existe
+                present = doc_file.split('/', 1)[0] in names and doc_path.is_file()
+                self.profiler.add('docs', stats=1)
+            else:
+                present = doc_file in files
+            if present:
                 try:
-                    with open(doc_path, 'r', encoding='utf-8', errors='ignore') as f:
-                        line_count = sum(1 for _ in f)
-
-                    stat = doc_path.stat()
-                    last_modified = datetime.fromtimestamp(stat.st_mtime).isoformat()
+                    st = doc_path.stat()
+                    last_modified = datetime.fromtimestamp(st.st_mtime).isoformat()
+                    self.profiler.add('docs', stats=1)
+
+                    # Mesmo tamanho e mtime da linha indexada: reaproveita a contagem
+                    cached = self._doc_cache.get(str(doc_path))
+                    if cached and cached[0] == st.st_size and cached[1] == last_modified:
+                        line_count = cached[2]
+                    else:
+                        line_count = self._count_lines(doc_path)
+                        self.profiler.add('docs', bytes_read=st.st_size)
 
                     docs.append({
                         'doc_type': doc_type,
                         'file_path': str(doc_path),
                         'line_count': line_count,
                         'last_modified': last_modified,
+                        'file_size': st.st_size,
                     })
                 except Exception as e:
                     self.log(f"Erro ao ler {doc_path}: {e}", "WARN")
 
         return docs
 
-    def _detect_package_manager_framework(self, path: Path, project_type: str) -> Dict:
+    @classmethod
+    def _count_lines(cls, path: Path) -> int:
+        """
+        Conta linhas lendo bytes em blocos, sem decodificar o texto.
+
+        Segue a iteração em modo texto: \\n, \\r e \\r\\n terminam uma linha
+        e um trecho final sem terminador conta como linha.
+        """
+        breaks = 0
+        crlf = 0
+        last = b''
+        with open(path, 'rb') as f:
+            while True:
+                chunk = f.read(cls.DOC_READ_CHUNK)
+                if not chunk:
+                    break
+                breaks += chunk.count(b'\n') + chunk.count(b'\r')
+                crlf += chunk.count(b'\r\n')
+                if last == b'\r' and chunk[:1] == b'\n':
+                    crlf += 1  # \r\n dividido entre dois blocos
+                last = chunk[-1:]
+
+        lines = breaks - crlf
+        if last and last not in (b'\n', b'\r'):
+            lines += 1
+        return lines
+
+    def _detect_package_manager_framework(self, path: Path, project_type: str,
+                                          names: Set[str]) -> Dict:
         """Detecta package manager e framework."""
         result = {
             'package_manager': None,
@@ -397,43 +1857,31 @@ class ProjectScanner:
 
         if project_type == 'nodejs':
             # Package manager
-            if (path / 'pnpm-lock.yaml').exists():
+            if 'pnpm-lock.yaml' in names:
                 result['package_manager'] = 'pnpm'
-            elif (path / 'yarn.lock').exists():
+            elif 'yarn.lock' in names:
                 result['package_manager'] = 'yarn'
-            elif (path / 'package-lock.json').exists():
+            elif 'package-lock.json' in names:
                 result['package_manager'] = 'npm'
 
             # Framework (detectar via package.json)
-            package_json = path / 'package.json'
-            if package_json.exists():
-                try:
-                    with open(package_json, 'r', encoding='utf-8') as f:
-                        data = json.load(f)
-                        deps = {**data.get('dependencies', {}), **data.get('devDependencies', {})}
-
-                        if 'next' in deps:
-                            result['framework'] = 'nextjs'
-                        elif '@nestjs/core' in deps:
-                            result['framework'] = 'nestjs'
-                        elif 'express' in deps:
-                            result['framework'] = 'express'
-                        elif 'react' in deps and 'vite' in deps:
-                            result['framework'] = 'vite'
-                except:
-                    pass
+            if 'package.json' in names:
+                manifest = self._package_json_info(path / 'package.json')
+                result['framework'] = manifest['framework']
+                if result['package_manager'] is None:
+                    result['package_manager'] = manifest['package_manager']
 
         elif project_type == 'python':
-            if (path / 'Pipfile').exists():
+            if 'Pipfile' in names:
                 result['package_manager'] = 'pipenv'
-            elif (path / 'poetry.lock').exists():
+            elif 'poetry.lock' in names:
                 result['package_manager'] = 'poetry'
             else:
                 result['package_manager'] = 'pip'
 
         elif project_type == 'php':
             result['package_manager'] = 'composer'
-            if (path / 'artisan').exists():
+            if 'artisan' in names:
                 result['framework'] = 'laravel'
 
         elif project_type == 'rust':
@@ -444,121 +1892,142 @@ class ProjectScanner:
 
         return result
 
-    def _get_project_by_path(self, path: str) -> Optional[Dict]:
-        """Busca projeto pelo path."""
-        cursor = self.conn.execute(
-            "SELECT * FROM projects WHERE path = ?",
-            (path,)
-        )
-        row = cursor.fetchone()
-        return dict(row) if row else None
-
-    def _insert_project(self, project_info: Dict) -> int:
-        """Insere novo projeto no banco."""
-        cursor = self.conn.execute("""
-            INSERT INTO projects (
-                name, path, type, depth_level, parent_project_id, is_subproject,
-                is_monorepo, has_workspace_config, workspace_type,
-                has_git, git_remote, git_branch, git_last_commit_date,
-                has_readme, has_claude_md, has_context_md, has_memory_system,
-                package_manager, framework
-            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-        """, (
-            project_info['name'],
-            project_info['path'],
-            project_info['type'],
-            project_info['depth_level'],
-            project_info.get('parent_project_id'),
-            project_info['is_subproject'],
-            project_info['is_monorepo'],
-            project_info['has_workspace_config'],
-            project_info.get('workspace_type'),
-            project_info['has_git'],
-            project_info.get('git_remote'),
-            project_info.get('git_branch'),
-            project_info.get('git_last_commit_date'),
-            project_info['has_readme'],
-            project_info['has_claude_md'],
-            project_info['has_context_md'],
-            project_info['has_memory_system'],
-            project_info.get('package_manager'),
-            project_info.get('framework'),
-        ))
+    def _package_json_info(self, package_json: Path) -> Dict:
+        """
+        Framework, package manager e dependências de um package.json.
 
-        project_id = cursor.lastrowid
-
-        # Inserir documentação
-        for doc in project_info.get('documentation', []):
-            self.conn.execute("""
-                INSERT INTO project_docs (project_id, doc_type, file_path, line_count, last_modified)
-                VALUES (?, ?, ?, ?, ?)
-            """, (
-                project_id,
-                doc['doc_type'],
-                doc['file_path'],
-                doc['line_count'],
-                doc['last_modified'],
+        Usa o cache persistente enquanto inode, mtime e tamanho do arquivo
+        não mudarem; só os manifests novos ou alterados são lidos e parseados.
+        """
+        try:
+            st = package_json.stat()
+        except OSError as e:
+            self.log(f"Erro ao ler {package_json}: {e}", "WARN")
+            return {'framework': None, 'package_manager': None, 'dependencies': []}
+        self.profiler.add('manifest', stats=1)
+
+        key = (st.st_ino, st.st_mtime_ns, st.st_size)
+        cached = self._manifest_cache.get(str(package_json))
+        if cached and cached[0] == key:
+            self._count('manifest_cache_hits')
+            return cached[1]
+
+        self._count('manifest_cache_misses')
+        info, error = self._parse_package_json(package_json)
+        if info is None:
+            # Falha de leitura (não de conteúdo): não vai para o cache
+            return {'framework': None, 'package_manager': None, 'dependencies': []}
+
+        with self._stats_lock:
+            self._new_manifests.append((
+                str(package_json), *key, info['framework'], info['package_manager'],
+                json.dumps(info['dependencies']), error,
             ))
+        return info
 
-        self.conn.commit()
-        return project_id
+    def _parse_package_json(self, package_json: Path) -> Tuple[Optional[Dict], Optional[str]]:
+        """
+        Lê e interpreta um package.json.
 
-    def _update_project(self, project_id: int, project_info: Dict):
-        """Atualiza projeto existente."""
-        self.conn.execute("""
-            UPDATE projects SET
-                name = ?, type = ?, depth_level = ?, parent_project_id = ?,
-                is_subproject = ?, is_monorepo = ?, has_workspace_config = ?,
-                workspace_type = ?, has_git = ?, git_remote = ?, git_branch = ?,
-                git_last_commit_date = ?, has_readme = ?, has_claude_md = ?,
-                has_context_md = ?, has_memory_system = ?, package_manager = ?,
-                framework = ?, updated_at = CURRENT_TIMESTAMP
-            WHERE id = ?
-        """, (
-            project_info['name'],
-            project_info['type'],
-            project_info['depth_level'],
-            project_info.get('parent_project_id'),
-            project_info['is_subproject'],
-            project_info['is_monorepo'],
-            project_info['has_workspace_config'],
-            project_info.get('workspace_type'),
-            project_info['has_git'],
-            project_info.get('git_remote'),
-            project_info.get('git_branch'),
-            project_info.get('git_last_commit_date'),
-            project_info['has_readme'],
-            project_info['has_claude_md'],
-            project_info['has_context_md'],
-            project_info['has_memory_system'],
-            project_info.get('package_manager'),
-            project_info.get('framework'),
-            project_id,
-        ))
+        Returns:
+            (info, erro). Manifest inválido devolve info vazia e a mensagem
+            de erro; falha de leitura devolve (None, mensagem).
+        """
+        empty = {'framework': None, 'package_manager': None, 'dependencies': []}
 
-        # Atualizar documentação (deletar e reinserir)
-        self.conn.execute("DELETE FROM project_docs WHERE project_id = ?", (project_id,))
-        for doc in project_info.get('documentation', []):
-            self.conn.execute("""
-                INSERT INTO project_docs (project_id, doc_type, file_path, line_count, last_modified)
-                VALUES (?, ?, ?, ?, ?)
-            """, (
-                project_id,
-                doc['doc_type'],
-                doc['file_path'],
-                doc['line_count'],
-                doc['last_modified'],
-            ))
+        try:
+            with open(package_json, 'r', encoding='utf-8') as f:
+                content = f.read()
+        except UnicodeDecodeError as e:
+            self.log(f"package.json inválido em {package_json}: {e}", "WARN")
+            return empty, str(e)
+        except OSError as e:
+            self.log(f"Erro ao ler {package_json}: {e}", "WARN")
+            return None, str(e)
+        self.profiler.add('manifest', bytes_read=len(content))
 
-        self.conn.commit()
+        try:
+            data = json.loads(content)
+        except json.JSONDecodeError as e:
+            self.log(f"package.json inválido em {package_json}: {e}", "WARN")
+            return empty, str(e)
+        if not isinstance(data, dict):
+            self.log(f"package.json inválido em {package_json}: raiz não é um objeto", "WARN")
+            return empty, 'raiz não é um objeto'
+
+        deps = {}
+        for section in ('dependencies', 'devDependencies'):
+            if isinstance(data.get(section), dict):
+                deps.update(data[section])
+
+        framework = None
+        if 'next' in deps:
+            framework = 'nextjs'
+        elif '@nestjs/core' in deps:
+            framework = 'nestjs'
+        elif 'express' in deps:
+            framework = 'express'
+        elif 'react' in deps and 'vite' in deps:
+            framework = 'vite'
+
+        # Corepack: "packageManager": "pnpm@8.15.0"
+        package_manager = data.get('packageManager')
+        if isinstance(package_manager, str) and package_manager:
+            package_manager = package_manager.split('@', 1)[0] or None
+        else:
+            package_manager = None
+
+        return {
+            'framework': framework,
+            'package_manager': package_manager,
+            'dependencies': sorted(deps),
+        }, None
+
+    @classmethod
+    def _project_row(cls, project_info: Dict) -> Tuple:
+        """Valores de PROJECT_COLUMNS para um projeto."""
+        return tuple(project_info.get(column) for column in cls.PROJECT_COLUMNS)
+
+    @classmethod
+    def _insert_sql(cls) -> str:
+        placeholders = ', '.join('?' for _ in cls.PROJECT_COLUMNS)
+        return f"INSERT INTO projects ({', '.join(cls.PROJECT_COLUMNS)}) VALUES ({placeholders})"
+
+    @classmethod
+    def _update_sql(cls) -> str:
+        assignments = ', '.join(
+            f"{column} = COALESCE(?, {column})" if column in cls.KEEP_IF_NULL_COLUMNS else f"{column} = ?"
+            for column in cls.PROJECT_COLUMNS if column != 'path'
+        )
+        return f"UPDATE projects SET {assignments}, updated_at = CURRENT_TIMESTAMP WHERE id = ?"
+
+    @classmethod
+    def _update_row(cls, project_id: int, project_info: Dict) -> Tuple:
+        """Valores do UPDATE (todas as colunas exceto path, seguidas do id)."""
+        values = tuple(project_info.get(column) for column in cls.PROJECT_COLUMNS if column != 'path')
+        return values + (project_id,)
+
+    @staticmethod
+    def _doc_rows(project_id: int, project_info: Dict) -> List[Tuple]:
+        """Linhas de project_docs de um projeto."""
+        return [
+            (project_id, doc['doc_type'], doc['file_path'], doc['line_count'],
+             doc['last_modified'], doc.get('file_size'))
+            for doc in project_info.get('documentation', [])
+        ]
+
+    DOC_INSERT_SQL = """
+        INSERT INTO project_docs (project_id, doc_type, file_path, line_count, last_modified, file_size)
+        VALUES (?, ?, ?, ?, ?, ?)
+    """
 
     def _save_scan_history(self, stats: Dict):
-        """Salva histórico de scan."""
-        self.conn.execute("""
+        """Salva histórico de scan (e as métricas por fase, com --profile)."""
+        cursor = self.conn.execute("""
             INSERT INTO scan_history (
                 location, projects_found, projects_updated, projects_added,
-                max_depth_found, scan_duration_seconds
-            ) VALUES (?, ?, ?, ?, ?, ?)
+                max_depth_found, scan_duration_seconds, scan_generation, projects_removed
+            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?)
         """, (
             stats['location'],
             stats['projects_found'],
@@ -566,44 +2035,165 @@ class ProjectScanner:
             stats['projects_added'],
             stats['max_depth_found'],
             stats['scan_duration_seconds'],
+            stats.get('scan_generation'),
+            stats.get('projects_removed', 0),
         ))
+
+        if 'profile' in stats:
+            self.conn.executemany("""
+                INSERT INTO scan_phase_metrics (
+                    scan_id, phase, seconds, calls, dirs, stats,
+                    subprocesses, bytes_read, rows_written
+                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """, [
+                (cursor.lastrowid, phase) + tuple(metrics[key] for key in ScanProfiler.FIELDS)
+                for phase, metrics in stats['profile'].items()
+            ])
         self.conn.commit()
 
     def update_project(self, path: str) -> bool:
         """Atualiza informações de um projeto específico."""
-        path_obj = Path(path).resolve()
+        self.log(f"Atualizando projeto: {path}")
+        _, result = self.update_projects([path])[0]
 
-        if not path_obj.exists():
+        if result == self.UPDATE_NOT_FOUND:
             self.log(f"Projeto não existe: {path}", "ERROR")
             return False
+        if result == self.UPDATE_NOT_PROJECT:
+            self.log(f"Não é um projeto válido: {path}", "ERROR")
+            return False
+        return True
 
-        self.log(f"Atualizando projeto: {path}")
+    def update_projects(self, paths: List[str]) -> List[Tuple[str, str]]:
+        """
+        Atualiza vários projetos: detecção em paralelo, gravação em uma transação.
 
-        # Detectar projeto
-        project_info = self._detect_project(path_obj, depth=0)
+        Projetos já indexados mantêm profundidade e projeto pai; os novos
+        entram como raiz (profundidade 0).
 
-        if not project_info:
-            self.log(f"Não é um projeto válido: {path}", "ERROR")
-            return False
+        Args:
+            paths: Paths dos projetos (repetidos são atualizados uma vez)
 
-        # Verificar se existe
-        existing = self._get_project_by_path(str(path_obj))
+        Returns:
+            Lista de (path, resultado) na ordem de entrada, com resultado
+            em UPDATE_ADDED, UPDATE_UPDATED, UPDATE_NOT_FOUND ou UPDATE_NOT_PROJECT
+        """
+        resolved = []
+        seen = set()
+        for path in paths:
+            path_obj = Path(path).resolve()
+            if path_obj not in seen:
+                seen.add(path_obj)
+                resolved.append(path_obj)
+
+        known = self._known_hierarchy([str(p) for p in resolved])
+        self._walk_stats = {'manifest_cache_hits': 0, 'manifest_cache_misses': 0}
+        self._load_path_caches([str(p) for p in resolved])
+
+        def detect(path_obj: Path):
+            if not path_obj.exists():
+                return None
+            depth, parent_path = known.get(str(path_obj), (0, None))
+            return self._detect_project(path_obj, depth, parent_path)
+
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            detected = list(executor.map(detect, resolved))
+
+        writer = ProjectBatchWriter(self.conn, batch_size=0, log=self.log)
+        writer.before_commit.append(self._save_manifest_cache)
+        results = []
+        for path_obj, project_info in zip(resolved, detected):
+            if project_info is None and not path_obj.exists():
+                results.append((str(path_obj), self.UPDATE_NOT_FOUND))
+            elif project_info is None:
+                results.append((str(path_obj), self.UPDATE_NOT_PROJECT))
+            else:
+                exists = project_info['path'] in writer.path_to_id
+                results.append((str(path_obj), self.UPDATE_UPDATED if exists else self.UPDATE_ADDED))
+                writer.add(project_info)
+        writer.close()
+        self._doc_cache = {}
+        self._manifest_cache = {}
+        self._known_roots = {}
+
+        return results
+
+    def _known_hierarchy(self, paths: List[str]) -> Dict[str, Tuple[int, Optional[str]]]:
+        """Profundidade e path do pai dos projetos já indexados entre `paths`."""
+        known = {}
+        for i in range(0, len(paths), ProjectBatchWriter.MAX_SQL_VARIABLES):
+            chunk = paths[i:i + ProjectBatchWriter.MAX_SQL_VARIABLES]
+            placeholders = ','.join('?' for _ in chunk)
+            cursor = self.conn.execute(f"""
+                SELECT p.path, p.depth_level, parent.path AS parent_path
+                FROM projects p LEFT JOIN projects parent ON parent.id = p.parent_project_id
+                WHERE p.path IN ({placeholders})
+            """, chunk)
+            for row in cursor:
+                known[row['path']] = (row['depth_level'] or 0, row['parent_path'])
+        return known
+
+    def load_roots(self, config_path: str = None) -> List[Dict]:
+        """
+        Raízes do full-scan, cada uma com profundidade, ignorados e workers.
 
-        if existing:
-            self._update_project(existing['id'], project_info)
-            self.log(f"Projeto atualizado: {project_info['name']}")
-        else:
-            self._insert_project(project_info)
-            self.log(f"Projeto adicionado: {project_info['name']}")
+        Lê `config_path` (padrão: ROOTS_CONFIG). Sem arquivo de configuração,
+        usa DEFAULT_LOCATIONS. Campos ausentes herdam max_depth e workers do
+        scanner.
 
-        return True
+        Returns:
+            Lista de {'path', 'max_depth', 'ignore', 'workers'}
 
-    def full_scan(self) -> Dict:
-        """Escaneia todas as localizações configuradas."""
-        locations = [
-            '/Users/victorvilanova/projetos/',
-            '/Users/victorvilanova/Downloads/',
-        ]
+        Raises:
+            ValueError: Configuração inválida
+        """
+        path = Path(config_path) if config_path else self.ROOTS_CONFIG
+        if config_path is None and not path.exists():
+            return [{'path': location, 'max_depth': self.max_depth, 'ignore': [],
+                     'workers': self.workers} for location in self.DEFAULT_LOCATIONS]
+
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                config = json.load(f)
+        except (OSError, json.JSONDecodeError) as e:
+            raise ValueError(f"Configuração de raízes ilegível ({path}): {e}")
+
+        entries = config.get('roots') if isinstance(config, dict) else None
+        if not isinstance(entries, list):
+            raise ValueError(f"{path}: esperado um objeto com a lista 'roots'")
+
+        roots = []
+        for entry in entries:
+            if isinstance(entry, str):
+                entry = {'path': entry}
+            if not isinstance(entry, dict) or not entry.get('path'):
+                raise ValueError(f"{path}: raiz sem 'path': {entry!r}")
+            roots.append({
+                'path': os.path.expanduser(entry['path']),
+                'max_depth': int(entry.get('max_depth', self.max_depth)),
+                'ignore': list(entry.get('ignore', [])),
+                'workers': max(1, int(entry.get('workers', self.workers))),
+            })
+        return roots
+
+    def full_scan(self, roots: List[Dict] = None) -> Dict:
+        """
+        Escaneia todas as raízes configuradas.
+
+        Raízes em dispositivos diferentes (st_dev) rodam em paralelo; as do
+        mesmo dispositivo, em sequência, para um disco lento não disputar
+        cabeça de leitura consigo mesmo. Cada raiz usa um scanner próprio
+        (conexão, profundidade, ignorados e workers da raiz).
+
+        Args:
+            roots: Raízes no formato de load_roots (padrão: load_roots())
+
+        Returns:
+            Estatísticas agregadas, com tempo e contagens por raiz em 'roots'
+        """
+        start_time = time.time()
+        if roots is None:
+            roots = self.load_roots()
 
         total_stats = {
             'locations_scanned': 0,
@@ -612,34 +2202,885 @@ class ProjectScanner:
             'total_projects_updated': 0,
             'max_depth_overall': 0,
             'total_duration': 0,
+            'total_rows_written': 0,
+            'total_projects_removed': 0,
+            'total_manifest_cache_hits': 0,
+            'total_manifest_cache_misses': 0,
+            'total_workspace_roots': 0,
+            'total_workspace_members': 0,
+            'total_dirs_pruned': 0,
+            'devices': 0,
+            'roots': [],
         }
 
-        for location in locations:
-            if not Path(location).exists():
-                self.log(f"Localização não existe: {location}", "WARN")
+        if self.incremental:
+            total_stats['total_dirs_skipped'] = 0
+            total_stats['total_dirs_examined'] = 0
+
+        # Agrupar por dispositivo, mantendo a ordem da configuração
+        devices = {}
+        for root in roots:
+            try:
+                device = os.stat(root['path']).st_dev
+            except OSError:
+                self.log(f"Localização não existe: {root['path']}", "WARN")
                 continue
+            devices.setdefault(device, []).append(root)
+        total_stats['devices'] = len(devices)
+
+        # Checkpoint inicial de cada raiz: uma interrupção deixa também as
+        # raízes ainda não iniciadas para o resume
+        if self.checkpoint_interval:
+            for group in devices.values():
+                for root in group:
+                    self._save_root_checkpoint(root)
+            self.conn.commit()
 
-            stats = self.scan_location(location)
+        results = {}
+        with ThreadPoolExecutor(max_workers=max(1, len(devices))) as executor:
+            futures = [executor.submit(self._scan_device_roots, device, group)
+                       for device, group in devices.items()]
+            try:
+                for future in futures:
+                    results.update(future.result())
+            except KeyboardInterrupt:
+                # Só a thread principal recebe o Ctrl-C: as raízes param no próximo projeto
+                self._cancel.set()
+                raise
+
+        for root in roots:
+            stats = results.get(root['path'])
+            if stats is None or 'error' in stats:
+                continue
 
-            if 'error' not in stats:
-                total_stats['locations_scanned'] += 1
-                total_stats['total_projects_found'] += stats['projects_found']
-                total_stats['total_projects_added'] += stats['projects_added']
-                total_stats['total_projects_updated'] += stats['projects_updated']
-                total_stats['max_depth_overall'] = max(
-                    total_stats['max_depth_overall'],
-                    stats['max_depth_found']
+            total_stats['locations_scanned'] += 1
+            total_stats['total_projects_found'] += stats['projects_found']
+            total_stats['total_projects_added'] += stats['projects_added']
+            total_stats['total_projects_updated'] += stats['projects_updated']
+            total_stats['max_depth_overall'] = max(
+                total_stats['max_depth_overall'],
+                stats['max_depth_found']
+            )
+            total_stats['total_rows_written'] += stats['rows_written']
+            total_stats['total_projects_removed'] += stats['projects_removed']
+            total_stats['total_manifest_cache_hits'] += stats['manifest_cache_hits']
+            total_stats['total_manifest_cache_misses'] += stats['manifest_cache_misses']
+            total_stats['total_workspace_roots'] += stats['workspace_roots']
+            total_stats['total_workspace_members'] += stats['workspace_members']
+            total_stats['total_dirs_pruned'] += stats['dirs_pruned']
+            total_stats['roots'].append({
+                'location': stats['location'],
+                'device': stats['device'],
+                'projects_found': stats['projects_found'],
+                'scan_duration_seconds': stats['scan_duration_seconds'],
+            })
+
+            if self.incremental:
+                total_stats['total_dirs_skipped'] += stats['dirs_skipped']
+                total_stats['total_dirs_examined'] += stats['dirs_examined']
+
+            if 'profile' in stats:
+                total_stats['profile'] = ScanProfiler.merge(
+                    total_stats.get('profile'), stats['profile']
                 )
-                total_stats['total_duration'] += stats['scan_duration_seconds']
 
+        # Duração de parede: com raízes em paralelo é menor que a soma por raiz
+        total_stats['total_duration'] = time.time() - start_time
         return total_stats
 
+    def _save_root_checkpoint(self, root: Dict):
+        """Checkpoint de uma raiz ainda não iniciada (fronteira = a própria raiz)."""
+        location_path = Path(root['path']).resolve()
+        scanner_options = self._checkpoint_options()
+        scanner_options.update(max_depth=root['max_depth'], workers=root['workers'],
+                               ignore=sorted(set(root['ignore']) - self.IGNORE_DIRS))
+        self.conn.execute("""
+            INSERT OR REPLACE INTO scan_checkpoints (location, scan_generation, frontier, options)
+            VALUES (?, NULL, ?, ?)
+        """, (
+            str(location_path),
+            json.dumps({'pending': [(str(location_path), 0, None, False, self.VISIT_TREE)],
+                        'deferred': []}),
+            json.dumps(scanner_options),
+        ))
+
+    def _scan_device_roots(self, device: int, roots: List[Dict]) -> Dict[str, Dict]:
+        """
+        Escaneia em sequência as raízes de um mesmo dispositivo.
+
+        Roda em thread própria: cada raiz ganha um ProjectScanner com conexão
+        própria (conexões sqlite3 não são compartilhadas entre threads).
+
+        Returns:
+            {path da raiz: estatísticas do scan}
+        """
+        results = {}
+        for root in roots:
+            if self._cancel.is_set():
+                break
+            scanner = ProjectScanner(
+                db_path=self.db_path, max_depth=root['max_depth'], verbose=self.verbose,
+                workers=root['workers'], incremental=self.incremental,
+                batch_size=self.batch_size, prune=self.prune, profile=self.profile,
+                ignore=root['ignore'], checkpoint_interval=self.checkpoint_interval,
+                workspace_members=self.workspace_members, gitignore=self.gitignore, disk_usage=self.disk_usage,
+            )
+            scanner._cancel = self._cancel
+            try:
+                stats = scanner.scan_location(root['path'])
+            finally:
+                scanner.close()
+            stats['device'] = device
+            results[root['path']] = stats
+        return results
+
+    # ------------------------------------------------------------------
+    # Atualização por atividade git recente (update-recent)
+    # ------------------------------------------------------------------
+
+    def update_recent(self, days: int = 7, locations: List[str] = None) -> Dict:
+        """
+        Atualiza só os repositórios com atividade git nos últimos `days` dias.
+
+        A atividade vem do mtime de HEAD, reflog e refs locais, sem chamar
+        `git`. O walk faz só a identificação barata; apenas os repositórios
+        ativos passam pela detecção completa. Tudo é gravado em uma
+        transação e a prioridade é recalculada só para os projetos raiz
+        afetados.
+
+        Args:
+            days: Janela de atividade em dias
+            locations: Localizações a percorrer (padrão: raízes do full-scan)
+
+        Returns:
+            Dicionário com estatísticas da atualização
+        """
+        start_time = time.time()
+        cutoff = start_time - days * 86400
+
+        stats = {
+            'repos_checked': 0,
+            'repos_recent': 0,
+            'projects_added': 0,
+            'projects_updated': 0,
+            'priorities_updated': 0,
+            'updated': [],
+        }
+
+        writer = ProjectBatchWriter(self.conn, batch_size=0, log=self.log)
+        writer.before_commit.append(self._save_manifest_cache)
+        self._walk_stats = {'manifest_cache_hits': 0, 'manifest_cache_misses': 0}
+        changed_paths = []
+
+        for location in locations or [root['path'] for root in self.load_roots()]:
+            location_path = Path(location).resolve()
+            if not location_path.exists():
+                self.log(f"Localização não existe: {location}", "WARN")
+                continue
+
+            self._load_doc_cache(location_path)
+            self._load_manifest_cache(location_path)
+            for candidate in self._walk(location_path):
+                # Sem checkpoints aqui: o projeto sai da fronteira assim que chega
+                with self._stats_lock:
+                    self._inflight.pop(candidate['path'], None)
+                if '.git' not in candidate.get('_names', ()):
+                    continue
+
+                stats['repos_checked'] += 1
+                if not self._git_active_since(candidate['_dir'] / '.git', cutoff):
+                    continue
+
+                stats['repos_recent'] += 1
+                project_info = self._complete_project(candidate)
+                self.log(f"Atividade recente: {project_info['name']}")
+                writer.add(project_info)
+                changed_paths.append(project_info['path'])
+                stats['updated'].append(project_info['path'])
+
+        writer.close()
+        self._doc_cache = {}
+        self._manifest_cache = {}
+        stats['projects_added'] = writer.added
+        stats['projects_updated'] = writer.updated
+        stats.update(self._manifest_cache_stats())
+
+        if changed_paths:
+            stats['priorities_updated'] = self._update_priorities(
+                [writer.path_to_id[path] for path in changed_paths]
+            )
+
+        stats['duration_seconds'] = time.time() - start_time
+        return stats
+
+    def _git_active_since(self, git_path: Path, cutoff: float) -> bool:
+        """True se HEAD, o reflog ou alguma branch local mudou depois de `cutoff` (epoch)."""
+        if git_path.is_file():
+            # Worktree/submódulo: `.git` é um arquivo apontando para o gitdir real
+            try:
+                content = git_path.read_text(encoding='utf-8', errors='ignore').strip()
+            except OSError:
+                return False
+            if not content.startswith('gitdir:'):
+                return False
+            git_path = git_path.parent / content[len('gitdir:'):].strip()
+
+        for name in self.GIT_ACTIVITY_FILES:
+            try:
+                if os.stat(git_path / name).st_mtime >= cutoff:
+                    return True
+            except OSError:
+                continue
+
+        for name in self.GIT_ACTIVITY_DIRS:
+            stack = [git_path / name]
+            while stack:
+                try:
+                    with os.scandir(stack.pop()) as entries:
+                        for entry in entries:
+                            if entry.is_dir(follow_symlinks=False):
+                                stack.append(entry.path)
+                            elif entry.stat().st_mtime >= cutoff:
+                                return True
+                except OSError:
+                    continue
+
+        return False
+
+    def _update_priorities(self, project_ids: List[int]) -> int:
+        """
+        Recalcula a prioridade dos projetos raiz ligados aos ids alterados.
+
+        A prioridade só existe para projetos raiz e depende dos subprojetos,
+        então um subprojeto alterado recalcula o seu projeto raiz.
+        """
+        root_names = set()
+        for i in range(0, len(project_ids), ProjectBatchWriter.MAX_SQL_VARIABLES):
+            chunk = project_ids[i:i + ProjectBatchWriter.MAX_SQL_VARIABLES]
+            placeholders = ','.join('?' for _ in chunk)
+            cursor = self.conn.execute(f"""
+                WITH RECURSIVE ancestors(id, parent_project_id, name) AS (
+                    SELECT id, parent_project_id, name FROM projects WHERE id IN ({placeholders})
+                    UNION
+                    SELECT p.id, p.parent_project_id, p.name
+                    FROM projects p JOIN ancestors a ON p.id = a.parent_project_id
+                )
+                SELECT DISTINCT name FROM ancestors WHERE parent_project_id IS NULL
+            """, chunk)
+            root_names.update(row['name'] for row in cursor)
+
+        if not root_names:
+            return 0
+
+        sys.path.insert(0, str(Path(__file__).parent.parent / 'analysis'))
+        from priority import PriorityAnalyzer
+
+        analyzer = PriorityAnalyzer(db_path=str(self.db_path))
+        try:
+            return analyzer.update_priorities(sorted(root_names))
+        finally:
+            analyzer.close()
+
+    # ------------------------------------------------------------------
+    # Modo watch (inotify)
+    # ------------------------------------------------------------------
+
+    def watch(self, locations: List[str] = None, debounce: float = 0.5):
+        """
+        Mantém o índice atualizado observando as localizações com inotify.
+
+        Rajadas de eventos são agrupadas (janela `debounce`) e só os
+        diretórios cujos marcadores, docs ou .git/HEAD/refs mudaram passam
+        de novo por _detect_project; as mudanças são gravadas pelo
+        ProjectBatchWriter em uma transação por rajada. Diretórios
+        renomeados dentro das raízes mudam de path (mantendo tarefas e
+        histórico); removidos, ou que deixaram de ser projeto, passam pelo
+        modo de prune.
+
+        Args:
+            locations: Raízes a observar (padrão: raízes do full-scan)
+            debounce: Segundos sem eventos que encerram uma rajada
+        """
+        roots = []
+        for location in locations or [root['path'] for root in self.load_roots()]:
+            root = Path(location).resolve()
+            if root.is_dir():
+                roots.append(root)
+            else:
+                self.log(f"Localização não existe: {location}", "WARN")
+
+        watcher = inotify.InotifyWatcher()
+        writer = ProjectBatchWriter(self.conn, batch_size=0, log=self.log)
+        writer.before_commit.append(self._save_manifest_cache)
+
+        try:
+            for root in roots:
+                self._add_watches(watcher, root, 0)
+            if watcher.limit_reached:
+                self.log("Limite de inotify atingido (fs.inotify.max_user_watches); "
+                         "parte da árvore não será observada", "ERROR")
+
+            print(f"Observando {len(watcher.paths)} diretórios em {len(roots)} localizações "
+                  f"(Ctrl-C para sair)")
+
+            while True:
+                changed, removed, moves, overflow = self._read_watch_burst(watcher, roots, debounce)
+
+                if overflow:
+                    # Eventos perdidos: reconciliar com um scan incremental das raízes
+                    self.log("Fila do inotify estourou; executando scan incremental", "WARN")
+                    incremental, self.incremental = self.incremental, True
+                    try:
+                        for root in roots:
+                            self.scan_location(str(root))
+                    finally:
+                        self.incremental = incremental
+                    # O scan inseriu e removeu linhas por fora do writer
+                    writer.reload_ids()
+                    continue
+
+                if changed or removed or moves:
+                    self._apply_watch_changes(changed, roots, writer, removed, moves)
+        except KeyboardInterrupt:
+            print("\nWatch encerrado.")
+        finally:
+            watcher.close()
+
+    def _read_watch_burst(self, watcher, roots: List[Path], debounce: float,
+                          timeout: Optional[float] = None) -> Tuple[Set[str], Set[str],
+                                                                    List[Tuple[str, str]], bool]:
+        """
+        Lê uma rajada de eventos, até `debounce` segundos sem novos eventos.
+
+        Args:
+            timeout: Espera pelo primeiro evento (None = indefinidamente)
+
+        Returns:
+            Tupla (diretórios a re-detectar, diretórios removidos, renomeações
+            (path antigo, path novo), se a fila do kernel estourou)
+        """
+        events = watcher.read_events(timeout=timeout)
+        changed = set()
+        removed = set()
+        moves = []
+        moved_from = {}
+        overflow = False
+
+        while events:
+            for directory, name, mask, cookie in events:
+                if mask & inotify.IN_Q_OVERFLOW:
+                    overflow = True
+                    continue
+                self._track_watch_removal(directory, name, mask, cookie,
+                                          removed, moves, moved_from)
+                changed.update(self._classify_watch_event(watcher, roots, directory, name, mask))
+            events = watcher.read_events(timeout=debounce)
+
+        # IN_MOVED_FROM sem IN_MOVED_TO: saiu da árvore observada
+        removed.update(moved_from.values())
+        return changed, removed, moves, overflow
+
+    def _add_watches(self, watcher, path: Path, depth: int):
+        """Registra watches para a subárvore (respeitando ignore_dirs e max_depth)."""
+        stack = [(path, depth)]
+
+        while stack:
+            current, current_depth = stack.pop()
+            if watcher.add_watch(str(current)) is None:
+                continue
+
+            names, _, subdirs = self._list_directory(current)
+            if '.git' in names:
+                self._add_git_watches(watcher, current / '.git')
+
+            if current_depth + 1 <= self.max_depth:
+                stack.extend((subdir, current_depth + 1) for subdir in subdirs)
+
+    def _add_git_watches(self, watcher, git_dir: Path):
+        """Observa .git (HEAD, packed-refs, config) e refs/heads (commits/branches)."""
+        if not git_dir.is_dir():
+            return
+
+        watcher.add_watch(str(git_dir))
+        for dirpath, _, _ in os.walk(git_dir / 'refs' / 'heads'):
+            watcher.add_watch(dirpath)
+
+    def _classify_watch_event(self, watcher, roots: List[Path], directory: str,
+                              name: str, mask: int) -> Set[str]:
+        """
+        Traduz um evento inotify nos diretórios que precisam de nova detecção.
+
+        Returns:
+            Conjunto de diretórios candidatos a re-detecção
+        """
+        parts = Path(directory).parts
+
+        # Eventos dentro de .git: só HEAD/packed-refs/config e refs/heads importam
+        if '.git' in parts:
+            index = len(parts) - 1 - parts[::-1].index('.git')
+            inside = parts[index + 1:]
+            project_dir = str(Path(*parts[:index]))
+
+            if mask & inotify.IN_ISDIR and mask & (inotify.IN_CREATE | inotify.IN_MOVED_TO):
+                watcher.add_watch(str(Path(directory) / name))
+            if (not inside and name in self.WATCH_GIT_FILES) or inside[:2] == ('refs', 'heads'):
+                return {project_dir}
+            return set()
+
+        path = Path(directory) / name
+
+        if mask & inotify.IN_ISDIR and mask & (inotify.IN_CREATE | inotify.IN_MOVED_TO):
+            if name == '.git':
+                self._add_git_watches(watcher, path)
+                return {directory}
+            if name in self.ignore_dirs:
+                return set()
+
+            # Diretório novo (clone, unzip, mv): observar e verificar a subárvore inteira
+            root = next((r for r in roots if path == r or r in path.parents), None)
+            if root is None:
+                return set()
+            depth = len(path.relative_to(root).parts)
+            if depth > self.max_depth:
+                return set()
+            self._add_watches(watcher, path, depth)
+
+            changed = set()
+            for dirpath, dirnames, _ in os.walk(path):
+                dirnames[:] = [d for d in dirnames if d not in self.ignore_dirs]
+                changed.add(dirpath)
+            return changed
+
+        # Marcadores (inclusive por sufixo), docs, lockfiles, .memory...
+        if name in self.FINGERPRINT_FILES or self._detect_type({name}):
+            return {directory}
+
+        if Path(directory).name == '.claude' and name == 'CLAUDE.md':
+            return {str(Path(directory).parent)}
+
+        return set()
+
+    def _track_watch_removal(self, directory: str, name: str, mask: int, cookie: int,
+                             removed: Set[str], moves: List[Tuple[str, str]],
+                             moved_from: Dict[int, str]):
+        """
+        Registra diretórios removidos ou renomeados por um evento inotify.
+
+        IN_MOVED_FROM e IN_MOVED_TO com o mesmo cookie viram uma renomeação
+        (path antigo, path novo); IN_DELETE, IN_DELETE_SELF e IN_MOVED_FROM
+        sem par viram remoção.
+        """
+        if not mask & inotify.IN_ISDIR or '.git' in Path(directory).parts:
+            return
+
+        if mask & inotify.IN_DELETE_SELF:
+            removed.add(directory)
+            return
+
+        path = str(Path(directory) / name)
+        if mask & inotify.IN_DELETE:
+            removed.add(path)
+        elif mask & inotify.IN_MOVED_FROM:
+            moved_from[cookie] = path
+        elif mask & inotify.IN_MOVED_TO and cookie in moved_from:
+            moves.append((moved_from.pop(cookie), path))
+
+    def _move_projects(self, old: str, new: str) -> Tuple[int, int]:
+        """
+        Troca o prefixo de path dos projetos (e docs/manifests) sob `old` por `new`.
+
+        Um projeto cujo path novo já tem linha (ex.: arquivada de um projeto
+        que estava no destino) não é movido: a linha de origem passa pelo
+        modo de prune e a do destino, re-detectada, é a que fica. O commit
+        fica com quem chama.
+
+        Returns:
+            (projetos com o path alterado, projetos de origem removidos ou arquivados)
+        """
+        under_old, old_params = self._under_location(Path(old))
+        docs_under_old, _ = self._under_location(Path(old), 'file_path')
+        new_params = (new, len(old) + 1)
+        taken = "EXISTS (SELECT 1 FROM projects dst WHERE dst.path = ? || substr(projects.path, ?))"
+
+        pruned = self._prune_projects(f"{under_old} AND {taken}", old_params + new_params)
+        moved = self.conn.execute(
+            f"UPDATE projects SET path = ? || substr(path, ?) WHERE {under_old} AND NOT {taken}",
+            new_params + old_params + new_params
+        ).rowcount
+
+        # Projetos ainda sob `old` são as origens em conflito: os docs ficam com eles
+        self.conn.execute(
+            f"UPDATE project_docs SET file_path = ? || substr(file_path, ?) "
+            f"WHERE {docs_under_old} "
+            f"AND project_id NOT IN (SELECT id FROM projects WHERE {under_old})",
+            new_params + old_params + old_params
+        )
+        # Cache de manifests: entrada já existente no destino prevalece
+        self.conn.execute(
+            f"UPDATE OR IGNORE manifest_cache SET path = ? || substr(path, ?) WHERE {under_old}",
+            new_params + old_params
+        )
+        return moved, pruned
+
+    def _apply_watch_changes(self, changed: Set[str], roots: List[Path], writer: 'ProjectBatchWriter',
+                             removed: Set[str] = None, moves: List[Tuple[str, str]] = None):
+        """
+        Aplica renomeações e remoções e re-detecta os diretórios alterados, em uma transação.
+
+        Args:
+            changed: Diretórios a re-detectar
+            roots: Raízes observadas
+            writer: Writer do watch (path_to_id é recarregado após renomear/remover)
+            removed: Diretórios removidos (ou que saíram da árvore observada)
+            moves: Renomeações (path antigo, path novo) dentro das raízes
+        """
+        start = time.time()
+        detected = 0
+        moved = 0
+        pruned = 0
+
+        for old, new in moves or ():
+            moved_projects, pruned_sources = self._move_projects(old, new)
+            moved += moved_projects
+            pruned += pruned_sources
+
+        for path in sorted(removed or ()):
+            if not os.path.isdir(path):
+                under_location, params = self._under_location(Path(path))
+                pruned += self._prune_projects(under_location, params)
+
+        if moved or pruned:
+            writer.reload_ids()
+
+        # Ordenado: pais são gravados antes dos filhos
+        for directory in sorted(changed):
+            path = Path(directory)
+            if not path.is_dir():
+                continue
+
+            root = next((r for r in roots if path == r or r in path.parents), None)
+            if root is None:
+                continue
+            depth = len(path.relative_to(root).parts)
+            if depth > self.max_depth:
+                continue
+
+            # Pai = ancestral mais próximo já indexado
+            parent_path = None
+            for ancestor in path.parents:
+                if str(ancestor) in writer.path_to_id:
+                    parent_path = str(ancestor)
+                    break
+                if ancestor == root:
+                    break
+
+            project_info = self._detect_project(path, depth, parent_path)
+            if project_info:
+                writer.add(project_info)
+                detected += 1
+            elif directory in writer.path_to_id:
+                # Marcador removido: o diretório deixou de ser projeto
+                pruned += self._prune_projects("path = ?", (directory,))
+                writer.reload_ids()
+
+        writer.flush()
+
+        if detected or moved or pruned:
+            elapsed_ms = (time.time() - start) * 1000
+            timestamp = datetime.now().strftime("%H:%M:%S")
+            print(f"[{timestamp}] {detected} projeto(s) atualizado(s), {moved} movido(s), "
+                  f"{pruned} removido(s)/arquivado(s) em {elapsed_ms:.0f}ms")
+
     def close(self):
         """Fecha conexão com banco."""
         if self.conn:
             self.conn.close()
 
 
+class ProjectBatchWriter:
+    """
+    Grava projetos descobertos em lotes.
+
+    Pré-carrega o mapa path→id em uma única query e agrupa INSERTs, UPDATEs,
+    reescrita de project_docs e project_root_commits e a resolução pai/filho em executemany, com um
+    commit por lote (ou um único commit, se batch_size = 0). Com `generation`,
+    marca todo projeto do lote (inclusive os inalterados) para o sweep.
+    """
+
+    # Limite conservador de parâmetros por statement no SQLite
+    MAX_SQL_VARIABLES = 900
+
+    # Intervalo máximo entre commits (as primeiras linhas chegam ao banco logo)
+    FLUSH_INTERVAL_SECONDS = 2.0
+
+    def __init__(self, conn: sqlite3.Connection, batch_size: int = 500,
+                 update_existing: bool = True, log=None, generation: Optional[int] = None):
+        self.conn = conn
+        self.batch_size = batch_size
+        self.update_existing = update_existing
+        self.generation = generation
+        self.log = log or (lambda message, level="INFO": None)
+
+        # Funções chamadas dentro da transação de cada lote, antes do commit
+        self.before_commit = []
+        self.last_flush = time.time()
+
+        self.reload_ids()
+        self.pending = []
+        self.deferred_hierarchy = []
+
+        self.added = 0
+        self.updated = 0
+        self.unchanged = 0
+        self.hierarchy_updates = 0
+        self.rows_written = 0
+        self.write_seconds = 0.0
+        self.flushes = 0
+
+    def reload_ids(self):
+        """Recarrega path_to_id depois de escritas feitas fora do writer (rescan, prune, renomeação)."""
+        self.path_to_id = {
+            row[1]: row[0] for row in self.conn.execute("SELECT id, path FROM projects")
+        }
+
+    def add(self, project_info: Dict):
+        """Enfileira um projeto; grava quando o lote enche."""
+        self.pending.append(project_info)
+        if self.batch_size and (
+            len(self.pending) >= self.batch_size
+            or time.time() - self.last_flush >= self.FLUSH_INTERVAL_SECONDS
+        ):
+            self.flush()
+
+    def flush(self):
+        """Grava o lote pendente em uma transação."""
+        start = time.time()
+        batch, self.pending = self.pending, []
+
+        inserts = []
+        updates = []
+        inserted_paths = set()
+        for project_info in batch:
+            path = project_info['path']
+            if path not in self.path_to_id and path not in inserted_paths:
+                inserts.append(project_info)
+                inserted_paths.add(path)
+            elif project_info.get('unchanged'):
+                self.unchanged += 1
+            elif self.update_existing:
+                updates.append(project_info)
+
+        # INSERTs em lote; ids recuperados por path em seguida
+        if inserts:
+            self.conn.executemany(
+                ProjectScanner._insert_sql(),
+                [ProjectScanner._project_row(p) for p in inserts]
+            )
+            self._resolve_ids([p['path'] for p in inserts])
+            self.added += len(inserts)
+            self.rows_written += len(inserts)
+            for p in inserts:
+                self.log(f"Adicionado: {p['name']}")
+
+        if updates:
+            self.conn.executemany(
+                ProjectScanner._update_sql(),
+                [ProjectScanner._update_row(self.path_to_id[p['path']], p) for p in updates]
+            )
+            self.conn.executemany(
+                "DELETE FROM project_docs WHERE project_id = ?",
+                [(self.path_to_id[p['path']],) for p in updates]
+            )
+            self.conn.executemany(
+                "DELETE FROM project_root_commits WHERE project_id = ?",
+                [(self.path_to_id[p['path']],) for p in updates]
+            )
+            self.updated += len(updates)
+            self.rows_written += len(updates)
+            for p in updates:
+                self.log(f"Atualizado: {p['name']}")
+
+        doc_rows = []
+        for p in inserts + updates:
+            doc_rows.extend(ProjectScanner._doc_rows(self.path_to_id[p['path']], p))
+        if doc_rows:
+            self.conn.executemany(ProjectScanner.DOC_INSERT_SQL, doc_rows)
+            self.rows_written += len(doc_rows)
+
+        # Commits raiz um por linha, para _find_same_history juntar pelo índice em sha
+        root_rows = [
+            (self.path_to_id[p['path']], sha)
+            for p in inserts + updates for sha in (p.get('git_root_commits') or '').split(',') if sha
+        ]
+        if root_rows:
+            self.conn.executemany(
+                "INSERT OR IGNORE INTO project_root_commits (project_id, sha) VALUES (?, ?)", root_rows
+            )
+            self.rows_written += len(root_rows)
+
+        # Hierarquia pai/filho (o pai vem antes do filho na pré-ordem do walk)
+        pairs = self.deferred_hierarchy + [
+            (p['parent_path'], p['path']) for p in batch if p.get('parent_path')
+        ]
+        self.deferred_hierarchy = []
+        hierarchy_rows = []
+        for parent_path, project_path in pairs:
+            if parent_path in self.path_to_id:
+                hierarchy_rows.append((self.path_to_id[parent_path], self.path_to_id[project_path]))
+            else:
+                self.deferred_hierarchy.append((parent_path, project_path))
+        if hierarchy_rows:
+            self.conn.executemany(
+                "UPDATE projects SET parent_project_id = ?, is_subproject = 1 WHERE id = ?",
+                hierarchy_rows
+            )
+            self.hierarchy_updates += len(hierarchy_rows)
+            self.rows_written += len(hierarchy_rows)
+
+        # Marca de geração: vistos neste scan não entram no sweep
+        if self.generation is not None and batch:
+            self.conn.executemany(
+                "UPDATE projects SET scan_generation = ? WHERE id = ?",
+                [(self.generation, self.path_to_id[p['path']]) for p in batch]
+            )
+
+        # Arquivados pelo prune que reapareceram (scan, update ou watch) voltam ao status anterior
+        if batch:
+            self.conn.executemany(
+                "UPDATE projects SET status = status_before_prune, status_before_prune = NULL "
+                "WHERE id = ? AND status_before_prune IS NOT NULL",
+                [(self.path_to_id[p['path']],) for p in batch]
+            )
+
+        for hook in self.before_commit:
+            hook()
+
+        self.conn.commit()
+        self.last_flush = time.time()
+        self.write_seconds += self.last_flush - start
+        self.flushes += 1
+
+    def _resolve_ids(self, paths: List[str]):
+        """Preenche path_to_id para paths recém-inseridos."""
+        for i in range(0, len(paths), self.MAX_SQL_VARIABLES):
+            chunk = paths[i:i + self.MAX_SQL_VARIABLES]
+            placeholders = ','.join('?' for _ in chunk)
+            for row in self.conn.execute(
+                f"SELECT id, path FROM projects WHERE path IN ({placeholders})", chunk
+            ):
+                self.path_to_id[row[1]] = row[0]
+
+    def close(self):
+        """Grava o que restou no lote final."""
+        self.flush()
+        # Pais fora deste scan não têm id: sem relação a gravar
+        self.deferred_hierarchy = []
+
+    def stats(self) -> Dict:
+        """Contadores para as estatísticas do scan."""
+        return {
+            'projects_added': self.added,
+            'projects_updated': self.updated,
+            'projects_unchanged': self.unchanged,
+            'rows_written': self.rows_written,
+            'rows_per_second': round(self.rows_written / self.write_seconds, 1) if self.write_seconds else 0.0,
+        }
+
+
+class ScanProfiler:
+    """
+    Tempo e contadores de operações por fase do scan (--profile).
+
+    Os tempos são somados entre threads: com workers > 1 a soma das fases
+    pode passar da duração total do scan. Desabilitado, cada chamada
+    retorna logo, sem lock nem relógio.
+    """
+
+    PHASES = ['walk', 'git', 'docs', 'manifest', 'write']
+    FIELDS = ['seconds', 'calls', 'dirs', 'stats', 'subprocesses', 'bytes_read', 'rows_written']
+
+    def __init__(self, enabled: bool = False):
+        self.enabled = enabled
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        self.phases = {phase: dict.fromkeys(self.FIELDS, 0) for phase in self.PHASES}
+
+    def add(self, phase: str, **counters):
+        """Soma contadores (e 'seconds') a uma fase."""
+        if not self.enabled:
+            return
+        with self._lock:
+            metrics = self.phases[phase]
+            for key, value in counters.items():
+                metrics[key] += value
+
+    def phase(self, phase: str):
+        """Context manager que cronometra uma chamada da fase."""
+        if not self.enabled:
+            return nullcontext()
+        return self._timed(phase)
+
+    @contextmanager
+    def _timed(self, phase: str):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(phase, seconds=time.perf_counter() - start, calls=1)
+
+    def summary(self) -> Dict[str, Dict]:
+        """Cópia das métricas, com segundos arredondados."""
+        with self._lock:
+            return {
+                phase: {**metrics, 'seconds': round(metrics['seconds'], 4)}
+                for phase, metrics in self.phases.items()
+            }
+
+    @classmethod
+    def merge(cls, total: Optional[Dict], profile: Dict) -> Dict:
+        """Soma dois resumos (full-scan agrega as localizações)."""
+        if total is None:
+            return {phase: dict(metrics) for phase, metrics in profile.items()}
+        for phase, metrics in profile.items():
+            for key in cls.FIELDS:
+                total[phase][key] += metrics[key]
+        return total
+
+    @classmethod
+    def format(cls, profile: Dict) -> str:
+        """Tabela de breakdown por fase para o terminal."""
+        lines = [
+            f"{'Fase':<10}{'Tempo (s)':>11}{'Chamadas':>10}{'Dirs':>8}{'Stats':>8}"
+            f"{'Subproc':>9}{'Bytes lidos':>13}{'Linhas':>9}",
+        ]
+        for phase in cls.PHASES:
+            m = profile[phase]
+            lines.append(
+                f"{phase:<10}{m['seconds']:>11.3f}{m['calls']:>10}{m['dirs']:>8}{m['stats']:>8}"
+                f"{m['subprocesses']:>9}{m['bytes_read']:>13}{m['rows_written']:>9}"
+            )
+        return "\n".join(lines)
+
+
+def read_path_list(source: str) -> List[str]:
+    """
+    Lê paths de um arquivo (ou stdin com '-').
+
+    Aceita separação por NUL (saída de `find -print0`) ou por quebra de
+    linha; entradas vazias são ignoradas.
+    """
+    if source == '-':
+        data = sys.stdin.buffer.read()
+    else:
+        with open(source, 'rb') as f:
+            data = f.read()
+
+    entries = data.split(b'\0') if b'\0' in data else data.splitlines()
+    return [os.fsdecode(entry) for entry in entries if entry.strip()]
+
+
 def main():
     """CLI principal do scanner."""
     parser = argparse.ArgumentParser(
@@ -652,18 +3093,98 @@ def main():
     scan_parser = subparsers.add_parser('scan', help='Escanear localização específica')
     scan_parser.add_argument('--location', required=True, help='Path do diretório')
     scan_parser.add_argument('--max-depth', type=int, default=10, help='Profundidade máxima')
+    scan_parser.add_argument('--workers', type=int, default=1, help='Threads do walker (padrão: 1 = serial)')
+    scan_parser.add_argument('--incremental', action='store_true',
+                             help='Pular diretórios inalterados desde o último scan')
+    scan_parser.add_argument('--batch-size', type=int, default=500,
+                             help='Projetos por transação (0 = um commit por localização)')
+    scan_parser.add_argument('--prune', choices=ProjectScanner.PRUNE_MODES, default='archive',
+                             help='Projetos não vistos no scan: archive, delete (só os sem tarefas '
+                                  'nem histórico) ou none (padrão: archive)')
+    scan_parser.add_argument('--checkpoint-interval', type=float,
+                             default=ProjectScanner.CHECKPOINT_INTERVAL_SECONDS,
+                             help='Segundos entre checkpoints para o resume (0 = desligado; '
+                                  'exige --batch-size > 0)')
+    scan_parser.add_argument('--workspace-members', action='store_true',
+                             help='Nos monorepos, visitar só os membros declarados nos manifests '
+                                  'de workspace (padrão: descer a árvore inteira)')
+    scan_parser.add_argument('--gitignore', action='store_true',
+                             help='Não descer em diretórios ignorados pelo .gitignore/.git/info/exclude '
+                                  'de cada repositório')
+    scan_parser.add_argument('--disk-usage', action='store_true',
+                             help='Medir o tamanho em disco de cada projeto (usado pelas '
+                                  'estimativas de duplicates.py suggest-consolidation)')
+    scan_parser.add_argument('--profile', action='store_true',
+                             help='Medir tempo e operações por fase (gravado em scan_phase_metrics)')
     scan_parser.add_argument('--verbose', action='store_true', help='Modo verbose')
 
     # Comando: update
-    update_parser = subparsers.add_parser('update', help='Atualizar projeto específico')
-    update_parser.add_argument('--path', required=True, help='Path do projeto')
+    update_parser = subparsers.add_parser('update', help='Atualizar projeto(s) específico(s)')
+    update_source = update_parser.add_mutually_exclusive_group(required=True)
+    update_source.add_argument('--path', help='Path do projeto')
+    update_source.add_argument('--paths-from', metavar='ARQUIVO',
+                               help='Arquivo com paths separados por NUL ou quebra de linha (- = stdin)')
+    update_parser.add_argument('--workers', type=int, default=4,
+                               help='Threads de detecção (padrão: 4)')
     update_parser.add_argument('--verbose', action='store_true', help='Modo verbose')
 
     # Comando: full-scan
     full_parser = subparsers.add_parser('full-scan', help='Escanear todas as localizações')
-    full_parser.add_argument('--max-depth', type=int, default=10, help='Profundidade máxima')
+    full_parser.add_argument('--roots', metavar='ARQUIVO',
+                             help='Configuração de raízes (padrão: index/roots.json, '
+                                  'ou as localizações embutidas se não existir)')
+    full_parser.add_argument('--max-depth', type=int, default=10,
+                             help='Profundidade máxima (raízes sem max_depth próprio)')
+    full_parser.add_argument('--workers', type=int, default=1,
+                             help='Threads do walker por raiz (raízes sem workers próprio; padrão: 1)')
+    full_parser.add_argument('--incremental', action='store_true',
+                             help='Pular diretórios inalterados desde o último scan')
+    full_parser.add_argument('--batch-size', type=int, default=500,
+                             help='Projetos por transação (0 = um commit por localização)')
+    full_parser.add_argument('--prune', choices=ProjectScanner.PRUNE_MODES, default='archive',
+                             help='Projetos não vistos no scan: archive, delete (só os sem tarefas '
+                                  'nem histórico) ou none (padrão: archive)')
+    full_parser.add_argument('--checkpoint-interval', type=float,
+                             default=ProjectScanner.CHECKPOINT_INTERVAL_SECONDS,
+                             help='Segundos entre checkpoints para o resume (0 = desligado; '
+                                  'exige --batch-size > 0)')
+    full_parser.add_argument('--workspace-members', action='store_true',
+                             help='Nos monorepos, visitar só os membros declarados nos manifests '
+                                  'de workspace (padrão: descer a árvore inteira)')
+    full_parser.add_argument('--gitignore', action='store_true',
+                             help='Não descer em diretórios ignorados pelo .gitignore/.git/info/exclude '
+                                  'de cada repositório')
+    full_parser.add_argument('--disk-usage', action='store_true',
+                             help='Medir o tamanho em disco de cada projeto (usado pelas '
+                                  'estimativas de duplicates.py suggest-consolidation)')
+    full_parser.add_argument('--profile', action='store_true',
+                             help='Medir tempo e operações por fase (gravado em scan_phase_metrics)')
     full_parser.add_argument('--verbose', action='store_true', help='Modo verbose')
 
+    # Comando: resume
+    resume_parser = subparsers.add_parser('resume', help='Continuar scans interrompidos do último checkpoint')
+    resume_parser.add_argument('--location', help='Retomar só esta localização (padrão: todas)')
+    resume_parser.add_argument('--verbose', action='store_true', help='Modo verbose')
+
+    # Comando: update-recent
+    recent_parser = subparsers.add_parser('update-recent',
+                                          help='Atualizar projetos com atividade git recente')
+    recent_parser.add_argument('--days', type=int, default=7, help='Janela de atividade em dias (padrão: 7)')
+    recent_parser.add_argument('--location', action='append',
+                               help='Localização a percorrer (repetível; padrão: localizações do full-scan)')
+    recent_parser.add_argument('--max-depth', type=int, default=10, help='Profundidade máxima')
+    recent_parser.add_argument('--workers', type=int, default=1, help='Threads do walker (padrão: 1 = serial)')
+    recent_parser.add_argument('--verbose', action='store_true', help='Modo verbose')
+
+    # Comando: watch
+    watch_parser = subparsers.add_parser('watch', help='Observar localizações e atualizar o índice (inotify)')
+    watch_parser.add_argument('--location', action='append',
+                              help='Localização a observar (repetível; padrão: localizações do full-scan)')
+    watch_parser.add_argument('--max-depth', type=int, default=10, help='Profundidade máxima')
+    watch_parser.add_argument('--debounce', type=float, default=0.5,
+                              help='Segundos sem eventos que encerram uma rajada')
+    watch_parser.add_argument('--verbose', action='store_true', help='Modo verbose')
+
     args = parser.parse_args()
 
     if args.command is None:
@@ -672,32 +3193,125 @@ def main():
 
     # Executar comando
     if args.command == 'scan':
-        scanner = ProjectScanner(max_depth=args.max_depth, verbose=args.verbose)
+        scanner = ProjectScanner(max_depth=args.max_depth, verbose=args.verbose,
+                                 workers=args.workers, incremental=args.incremental,
+                                 batch_size=args.batch_size, prune=args.prune,
+                                 profile=args.profile, checkpoint_interval=args.checkpoint_interval,
+                                 workspace_members=args.workspace_members, gitignore=args.gitignore,
+                                 disk_usage=args.disk_usage)
         stats = scanner.scan_location(args.location)
         print(json.dumps(stats, indent=2))
+        if 'profile' in stats:
+            print("\n" + ScanProfiler.format(stats['profile']))
         scanner.close()
 
     elif args.command == 'update':
-        scanner = ProjectScanner(verbose=args.verbose)
-        success = scanner.update_project(args.path)
+        scanner = ProjectScanner(verbose=args.verbose, workers=args.workers)
+        if args.path:
+            success = scanner.update_project(args.path)
+            scanner.close()
+            exit(0 if success else 1)
+
+        paths = read_path_list(args.paths_from)
+        results = scanner.update_projects(paths)
         scanner.close()
-        exit(0 if success else 1)
+
+        for path, result in results:
+            print(f"{result}\t{path}")
+        ok = all(result in (ProjectScanner.UPDATE_ADDED, ProjectScanner.UPDATE_UPDATED)
+                 for _, result in results)
+        exit(0 if ok else 1)
 
     elif args.command == 'full-scan':
-        scanner = ProjectScanner(max_depth=args.max_depth, verbose=args.verbose)
-        stats = scanner.full_scan()
+        scanner = ProjectScanner(max_depth=args.max_depth, verbose=args.verbose,
+                                 workers=args.workers, incremental=args.incremental,
+                                 batch_size=args.batch_size, prune=args.prune,
+                                 profile=args.profile, checkpoint_interval=args.checkpoint_interval,
+                                 workspace_members=args.workspace_members, gitignore=args.gitignore,
+                                 disk_usage=args.disk_usage)
+        try:
+            roots = scanner.load_roots(args.roots)
+        except ValueError as e:
+            print(f"Erro: {e}")
+            scanner.close()
+            exit(1)
+        stats = scanner.full_scan(roots)
         print("\n" + "="*60)
         print("FULL SCAN COMPLETO")
         print("="*60)
-        print(f"Localizações escaneadas: {stats['locations_scanned']}")
+        print(f"Localizações escaneadas: {stats['locations_scanned']} "
+              f"({stats['devices']} dispositivos em paralelo)")
         print(f"Total de projetos encontrados: {stats['total_projects_found']}")
         print(f"Novos projetos: {stats['total_projects_added']}")
         print(f"Projetos atualizados: {stats['total_projects_updated']}")
+        print(f"Projetos não vistos ({args.prune}): {stats['total_projects_removed']}")
         print(f"Profundidade máxima: {stats['max_depth_overall']} níveis")
         print(f"Duração total: {stats['total_duration']:.2f}s")
+        print(f"Linhas gravadas: {stats['total_rows_written']}")
+        manifests = stats['total_manifest_cache_hits'] + stats['total_manifest_cache_misses']
+        if manifests:
+            print(f"Cache de package.json: {stats['total_manifest_cache_hits']}/{manifests} "
+                  f"({stats['total_manifest_cache_hits'] / manifests:.0%})")
+        if stats['total_workspace_roots']:
+            print(f"Monorepos pelos manifests de workspace: {stats['total_workspace_roots']} "
+                  f"({stats['total_workspace_members']} membros)")
+        if args.gitignore:
+            print(f"Diretórios podados pelo .gitignore: {stats['total_dirs_pruned']}")
+        print("Tempo por localização:")
+        for root in stats['roots']:
+            print(f"  {root['scan_duration_seconds']:7.2f}s  {root['projects_found']:5d} projetos  "
+                  f"{root['location']}")
+        if args.incremental:
+            print(f"Diretórios inalterados (pulados): {stats['total_dirs_skipped']}")
+            print(f"Diretórios reexaminados: {stats['total_dirs_examined']}")
+        if 'profile' in stats:
+            print("-"*60)
+            print(ScanProfiler.format(stats['profile']))
         print("="*60)
         scanner.close()
 
+    elif args.command == 'resume':
+        scanner = ProjectScanner(verbose=args.verbose)
+        results = scanner.resume(args.location)
+        scanner.close()
+
+        if not results:
+            print("Nenhum scan interrompido para retomar.")
+        for stats in results:
+            if 'error' in stats:
+                print(f"  ✗ {stats.get('location', '?')}: {stats['error']}")
+                continue
+            print(f"  ✓ {stats['location']}: {stats['projects_found']} projetos "
+                  f"({stats['projects_added']} novos, {stats['projects_updated']} atualizados, "
+                  f"{stats['projects_removed']} não vistos) em {stats['scan_duration_seconds']:.2f}s")
+
+    elif args.command == 'update-recent':
+        scanner = ProjectScanner(max_depth=args.max_depth, verbose=args.verbose, workers=args.workers)
+        stats = scanner.update_recent(days=args.days, locations=args.location)
+        for path in stats['updated']:
+            print(f"  ✓ {Path(path).name} ({path})")
+        print(f"Repositórios verificados: {stats['repos_checked']}")
+        print(f"Com atividade nos últimos {args.days} dias: {stats['repos_recent']}")
+        print(f"Novos projetos: {stats['projects_added']}")
+        print(f"Projetos atualizados: {stats['projects_updated']}")
+        print(f"Prioridades recalculadas: {stats['priorities_updated']}")
+        print(f"Duração: {stats['duration_seconds']:.2f}s")
+        scanner.close()
+
+    elif args.command == 'watch':
+        scanner = ProjectScanner(max_depth=args.max_depth, verbose=args.verbose)
+        try:
+            scanner.watch(args.location, debounce=args.debounce)
+        except OSError as e:
+            print(f"Erro: watch requer inotify (Linux): {e}")
+            print("Use 'scan --incremental' para atualizações periódicas.")
+            exit(1)
+        finally:
+            scanner.close()
+
 
 if __name__ == "__main__":
-    main()
+    try:
+        main()
+    except KeyboardInterrupt:
+        exit(130)
@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Schema do banco - Claude Projects Intelligence Hub
+
+Aplica o schema.sql e as migrações de coluna a uma conexão, para que o
+scanner.py e os analisadores (analysis/duplicates.py) abram bancos criados
+por versões anteriores sem erro de coluna ou tabela inexistente.
+"""
+
+import sqlite3
+from pathlib import Path
+from typing import Callable, Optional
+
+from git_reader import canonical_remote
+
+SCHEMA_PATH = Path(__file__).parent / 'schema.sql'
+
+# Colunas adicionadas depois da criação inicial das tabelas (bancos já existentes)
+SCHEMA_MIGRATIONS = {
+    'projects': [('scan_generation', 'INTEGER DEFAULT 0'), ('dir_device', 'INTEGER'),
+                 ('dir_inode', 'INTEGER'), ('disk_size_source', 'INTEGER'),
+                 ('disk_size_ignored', 'INTEGER'), ('git_remote_canonical', 'TEXT'),
+                 ('git_head_commit', 'TEXT'), ('git_root_commits', 'TEXT'),
+                 ('status_before_prune', 'TEXT')],
+    'scan_history': [('scan_generation', 'INTEGER'), ('projects_removed', 'INTEGER DEFAULT 0')],
+    'project_docs': [('file_size', 'INTEGER')],
+}
+
+# Índices de versões anteriores que o schema não cria mais
+SCHEMA_DROPPED_INDEXES = ['idx_projects_git_root_commits']
+
+
+def ensure_schema(conn: sqlite3.Connection, log: Optional[Callable[[str], None]] = None):
+    """
+    Deixa o banco no schema atual: colunas de SCHEMA_MIGRATIONS e depois schema.sql.
+
+    As colunas vêm primeiro porque o schema cria índices sobre elas; o
+    schema.sql é idempotente (IF NOT EXISTS), então bancos antigos só
+    ganham as tabelas e índices novos. Ao ser criada, project_root_commits
+    é preenchida a partir de projects.git_root_commits.
+
+    Args:
+        conn: Conexão aberta (o commit é feito aqui)
+        log: Recebe uma mensagem por coluna migrada
+
+    Raises:
+        FileNotFoundError: schema.sql ausente
+    """
+    if not SCHEMA_PATH.exists():
+        raise FileNotFoundError(f"Schema SQL não encontrado: {SCHEMA_PATH}")
+
+    for table, columns in SCHEMA_MIGRATIONS.items():
+        # row[1] é o nome da coluna (vale com ou sem sqlite3.Row)
+        existing = {row[1] for row in conn.execute(f"PRAGMA table_info({table})")}
+        if not existing:
+            continue  # tabela nova: criada completa pelo schema
+
+        for column, definition in columns:
+            if column in existing:
+                continue
+            if log:
+                log(f"Migrando {table}: adicionando coluna {column}")
+            conn.execute(f"ALTER TABLE {table} ADD COLUMN {column} {definition}")
+
+            # Remotes já indexados ganham a forma canônica sem esperar um novo scan
+            if (table, column) == ('projects', 'git_remote_canonical'):
+                conn.executemany(
+                    "UPDATE projects SET git_remote_canonical = ? WHERE id = ?",
+                    [(canonical_remote(remote), project_id) for project_id, remote in conn.execute(
+                        "SELECT id, git_remote FROM projects WHERE git_remote IS NOT NULL"
+                    ).fetchall()]
+                )
+
+    for index in SCHEMA_DROPPED_INDEXES:
+        conn.execute(f"DROP INDEX IF EXISTS {index}")
+
+    had_root_commits = conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'project_root_commits'"
+    ).fetchone()
+
+    with open(SCHEMA_PATH, 'r', encoding='utf-8') as f:
+        conn.executescript(f.read())
+
+    # Raízes já indexadas entram na tabela sem esperar um novo scan
+    if not had_root_commits:
+        conn.executemany(
+            "INSERT OR IGNORE INTO project_root_commits (project_id, sha) VALUES (?, ?)",
+            [(project_id, sha) for project_id, roots in conn.execute(
+                "SELECT id, git_root_commits FROM projects WHERE git_root_commits IS NOT NULL"
+            ).fetchall() for sha in roots.split(',')]
+        )
+    conn.commit()
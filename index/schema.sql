@@ -21,8 +21,11 @@ CREATE TABLE IF NOT EXISTS projects (
     -- Git information
     has_git BOOLEAN DEFAULT 0,
     git_remote TEXT,
+    git_remote_canonical TEXT,  -- Remote sem scheme/usuário/porta/.git, minúsculo (github.com/org/repo)
     git_branch TEXT,
     git_last_commit_date TIMESTAMP,
+    git_head_commit TEXT,  -- HEAD quando as raízes foram lidas (reaproveitadas se não mudar)
+    git_root_commits TEXT,  -- SHAs dos commits raiz, ordenados e separados por vírgula (NULL: vazio/shallow)
 
     -- Documentation
     has_claude_md BOOLEAN DEFAULT 0,
@@ -43,6 +46,19 @@ CREATE TABLE IF NOT EXISTS projects (
     tags TEXT,  -- JSON array of tags
     config_files TEXT,  -- JSON array de arquivos de config encontrados
 
+    -- Mark-and-sweep: geração do último scan que viu o projeto
+    scan_generation INTEGER DEFAULT 0,
+    status_before_prune TEXT,  -- Status antes do arquivamento pelo sweep (restaurado se o projeto reaparecer)
+
+    -- Identidade do diretório: o mesmo (st_dev, st_ino) em dois paths é o mesmo diretório
+    dir_device INTEGER,
+    dir_inode INTEGER,
+
+    -- Tamanho em disco (scanner.py --disk-usage), sem os subprojetos:
+    -- fontes e diretórios ignorados (node_modules, dist, .git...)
+    disk_size_source INTEGER,
+    disk_size_ignored INTEGER,
+
     -- Timestamps
     last_scanned TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
@@ -59,6 +75,7 @@ CREATE TABLE IF NOT EXISTS project_docs (
     file_path TEXT NOT NULL,
     line_count INTEGER,
     last_modified TIMESTAMP,
+    file_size INTEGER,  -- Com last_modified, valida o line_count em cache
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
     FOREIGN KEY (project_id) REFERENCES projects(id) ON DELETE CASCADE
 );
@@ -110,9 +127,177 @@ CREATE TABLE IF NOT EXISTS scan_history (
     projects_added INTEGER,
     max_depth_found INTEGER,  -- Profundidade máxima encontrada
     scan_duration_seconds REAL,
+    scan_generation INTEGER,  -- Geração gravada nos projetos vistos neste scan
+    projects_removed INTEGER DEFAULT 0,  -- Projetos não vistos (removidos ou arquivados)
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
 );
 
+-- Métricas por fase de um scan (scanner.py --profile)
+-- Tempos somados entre threads do walker/detecção
+CREATE TABLE IF NOT EXISTS scan_phase_metrics (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    scan_id INTEGER NOT NULL,
+    phase TEXT NOT NULL CHECK(phase IN ('walk', 'git', 'docs', 'manifest', 'write')),
+    seconds REAL,
+    calls INTEGER,  -- Execuções da fase (diretórios, projetos ou lotes)
+    dirs INTEGER,  -- Diretórios visitados
+    stats INTEGER,  -- Chamadas stat() explícitas
+    subprocesses INTEGER,  -- Processos `git` disparados
+    bytes_read INTEGER,
+    rows_written INTEGER,
+    FOREIGN KEY (scan_id) REFERENCES scan_history(id) ON DELETE CASCADE,
+    UNIQUE(scan_id, phase)
+);
+
+-- Checkpoints de scans em andamento (scanner.py resume)
+-- Gravados no mesmo commit dos lotes de projetos; removidos quando o scan termina
+CREATE TABLE IF NOT EXISTS scan_checkpoints (
+    location TEXT PRIMARY KEY,
+    scan_generation INTEGER,  -- Geração do scan interrompido (NULL = raiz ainda não iniciada)
+    frontier TEXT NOT NULL,  -- JSON {"pending": [[path, depth, parent_path, follow_link, visit]], "deferred": [[path, depth, parent_path]]}; visit = 'tree' | 'member' | 'self'
+    projects_committed INTEGER DEFAULT 0,  -- Projetos já gravados (offset dos lotes)
+    projects_added INTEGER DEFAULT 0,
+    projects_updated INTEGER DEFAULT 0,
+    max_depth_found INTEGER DEFAULT 0,
+    options TEXT,  -- JSON com as opções do scanner (max_depth, workers, incremental, ...)
+    started_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+-- Fingerprints de diretórios (scan incremental)
+-- Um diretório com mtime/inode/listagem inalterados reaproveita a linha já indexada
+CREATE TABLE IF NOT EXISTS dir_fingerprints (
+    path TEXT PRIMARY KEY,
+    mtime_ns INTEGER NOT NULL,
+    inode INTEGER NOT NULL,
+    listing_hash TEXT NOT NULL,  -- SHA-1 dos nomes dos filhos
+    watched_files TEXT,  -- JSON {arquivo relevante: [mtime_ns, size]} (marcadores, docs, .git/HEAD...)
+    subdirs TEXT,  -- JSON array de subdiretórios não ignorados
+    project_path TEXT,  -- Path do projeto detectado (NULL se não for projeto)
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+-- Cache de manifests (package.json) já analisados
+-- Um arquivo com inode/mtime/tamanho inalterados não é lido nem parseado de novo
+CREATE TABLE IF NOT EXISTS manifest_cache (
+    path TEXT PRIMARY KEY,
+    inode INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    size INTEGER NOT NULL,
+    framework TEXT,  -- Framework derivado das dependências
+    package_manager TEXT,  -- Do campo "packageManager" (usado quando não há lockfile)
+    dependencies TEXT,  -- JSON array dos nomes em dependencies + devDependencies
+    parse_error TEXT,  -- Erro do último parse (manifest inválido também fica em cache)
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+-- Hashes de conteúdo por arquivo (duplicates.py find --content; report só lê)
+-- Válidos enquanto inode/mtime/tamanho não mudam; arquivos pequenos têm os dois hashes iguais
+CREATE TABLE IF NOT EXISTS file_hash_cache (
+    path TEXT PRIMARY KEY,
+    inode INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    size INTEGER NOT NULL,
+    partial_hash TEXT,  -- Hash dos primeiros bytes do arquivo
+    full_hash TEXT,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+-- Similaridade de conteúdo entre pares de projetos raiz (duplicates.py find --content)
+CREATE TABLE IF NOT EXISTS project_similarity (
+    project_a_id INTEGER NOT NULL,
+    project_b_id INTEGER NOT NULL,
+    score REAL NOT NULL,  -- Jaccard ponderado por bytes dos arquivos de mesmo conteúdo (0-1)
+    matched_files INTEGER,
+    matched_bytes INTEGER,
+    union_bytes INTEGER,
+    computed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (project_a_id, project_b_id),
+    FOREIGN KEY (project_a_id) REFERENCES projects(id) ON DELETE CASCADE,
+    FOREIGN KEY (project_b_id) REFERENCES projects(id) ON DELETE CASCADE
+);
+
+-- Assinaturas MinHash dos nomes normalizados (duplicates.py find --fuzzy; report só lê)
+-- Recalculadas só quando o nome normalizado do projeto muda
+CREATE TABLE IF NOT EXISTS name_signatures (
+    project_id INTEGER PRIMARY KEY,
+    name_key TEXT NOT NULL,  -- Nome normalizado (sem marcas de cópia/versão)
+    signature BLOB NOT NULL,  -- Valores de 32 bits, NAME_BANDS * NAME_BAND_ROWS
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    FOREIGN KEY (project_id) REFERENCES projects(id) ON DELETE CASCADE
+);
+
+-- Clusters de duplicatas (duplicates.py): todas as evidências unidas em componentes conexos
+-- Uma execução por vez; report e suggest-consolidation a reaproveitam enquanto os projetos não mudam
+CREATE TABLE IF NOT EXISTS duplicate_cluster_runs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    content BOOLEAN NOT NULL,  -- Opções da detecção
+    fuzzy BOOLEAN NOT NULL,
+    min_similarity REAL,
+    name_similarity REAL,
+    projects_count INTEGER NOT NULL,  -- Estado de projects no cálculo (muda -> recalcular)
+    projects_max_id INTEGER,
+    projects_updated_at TIMESTAMP,
+    computed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE TABLE IF NOT EXISTS duplicate_clusters (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    run_id INTEGER NOT NULL,
+    position INTEGER NOT NULL,  -- Ordem no relatório
+    name TEXT NOT NULL,
+    cluster_type TEXT NOT NULL,  -- Evidência mais forte
+    evidence TEXT NOT NULL,  -- Tipos de evidência, separados por vírgula
+    action TEXT,
+    primary_project_id INTEGER,
+    project_count INTEGER NOT NULL,
+    FOREIGN KEY (run_id) REFERENCES duplicate_cluster_runs(id) ON DELETE CASCADE,
+    FOREIGN KEY (primary_project_id) REFERENCES projects(id) ON DELETE SET NULL
+);
+
+CREATE TABLE IF NOT EXISTS duplicate_cluster_members (
+    cluster_id INTEGER NOT NULL,
+    project_id INTEGER NOT NULL,
+    evidence TEXT NOT NULL,  -- Evidências que ligam este projeto ao cluster
+    PRIMARY KEY (cluster_id, project_id),
+    FOREIGN KEY (cluster_id) REFERENCES duplicate_clusters(id) ON DELETE CASCADE,
+    FOREIGN KEY (project_id) REFERENCES projects(id) ON DELETE CASCADE
+);
+
+-- Arestas de cada cluster: pares com score (conteúdo, nome parecido) ou ligações de grupo
+CREATE TABLE IF NOT EXISTS duplicate_cluster_edges (
+    cluster_id INTEGER NOT NULL,
+    project_a_id INTEGER NOT NULL,
+    project_b_id INTEGER NOT NULL,
+    evidence TEXT NOT NULL,
+    score REAL,
+    matched_files INTEGER,
+    FOREIGN KEY (cluster_id) REFERENCES duplicate_clusters(id) ON DELETE CASCADE,
+    FOREIGN KEY (project_a_id) REFERENCES projects(id) ON DELETE CASCADE,
+    FOREIGN KEY (project_b_id) REFERENCES projects(id) ON DELETE CASCADE
+);
+
+-- Diretórios alcançados por mais de um path (symlink, bind mount)
+-- O scanner indexa só o path canônico, independente da ordem das threads; os outros ficam aqui
+CREATE TABLE IF NOT EXISTS project_aliases (
+    alias_path TEXT PRIMARY KEY,
+    canonical_path TEXT NOT NULL,  -- O já indexado para o (device, inode); senão o da árvore real; entre symlinks/montagens, o menor path
+    device INTEGER NOT NULL,
+    inode INTEGER NOT NULL,
+    via TEXT CHECK(via IN ('symlink', 'mount')),
+    scan_generation INTEGER,  -- Geração do último scan que viu o alias
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+-- Commits raiz de cada repositório, um por linha (espelho de projects.git_root_commits)
+-- Clones, forks e mirrors se encontram pelo índice em sha
+CREATE TABLE IF NOT EXISTS project_root_commits (
+    project_id INTEGER NOT NULL,
+    sha TEXT NOT NULL,
+    PRIMARY KEY (project_id, sha),
+    FOREIGN KEY (project_id) REFERENCES projects(id) ON DELETE CASCADE
+);
+
 -- Project hierarchy cache (para queries rápidas de árvore completa)
 CREATE TABLE IF NOT EXISTS project_hierarchy_cache (
     id INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -135,6 +320,11 @@ CREATE INDEX IF NOT EXISTS idx_projects_parent_id ON projects(parent_project_id)
 CREATE INDEX IF NOT EXISTS idx_projects_depth ON projects(depth_level);
 CREATE INDEX IF NOT EXISTS idx_projects_is_monorepo ON projects(is_monorepo);
 CREATE INDEX IF NOT EXISTS idx_projects_path ON projects(path);
+CREATE INDEX IF NOT EXISTS idx_projects_scan_generation ON projects(scan_generation);
+CREATE INDEX IF NOT EXISTS idx_projects_dir_identity ON projects(dir_device, dir_inode);
+CREATE INDEX IF NOT EXISTS idx_projects_disk_size ON projects(path, disk_size_source, disk_size_ignored);
+CREATE INDEX IF NOT EXISTS idx_projects_git_remote_canonical ON projects(git_remote_canonical);
+CREATE INDEX IF NOT EXISTS idx_root_commits_sha ON project_root_commits(sha);
 
 CREATE INDEX IF NOT EXISTS idx_docs_project_id ON project_docs(project_id);
 CREATE INDEX IF NOT EXISTS idx_docs_type ON project_docs(doc_type);
@@ -149,6 +339,16 @@ CREATE INDEX IF NOT EXISTS idx_tasks_priority ON project_tasks(priority);
 CREATE INDEX IF NOT EXISTS idx_analysis_project_id ON analysis_history(project_id);
 CREATE INDEX IF NOT EXISTS idx_analysis_type ON analysis_history(analysis_type);
 
+CREATE INDEX IF NOT EXISTS idx_phase_metrics_scan_id ON scan_phase_metrics(scan_id);
+
+CREATE INDEX IF NOT EXISTS idx_aliases_canonical ON project_aliases(canonical_path);
+
+CREATE INDEX IF NOT EXISTS idx_similarity_project_b ON project_similarity(project_b_id);
+
+CREATE INDEX IF NOT EXISTS idx_clusters_run_id ON duplicate_clusters(run_id);
+CREATE INDEX IF NOT EXISTS idx_cluster_members_project ON duplicate_cluster_members(project_id);
+CREATE INDEX IF NOT EXISTS idx_cluster_edges_cluster ON duplicate_cluster_edges(cluster_id);
+
 CREATE INDEX IF NOT EXISTS idx_hierarchy_cache_project_id ON project_hierarchy_cache(project_id);
 
 -- Views for common queries
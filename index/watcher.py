@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+Watcher inotify - Claude Projects Intelligence Hub
+
+Binding mínimo (ctypes) para a API inotify do Linux, usado pelo modo
+`scanner.py watch` para manter o projects.db atualizado sem rescans.
+"""
+
+import ctypes
+import ctypes.util
+import errno
+import os
+import select
+import struct
+from typing import Dict, List, Optional, Tuple
+
+# Máscaras de evento (linux/inotify.h)
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ONLYDIR = 0x01000000
+IN_ISDIR = 0x40000000
+
+# Eventos relevantes para o índice: criação/remoção/renomeação e escrita concluída
+DEFAULT_MASK = (IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE |
+                IN_DELETE | IN_DELETE_SELF | IN_ONLYDIR)
+
+_EVENT_HEADER = struct.Struct('iIII')
+
+
+class InotifyWatcher:
+    """Conjunto de watches inotify com leitura de eventos por timeout."""
+
+    def __init__(self):
+        libc_name = ctypes.util.find_library('c') or 'libc.so.6'
+        try:
+            self._libc = ctypes.CDLL(libc_name, use_errno=True)
+            init = self._libc.inotify_init1
+        except (OSError, AttributeError):
+            raise OSError(errno.ENOSYS, 'inotify não disponível nesta plataforma')
+
+        self.fd = init(os.O_CLOEXEC | os.O_NONBLOCK)
+        if self.fd < 0:
+            err = ctypes.get_errno()
+            raise OSError(err, os.strerror(err))
+
+        self.paths: Dict[int, str] = {}
+        self.limit_reached = False
+
+    def add_watch(self, path: str, mask: int = DEFAULT_MASK) -> Optional[int]:
+        """
+        Registra um diretório.
+
+        Returns:
+            Watch descriptor, ou None se não foi possível registrar
+            (diretório sumiu, sem permissão ou limite max_user_watches)
+        """
+        wd = self._libc.inotify_add_watch(self.fd, os.fsencode(path), mask)
+        if wd < 0:
+            if ctypes.get_errno() == errno.ENOSPC:
+                self.limit_reached = True
+            return None
+
+        self.paths[wd] = path
+        return wd
+
+    def read_events(self, timeout: Optional[float] = None) -> List[Tuple[str, str, int, int]]:
+        """
+        Aguarda eventos por até `timeout` segundos (None = indefinidamente).
+
+        Returns:
+            Lista de (diretório observado, nome da entrada, máscara, cookie).
+            O cookie liga um IN_MOVED_FROM ao IN_MOVED_TO da mesma renomeação
+            (0 nos demais eventos). Um estouro da fila do kernel aparece como
+            ('', '', IN_Q_OVERFLOW, 0).
+        """
+        ready, _, _ = select.select([self.fd], [], [], timeout)
+        if not ready:
+            return []
+
+        events = []
+        while True:
+            try:
+                data = os.read(self.fd, 64 * 1024)
+            except BlockingIOError:
+                break
+
+            offset = 0
+            while offset + _EVENT_HEADER.size <= len(data):
+                wd, mask, cookie, length = _EVENT_HEADER.unpack_from(data, offset)
+                offset += _EVENT_HEADER.size
+                name = data[offset:offset + length].rstrip(b'\0')
+                offset += length
+
+                if mask & IN_Q_OVERFLOW:
+                    events.append(('', '', mask, 0))
+                    continue
+
+                directory = self.paths.get(wd)
+                if mask & IN_IGNORED:
+                    self.paths.pop(wd, None)
+                    continue
+                if directory is not None:
+                    events.append((directory, os.fsdecode(name), mask, cookie))
+
+        return events
+
+    def close(self):
+        if self.fd >= 0:
+            os.close(self.fd)
+            self.fd = -1
@@ -0,0 +1,188 @@
+#!/usr/bin/env python3
+"""
+Workspaces de monorepo - Claude Projects Intelligence Hub
+
+Lê os globs de membros declarados em pnpm-workspace.yaml, package.json
+(workspaces), lerna.json e nx.json e os expande para os diretórios dos
+pacotes, para que o walker do scanner.py visite só esses diretórios em
+vez da árvore inteira do monorepo.
+"""
+
+import json
+import os
+from fnmatch import fnmatchcase
+from pathlib import Path
+from typing import Callable, Dict, Iterator, List, Optional, Set
+
+# Um diretório casado por um glob só é membro se tiver um destes manifests
+MEMBER_MANIFESTS = ('package.json', 'project.json')
+
+_GLOB_CHARS = set('*?[')
+
+
+def read_member_globs(path: Path, names: Set[str]) -> Optional[List[str]]:
+    """
+    Globs de membros declarados pelos manifests de workspace do diretório.
+
+    Args:
+        path: Raiz do monorepo
+        names: Entradas do diretório (só os manifests presentes são lidos)
+
+    Returns:
+        Globs na ordem de declaração (exclusões com '!'), ou None quando
+        nenhum manifest declara membros (turbo.json, nx sem workspaceLayout)
+    """
+    globs = []
+
+    if 'pnpm-workspace.yaml' in names:
+        globs += _pnpm_packages(path / 'pnpm-workspace.yaml')
+
+    if 'lerna.json' in names:
+        globs += _string_list(_read_json(path / 'lerna.json').get('packages'))
+
+    if 'nx.json' in names:
+        layout = _read_json(path / 'nx.json').get('workspaceLayout')
+        if isinstance(layout, dict):
+            for key in ('appsDir', 'libsDir'):
+                if isinstance(layout.get(key), str):
+                    globs.append(f"{layout[key]}/**")
+
+    # Workspaces do npm/yarn (também usados por turbo e pelo lerna moderno)
+    if 'package.json' in names:
+        workspaces = _read_json(path / 'package.json').get('workspaces')
+        if isinstance(workspaces, dict):
+            workspaces = workspaces.get('packages')
+        globs += _string_list(workspaces)
+
+    return list(dict.fromkeys(globs)) or None
+
+
+def expand_member_globs(root: Path, globs: List[str],
+                        list_subdirs: Callable[[Path], List[Path]]) -> List[Path]:
+    """
+    Expande os globs para os diretórios dos membros.
+
+    '*', '?' e '[...]' casam um nível; '**' casa zero ou mais níveis, sem
+    descer abaixo de um diretório que já é membro. Globs que saem da raiz
+    ('..') são ignorados.
+
+    Args:
+        root: Raiz do monorepo
+        globs: Globs de read_member_globs
+        list_subdirs: Subdiretórios não ignorados de um diretório
+
+    Returns:
+        Diretórios dos membros, ordenados pelo path relativo
+    """
+    excludes = [_split(glob[1:]) for glob in globs if glob.startswith('!')]
+    members: Dict[str, Path] = {}
+
+    for glob in globs:
+        if glob.startswith('!'):
+            continue
+        parts = _split(glob)
+        if not parts or '..' in parts:
+            continue
+
+        for member in _match(root, parts, list_subdirs):
+            relative = member.relative_to(root).as_posix()
+            if not any(_excluded(relative, exclude) for exclude in excludes):
+                members.setdefault(relative, member)
+
+    return [members[relative] for relative in sorted(members)]
+
+
+def _match(directory: Path, parts: List[str],
+           list_subdirs: Callable[[Path], List[Path]]) -> Iterator[Path]:
+    if not parts:
+        if _is_member(directory):
+            yield directory
+        return
+
+    head, rest = parts[0], parts[1:]
+
+    if head == '**':
+        yield from _match(directory, rest, list_subdirs)
+        for subdir in list_subdirs(directory):
+            # Pacotes não aninham pacotes: o '**' para no primeiro membro
+            if _is_member(subdir):
+                yield from _match(subdir, rest, list_subdirs)
+            else:
+                yield from _match(subdir, parts, list_subdirs)
+    elif _GLOB_CHARS & set(head):
+        for subdir in list_subdirs(directory):
+            if fnmatchcase(subdir.name, head):
+                yield from _match(subdir, rest, list_subdirs)
+    elif (directory / head).is_dir():
+        yield from _match(directory / head, rest, list_subdirs)
+
+
+def _is_member(directory: Path) -> bool:
+    return any(os.path.isfile(directory / manifest) for manifest in MEMBER_MANIFESTS)
+
+
+def _excluded(relative: str, exclude: List[str]) -> bool:
+    pattern = '/'.join(exclude)
+    # '!**/test/**' também exclui o próprio diretório test
+    return fnmatchcase(relative, pattern) or fnmatchcase(relative + '/', pattern)
+
+
+def _split(glob: str) -> List[str]:
+    return [part for part in glob.strip().split('/') if part not in ('', '.')]
+
+
+def _string_list(value) -> List[str]:
+    if not isinstance(value, list):
+        return []
+    return [item for item in value if isinstance(item, str)]
+
+
+def _read_json(path: Path) -> Dict:
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+    except (OSError, UnicodeDecodeError, json.JSONDecodeError):
+        return {}
+    return data if isinstance(data, dict) else {}
+
+
+def _pnpm_packages(path: Path) -> List[str]:
+    """
+    Lista `packages` do pnpm-workspace.yaml.
+
+    Parser mínimo (sem PyYAML) para as duas formas usadas na prática:
+    lista em bloco (`- 'packages/*'`) e lista inline (`packages: [a, b]`).
+    """
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            lines = f.read().splitlines()
+    except (OSError, UnicodeDecodeError):
+        return []
+
+    packages = []
+    in_packages = False
+    for line in lines:
+        stripped = line.strip()
+        if not stripped or stripped.startswith('#'):
+            continue
+
+        if not line[0].isspace():
+            key, _, value = stripped.partition(':')
+            in_packages = key.strip() == 'packages'
+            value = value.strip()
+            if in_packages and value.startswith('['):
+                packages += [_yaml_scalar(item) for item in value.strip('[]').split(',')]
+                in_packages = False
+            continue
+
+        if in_packages and stripped.startswith('-'):
+            packages.append(_yaml_scalar(stripped[1:]))
+
+    return [package for package in packages if package]
+
+
+def _yaml_scalar(value: str) -> str:
+    value = value.strip()
+    if value[:1] in ('"', "'"):
+        return value[1:].split(value[0], 1)[0]
+    return value.split(' #', 1)[0].strip()
@@ -0,0 +1,95 @@
+"""Configuração do pytest: os módulos de index/ e analysis/ são importados sem pacote."""
+
+import json
+import os
+import shutil
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parent.parent
+
+for directory in ('index', 'analysis'):
+    path = str(ROOT / directory)
+    if path not in sys.path:
+        sys.path.insert(0, path)
+
+from scanner import ProjectScanner  # noqa: E402
+
+# Projetos ativos (o sweep arquiva os não vistos) com o path do pai
+PROJECT_COLUMNS = """
+    SELECT p.path, p.name, p.type, p.depth_level, p.is_monorepo, p.is_subproject,
+           parent.path AS parent_path, p.has_git, p.has_claude_md, p.has_readme
+    FROM projects p LEFT JOIN projects parent ON parent.id = p.parent_project_id
+    WHERE p.status != 'archived'
+    ORDER BY p.path
+"""
+
+GIT_ENV = {
+    'GIT_AUTHOR_NAME': 'Tester', 'GIT_AUTHOR_EMAIL': 'tester@example.com',
+    'GIT_COMMITTER_NAME': 'Tester', 'GIT_COMMITTER_EMAIL': 'tester@example.com',
+    'GIT_CONFIG_NOSYSTEM': '1', 'GIT_CONFIG_GLOBAL': os.devnull,
+}
+
+
+def git(repo: Path, *args: str) -> str:
+    """Roda o `git` no repositório com identidade e config isoladas; retorna o stdout."""
+    result = subprocess.run(['git', '-C', str(repo), *args], capture_output=True, text=True,
+                            check=True, env={**os.environ, **GIT_ENV})
+    return result.stdout.strip()
+
+
+def commit_file(repo: Path, name: str, content: str, message: str) -> str:
+    (repo / name).write_text(content)
+    git(repo, 'add', name)
+    git(repo, 'commit', '-q', '-m', message)
+    return git(repo, 'rev-parse', 'HEAD')
+
+
+def write_file(path: Path, content: str = ''):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(content)
+
+
+@pytest.fixture
+def tree(tmp_path):
+    """Árvore com projetos aninhados, monorepo, diretórios ignorados e profundidade variada."""
+    root = tmp_path / 'tree'
+
+    write_file(root / 'web' / 'package.json', json.dumps({'name': 'web'}))
+    write_file(root / 'web' / 'README.md', '# web')
+    write_file(root / 'web' / 'node_modules' / 'dep' / 'package.json', '{}')
+    write_file(root / 'web' / 'dist' / 'package.json', '{}')
+
+    write_file(root / 'mono' / 'package.json', json.dumps({'workspaces': ['packages/*']}))
+    write_file(root / 'mono' / 'pnpm-workspace.yaml', "packages:\n  - 'packages/*'\n")
+    for name in ('core', 'ui', 'cli'):
+        write_file(root / 'mono' / 'packages' / name / 'package.json', json.dumps({'name': name}))
+    write_file(root / 'mono' / 'packages' / 'ui' / 'examples' / 'demo' / 'requirements.txt', 'flask\n')
+
+    write_file(root / 'api' / 'pyproject.toml', '[project]\nname = "api"\n')
+    write_file(root / 'api' / 'CLAUDE.md', '# api')
+    write_file(root / 'api' / 'venv' / 'lib' / 'setup.py', '')
+    write_file(root / 'api' / 'services' / 'worker' / 'go.mod', 'module worker\n')
+
+    write_file(root / 'misc' / 'notes.txt', 'sem projeto')
+    write_file(root / 'a' / 'b' / 'c' / 'd' / 'e' / 'deep' / 'Cargo.toml', '[package]\n')
+    for n in range(20):
+        write_file(root / 'many' / f'p{n:02d}' / 'composer.json', '{}')
+
+    if shutil.which('git'):
+        subprocess.run(['git', 'init', '-q', str(root / 'only-git')], check=True)
+    return root
+
+
+def scan(db_path: Path, root: Path, **options):
+    """Escaneia `root` num banco próprio e retorna (stats, linhas de PROJECT_COLUMNS)."""
+    scanner = ProjectScanner(db_path=str(db_path), **options)
+    try:
+        stats = scanner.scan_location(str(root))
+        rows = [tuple(row) for row in scanner.conn.execute(PROJECT_COLUMNS)]
+    finally:
+        scanner.close()
+    return stats, rows
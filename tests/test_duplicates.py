@@ -0,0 +1,353 @@
+"""Testes do DuplicateAnalyzer (analysis/duplicates.py) sobre bancos gerados pelo scanner."""
+
+import shutil
+import sqlite3
+
+import pytest
+
+from conftest import commit_file, git, scan, write_file
+from duplicates import DuplicateAnalyzer, _UnionFind
+from priority import PriorityAnalyzer
+from schema import ensure_schema
+
+needs_git = pytest.mark.skipif(shutil.which('git') is None, reason='git não instalado')
+
+
+def _analyzer(db_path, **options):
+    return DuplicateAnalyzer(str(db_path), workers=1, **options)
+
+
+def _groups(groups, kind, root):
+    """Grupos de um tipo como conjuntos de paths relativos."""
+    return sorted(
+        sorted(str(member['path'])[len(str(root)) + 1:] for member in group['members'])
+        for group in groups if group['type'] == kind
+    )
+
+
+@needs_git
+def test_same_history_joins_clones_and_forks_by_root_commit(tmp_path):
+    root = tmp_path / 'tree'
+    origin = root / 'origin'
+    origin.mkdir(parents=True)
+    git(origin, 'init', '-q', '-b', 'main')
+    commit_file(origin, 'README.md', '# origin', 'inicial')
+
+    git(root, 'clone', '-q', str(origin), str(root / 'clone'))
+    git(root, 'clone', '-q', str(origin), str(root / 'fork'))
+    git(root / 'fork', 'remote', 'set-url', 'origin', 'git@github.com:other/fork.git')
+    commit_file(root / 'fork', 'extra.txt', 'fork', 'só no fork')
+
+    unrelated = root / 'unrelated'
+    unrelated.mkdir()
+    git(unrelated, 'init', '-q', '-b', 'main')
+    commit_file(unrelated, 'README.md', '# outro', 'outro')
+
+    db_path = tmp_path / 'projects.db'
+    scan(db_path, root)
+
+    analyzer = _analyzer(db_path)
+    try:
+        groups = analyzer._find_same_history()
+    finally:
+        analyzer.close()
+
+    assert _groups(groups, 'same_history', root) == [['clone', 'fork', 'origin']]
+
+
+def test_root_commits_table_is_backfilled_on_migration(tmp_path):
+    db_path = tmp_path / 'old.db'
+    conn = sqlite3.connect(str(db_path))
+    ensure_schema(conn)
+    conn.execute("DROP TABLE project_root_commits")
+    conn.execute(
+        "INSERT INTO projects (name, path, type, git_root_commits) VALUES ('a', '/a', 'git-only', 'r1,r2')"
+    )
+    conn.commit()
+
+    ensure_schema(conn)
+
+    rows = conn.execute("SELECT sha FROM project_root_commits ORDER BY sha").fetchall()
+    assert [row[0] for row in rows] == ['r1', 'r2']
+    assert conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE name = 'idx_projects_git_root_commits'"
+    ).fetchone() is None
+    conn.close()
+
+
+@needs_git
+def test_root_commits_follow_rescans_and_deletes(tmp_path):
+    root = tmp_path / 'tree'
+    repo = root / 'repo'
+    repo.mkdir(parents=True)
+    git(repo, 'init', '-q', '-b', 'main')
+    first = commit_file(repo, 'a.txt', 'a', 'a')
+
+    db_path = tmp_path / 'projects.db'
+    scan(db_path, root)
+    scan(db_path, root, prune='delete')
+
+    conn = sqlite3.connect(str(db_path))
+    assert conn.execute("SELECT sha FROM project_root_commits").fetchall() == [(first,)]
+
+    shutil.rmtree(repo)
+    write_file(root / 'other' / 'package.json', '{}')
+    conn.close()
+    scan(db_path, root, prune='delete')
+
+    conn = sqlite3.connect(str(db_path))
+    assert conn.execute("SELECT COUNT(*) FROM project_root_commits").fetchone()[0] == 0
+    conn.close()
+
+
+def test_projects_archived_by_the_sweep_are_not_duplicates(tmp_path):
+    root = tmp_path / 'tree'
+    for copy in ('one', 'two'):
+        write_file(root / copy / 'app' / 'package.json', '{}')
+        write_file(root / copy / 'app-backup' / 'package.json', '{}')
+    db_path = tmp_path / 'projects.db'
+    scan(db_path, root)
+
+    analyzer = _analyzer(db_path)
+    try:
+        assert _groups(analyzer._find_same_name(), 'same_name', root) == [
+            ['one/app', 'two/app'], ['one/app-backup', 'two/app-backup']
+        ]
+    finally:
+        analyzer.close()
+
+    shutil.rmtree(root / 'two')
+    scan(db_path, root)
+
+    analyzer = _analyzer(db_path)
+    priority = PriorityAnalyzer(str(db_path))
+    try:
+        assert analyzer._find_same_name() == []
+        assert _groups(analyzer._find_similar_names(), 'similar_name', root) == [
+            ['one/app', 'one/app-backup']
+        ]
+        assert priority.calculate_priority('app')['breakdown']['duplicates'] == 'Único (+0)'
+    finally:
+        analyzer.close()
+        priority.close()
+
+
+def _empty_db(tmp_path):
+    db_path = tmp_path / 'projects.db'
+    conn = sqlite3.connect(str(db_path))
+    ensure_schema(conn)
+    conn.close()
+    return db_path
+
+
+def _member(project_id):
+    return {'id': project_id, 'name': f'p{project_id}', 'path': f'/p{project_id}'}
+
+
+def _group(kind, *ids):
+    return {'type': kind, 'name': kind, 'action': kind, 'members': [_member(i) for i in ids]}
+
+
+def test_union_find_merges_transitively():
+    sets = _UnionFind()
+    sets.union(1, 2)
+    sets.union(3, 4)
+    assert sets.find(1) == sets.find(2)
+    assert sets.find(1) != sets.find(3)
+
+    sets.union(2, 4)
+    assert len({sets.find(i) for i in (1, 2, 3, 4)}) == 1
+    assert sets.size[sets.find(1)] == 4
+    assert sets.find(5) == 5
+
+
+def test_cluster_joins_evidence_and_orders_it(tmp_path):
+    analyzer = _analyzer(_empty_db(tmp_path))
+    try:
+        clusters = analyzer._cluster([
+            _group('same_name', 1, 2),
+            _group('similar_name', 4, 5),
+            _group('same_remote', 2, 3),
+            _group('same_directory', 6, 7),
+            _group('same_directory', 8, 9),
+            _group('same_name', 9, 10),
+        ])
+    finally:
+        analyzer.close()
+
+    summary = [(sorted(m['id'] for m in c['members']), c['type'], c['evidence']) for c in clusters]
+    assert summary == [
+        ([1, 2, 3], 'same_remote', ['same_remote', 'same_name']),
+        ([4, 5], 'similar_name', ['similar_name']),
+        # Dois paths do mesmo diretório não são cópia; com um terceiro diretório, são
+        ([6, 7], 'same_directory', ['same_directory']),
+        ([8, 9, 10], 'same_name', ['same_name', 'same_directory']),
+    ]
+    assert clusters[0]['member_evidence'][2] == ['same_remote', 'same_name']
+
+
+def test_load_clusters_discards_run_when_projects_change(tmp_path):
+    root = tmp_path / 'tree'
+    for copy in ('one', 'two'):
+        write_file(root / copy / 'app' / 'package.json', '{}')
+    db_path = tmp_path / 'projects.db'
+    scan(db_path, root)
+
+    def reload(change):
+        analyzer = _analyzer(db_path)
+        try:
+            analyzer.find_duplicates(save=True)
+            assert _groups(analyzer.load_clusters(), 'same_name', root) == [['one/app', 'two/app']]
+            analyzer.conn.execute(change)
+            analyzer.conn.commit()
+            return analyzer.load_clusters()
+        finally:
+            analyzer.close()
+
+    # Projeto novo (COUNT e MAX(id)), projeto atualizado (MAX(updated_at)),
+    # e remoção seguida de inserção (mesmo COUNT, outro MAX(id))
+    assert reload("INSERT INTO projects (name, path, type) VALUES ('x', '/x', 'unknown')") is None
+    assert reload("UPDATE projects SET updated_at = '2999-01-01 00:00:00' WHERE name = 'x'") is None
+    assert reload("DELETE FROM projects WHERE name = 'x'") is None
+    assert reload("INSERT INTO projects (name, path, type) VALUES ('y', '/y', 'unknown')") is None
+
+    analyzer = _analyzer(db_path)
+    try:
+        analyzer.find_duplicates(save=True)
+        assert analyzer.load_clusters() is not None
+    finally:
+        analyzer.close()
+
+
+def test_only_find_writes_similarity_and_caches(tmp_path):
+    root = tmp_path / 'tree'
+    for name in ('sisconect', 'sisconect_v4'):
+        write_file(root / name / 'package.json', '{"name": "app"}')
+        write_file(root / name / 'src' / 'main.js', 'console.log("mesmo conteúdo");\n' * 50)
+    db_path = tmp_path / 'projects.db'
+    scan(db_path, root)
+
+    tables = ('project_similarity', 'file_hash_cache', 'name_signatures', 'duplicate_clusters')
+
+    def counts():
+        conn = sqlite3.connect(str(db_path))
+        try:
+            return {table: conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0] for table in tables}
+        finally:
+            conn.close()
+
+    analyzer = _analyzer(db_path, content=True, fuzzy=True)
+    try:
+        clusters = analyzer.get_clusters(refresh=True)
+        assert 'same_content' in clusters[0]['evidence']
+        assert counts() == dict.fromkeys(tables, 0)
+
+        analyzer.find_duplicates(save=True)
+    finally:
+        analyzer.close()
+
+    assert all(counts().values())
+
+
+def _pair_paths(pairs, root):
+    return sorted((pair['path_a'][len(str(root)) + 1:], pair['path_b'][len(str(root)) + 1:]) for pair in pairs)
+
+
+def test_same_content_finds_renamed_copies(tmp_path):
+    root = tmp_path / 'tree'
+    body = ''.join(f'linha {n}\n' for n in range(2000))  # maior que o bloco do hash parcial
+    for name in ('original', 'renomeado'):
+        write_file(root / name / 'package.json', '{"scripts": {}}')
+        write_file(root / name / 'src' / 'app.js', body)
+        write_file(root / name / 'README.md', '# app')
+    # Mesmos tamanhos, conteúdo diferente a partir do meio do arquivo grande
+    write_file(root / 'outro' / 'package.json', '{"scripts": {}}')
+    write_file(root / 'outro' / 'src' / 'app.js', body[:len(body) // 2] + 'x' * (len(body) - len(body) // 2))
+    write_file(root / 'outro' / 'README.md', '# xyz')
+    db_path = tmp_path / 'projects.db'
+    scan(db_path, root)
+
+    analyzer = _analyzer(db_path)
+    try:
+        pairs = analyzer.compute_similarity()
+        stats = analyzer.content_stats
+    finally:
+        analyzer.close()
+
+    assert _pair_paths(pairs, root) == [('original', 'renomeado')]
+    assert pairs[0]['score'] == 1.0
+    assert pairs[0]['matched_files'] == 3
+    # 'outro' passa pelos tamanhos e pelo hash parcial; só o hash completo o descarta
+    assert stats['pairs_by_size'] == 3
+    assert stats['pairs_by_partial_hash'] == 3
+    assert stats['files_full_hashed'] == 3
+
+
+def test_popular_sizes_are_compared_by_partial_hash(tmp_path):
+    root = tmp_path / 'tree'
+    for name, text in (('a', 'mesmo'), ('b', 'mesmo'), ('c', 'outro')):
+        write_file(root / name / 'package.json', '{}')
+        write_file(root / name / 'data.txt', text * 100)
+    db_path = tmp_path / 'projects.db'
+    scan(db_path, root)
+
+    analyzer = _analyzer(db_path)
+    analyzer.MAX_SIZE_POSTINGS = 1  # todo tamanho presente em 2+ projetos é popular
+    try:
+        pairs = analyzer.compute_similarity()
+        stats = analyzer.content_stats
+    finally:
+        analyzer.close()
+
+    assert _pair_paths(pairs, root) == [('a', 'b')]
+    assert stats['sizes_bucketed_by_hash'] == 2
+    # 'c' só compartilha o package.json: nem chega a candidato
+    assert stats['pairs_by_size'] == 1
+
+
+def test_similar_names_group_copies_by_base_name(tmp_path):
+    root = tmp_path / 'tree'
+    for name in ('app', 'app-backup', 'app-v2', 'lib-old', 'tool-old', 'tool-temp', 'other'):
+        write_file(root / name / 'package.json', '{}')
+    db_path = tmp_path / 'projects.db'
+    scan(db_path, root)
+
+    analyzer = _analyzer(db_path)
+    try:
+        groups = analyzer._find_similar_names()
+    finally:
+        analyzer.close()
+
+    # 'lib-old' sozinho não tem o nome exato; duas cópias sem ele formam grupo
+    assert [(group['name'], sorted(m['name'] for m in group['members'])) for group in groups] == [
+        ('app', ['app', 'app-backup', 'app-v2']),
+        ('tool', ['tool-old', 'tool-temp']),
+    ]
+
+
+def test_fuzzy_names_pair_near_duplicates_through_lsh(tmp_path):
+    root = tmp_path / 'tree'
+    for name in ('projectmanager', 'projetmanager', 'zebrakitchen', 'sisconect_v4', 'SisConect-final (1)'):
+        write_file(root / name / 'package.json', '{}')
+    db_path = tmp_path / 'projects.db'
+    scan(db_path, root)
+
+    analyzer = _analyzer(db_path, fuzzy=True)
+    try:
+        pairs = analyzer.compute_name_similarity(save=True)
+        stats = dict(analyzer.fuzzy_stats)
+        analyzer.compute_name_similarity()
+        cached = analyzer.fuzzy_stats
+    finally:
+        analyzer.close()
+
+    by_names = {(pair['name_a'], pair['name_b']): pair['score'] for pair in pairs}
+    # Mesmo nome normalizado: par direto, fora do LSH
+    assert by_names.pop(('SisConect-final (1)', 'sisconect_v4')) == 1.0
+    # Primeiras palavras diferentes: só uma faixa da assinatura em comum os torna candidatos
+    assert list(by_names) == [('projectmanager', 'projetmanager')]
+    assert 0.4 <= by_names[('projectmanager', 'projetmanager')] < 1.0
+    # 'zebrakitchen' não cai em nenhum balde com os outros
+    assert stats['names'] == 4
+    assert stats['candidates'] == 1
+    assert (cached['names_indexed'], cached['names_cached']) == (0, 5)
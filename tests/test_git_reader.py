@@ -0,0 +1,239 @@
+"""Testes do leitor nativo de .git (index/git_reader.py) contra o binário `git`."""
+
+import shutil
+import subprocess
+from pathlib import Path
+
+import pytest
+
+import git_reader
+from conftest import ProjectScanner, commit_file, git
+from git_reader import GitRepoReader, read_git_info
+
+pytestmark = pytest.mark.skipif(shutil.which('git') is None, reason='git não instalado')
+
+
+def orphan_root(repo: Path, branch: str) -> str:
+    """Commit raiz numa história não relacionada (ref própria, sem trocar o checkout)."""
+    blob = subprocess.run(['git', '-C', str(repo), 'hash-object', '-w', '--stdin'], input=branch,
+                          capture_output=True, text=True, check=True).stdout.strip()
+    tree = subprocess.run(['git', '-C', str(repo), 'mktree'], input=f'100644 blob {blob}\t{branch}\n',
+                          capture_output=True, text=True, check=True).stdout.strip()
+    sha = git(repo, 'commit-tree', tree, '-m', branch)
+    git(repo, 'update-ref', f'refs/heads/{branch}', sha)
+    return sha
+
+
+def merge_commit(repo: Path, *parents: str) -> str:
+    """Merge (de dois ou mais pais) com a árvore de HEAD, que vira o novo HEAD."""
+    args = [arg for parent in parents for arg in ('-p', parent)]
+    sha = git(repo, 'commit-tree', 'HEAD^{tree}', *args, '-m', 'merge')
+    git(repo, 'reset', '-q', '--hard', sha)
+    return sha
+
+
+def git_roots(repo: Path) -> str:
+    return ','.join(sorted(git(repo, 'rev-list', '--max-parents=0', 'HEAD').split()))
+
+
+@pytest.fixture
+def repo(tmp_path):
+    """Repositório com histórico que gera deltas (arquivo grande editado aos poucos)."""
+    path = tmp_path / 'repo'
+    path.mkdir()
+    git(path, 'init', '-q', '-b', 'main')
+    git(path, 'remote', 'add', 'origin', 'git@github.com:Org/Repo.git')
+
+    lines = [f'linha {n} ' + 'x' * 60 for n in range(400)]
+    for step in range(12):
+        lines[step * 7] = f'editada no commit {step}'
+        commit_file(path, 'big.txt', '\n'.join(lines), f'commit {step}')
+    return path
+
+
+def gc(repo: Path, *config: str):
+    args = []
+    for item in ('gc.writeCommitGraph=true',) + config:
+        args += ['-c', item]
+    git(repo, *args, 'gc', '-q', '--aggressive')
+
+
+def test_read_git_info_matches_git_after_gc(repo):
+    gc(repo)
+
+    info = read_git_info(repo)
+
+    assert info['git_branch'] == git(repo, 'branch', '--show-current')
+    assert info['git_remote'] == 'git@github.com:Org/Repo.git'
+    assert info['git_head_commit'] == git(repo, 'rev-parse', 'HEAD')
+    assert info['git_last_commit_date'] == git(repo, 'log', '-1', '--format=%ci')
+    assert info['git_remote_canonical'] == 'github.com/org/repo'
+
+
+def test_loose_objects_and_detached_head(repo):
+    git(repo, 'checkout', '-q', '--detach', 'HEAD~3')
+
+    info = read_git_info(repo)
+
+    assert info['git_branch'] == ''
+    assert info['git_head_commit'] == git(repo, 'rev-parse', 'HEAD')
+    assert info['git_last_commit_date'] == git(repo, 'log', '-1', '--format=%ci')
+
+
+def test_unsupported_layouts_fall_back_to_git(repo, tmp_path):
+    worktree = tmp_path / 'worktree'
+    git(repo, 'worktree', 'add', '-q', str(worktree))
+    assert read_git_info(worktree) is None
+
+    git(repo, 'config', 'url.https://example.com/.insteadOf', 'gh:')
+    assert read_git_info(repo) is None
+
+
+@pytest.mark.parametrize('offset_deltas', ['true', 'false'], ids=['ofs-delta', 'ref-delta'])
+def test_packed_deltas_resolve_to_git_content(repo, offset_deltas):
+    gc(repo, f'repack.useDeltaBaseOffset={offset_deltas}')
+    pack_index = next((repo / '.git' / 'objects' / 'pack').glob('*.idx'))
+    entries = [line.split() for line in git(repo, 'verify-pack', '-v', str(pack_index)).splitlines()
+               if len(line.split()) >= 5 and line.split()[1] in ('commit', 'tree', 'blob')]
+    # Entradas com profundidade/base (7 colunas) são deltas
+    assert any(len(entry) == 7 for entry in entries)
+
+    reader = GitRepoReader(repo / '.git')
+    try:
+        for sha, type_name, *_ in entries:
+            _, content = reader._read_object(sha)
+            expected = subprocess.run(['git', '-C', str(repo), 'cat-file', type_name, sha],
+                                      capture_output=True, check=True).stdout
+            assert content == expected, sha
+    finally:
+        reader.close()
+
+
+def test_shallow_clone_reads_head(repo, tmp_path):
+    clone = tmp_path / 'shallow'
+    git(tmp_path, 'clone', '-q', '--depth', '2', f'file://{repo}', str(clone))
+
+    info = read_git_info(clone)
+
+    assert info['git_head_commit'] == git(repo, 'rev-parse', 'HEAD')
+    assert info['git_last_commit_date'] == git(repo, 'log', '-1', '--format=%ci')
+
+
+def test_root_commits_from_commit_graph(repo):
+    merge_commit(repo, 'HEAD', orphan_root(repo, 'imported'))
+    gc(repo)
+    assert (repo / '.git' / 'objects' / 'info' / 'commit-graph').is_file()
+
+    roots = read_git_info(repo)['git_root_commits']
+
+    assert roots == git_roots(repo)
+    assert len(roots.split(',')) == 2
+
+
+def test_commits_newer_than_commit_graph_are_read_from_objects(repo):
+    gc(repo)
+    commit_file(repo, 'new.txt', 'novo', 'depois do gc')
+    merge_commit(repo, 'HEAD', orphan_root(repo, 'late'))
+
+    assert read_git_info(repo)['git_root_commits'] == git_roots(repo)
+
+
+def test_octopus_merge_parents_from_commit_graph_edges(repo):
+    merge_commit(repo, 'HEAD', *(orphan_root(repo, name) for name in ('a', 'b', 'c')))
+    gc(repo)
+
+    reader = GitRepoReader(repo / '.git')
+    try:
+        graph = reader.commit_graph
+        head = reader.head_commit()
+        parents = [graph.oid(position) for position in graph.parents(graph.position(head))]
+    finally:
+        reader.close()
+
+    assert parents == git(repo, 'log', '-1', '--format=%P').split()
+    assert read_git_info(repo)['git_root_commits'] == git_roots(repo)
+
+
+def test_split_commit_graph_chain(repo):
+    git(repo, 'commit-graph', 'write', '--split', '--reachable')
+    merge_commit(repo, 'HEAD', orphan_root(repo, 'second-layer'))
+    git(repo, 'commit-graph', 'write', '--split=no-merge', '--reachable')
+    assert (repo / '.git' / 'objects' / 'info' / 'commit-graphs' / 'commit-graph-chain').is_file()
+
+    reader = GitRepoReader(repo / '.git')
+    try:
+        assert len(reader.commit_graph.layers) == 2
+    finally:
+        reader.close()
+    assert read_git_info(repo)['git_root_commits'] == git_roots(repo)
+
+
+def test_root_commits_without_commit_graph_are_walked_natively(repo):
+    merge_commit(repo, 'HEAD', orphan_root(repo, 'imported'))
+    assert not (repo / '.git' / 'objects' / 'info' / 'commit-graph').exists()
+
+    assert read_git_info(repo)['git_root_commits'] == git_roots(repo)
+
+
+def test_long_history_without_commit_graph_is_left_to_git(repo, monkeypatch):
+    monkeypatch.setattr(git_reader, 'MAX_ROOT_WALK', 5)
+
+    info = read_git_info(repo)
+
+    assert info['git_head_commit'] == git(repo, 'rev-parse', 'HEAD')
+    assert 'git_root_commits' not in info
+
+
+def test_known_roots_are_reused_and_extended(repo):
+    first = read_git_info(repo)
+    known = (first['git_head_commit'], first['git_root_commits'])
+
+    assert read_git_info(repo, known_roots=known)['git_root_commits'] == first['git_root_commits']
+
+    merge_commit(repo, 'HEAD', orphan_root(repo, 'unrelated'))
+    assert read_git_info(repo, known_roots=known)['git_root_commits'] == git_roots(repo)
+
+
+def test_shallow_clone_has_no_roots(repo, tmp_path):
+    clone = tmp_path / 'shallow'
+    git(tmp_path, 'clone', '-q', '--depth', '2', f'file://{repo}', str(clone))
+
+    assert read_git_info(clone)['git_root_commits'] is None
+
+
+def test_scanner_fallback_uses_three_git_processes(repo, tmp_path, monkeypatch):
+    worktree = tmp_path / 'worktree'
+    git(repo, 'worktree', 'add', '-q', '-b', 'feature', str(worktree))
+    commit_file(worktree, 'feature.txt', 'feature', 'feature')
+    expected = {
+        'has_git': True,
+        'git_remote': 'git@github.com:Org/Repo.git',
+        'git_remote_canonical': 'github.com/org/repo',
+        'git_branch': 'feature',
+        'git_last_commit_date': git(worktree, 'log', '-1', '--format=%ci'),
+        'git_head_commit': git(worktree, 'rev-parse', 'HEAD'),
+        'git_root_commits': git_roots(worktree),
+    }
+
+    commands = []
+    run = subprocess.run
+
+    def counting_run(args, *rest, **kwargs):
+        commands.append(args[3])
+        return run(args, *rest, **kwargs)
+
+    monkeypatch.setattr(subprocess, 'run', counting_run)
+    scanner = ProjectScanner(db_path=str(tmp_path / 'projects.db'))
+    try:
+        info = scanner._extract_git_info(worktree, {'.git'})
+        # Detached: branch vazia, como na leitura nativa
+        git(worktree, 'checkout', '-q', '--detach')
+        del commands[:]
+        detached = scanner._extract_git_info(worktree, {'.git'})
+    finally:
+        scanner.close()
+
+    assert info == expected
+    assert detached['git_branch'] == ''
+    # Raízes pelo rev-list só porque o HEAD existe e o clone não é shallow
+    assert commands == ['rev-parse', 'remote', 'log', 'rev-list']
@@ -0,0 +1,78 @@
+"""Testes do matcher de .gitignore (index/gitignore.py)."""
+
+from gitignore import GitIgnore, is_ignored
+
+
+def test_unanchored_pattern_matches_at_any_level():
+    ignore = GitIgnore('/repo', ['build'])
+
+    assert ignore.match('build') is True
+    assert ignore.match('src/build') is True
+    assert ignore.match('builder') is None
+
+
+def test_leading_or_middle_slash_anchors_to_base():
+    ignore = GitIgnore('/repo', ['/out', 'docs/generated', 'cache/'])
+
+    assert ignore.match('out') is True
+    assert ignore.match('src/out') is None
+    assert ignore.match('docs/generated') is True
+    assert ignore.match('src/docs/generated') is None
+    # Barra final só restringe a diretórios: continua sem âncora
+    assert ignore.match('src/cache') is True
+
+
+def test_double_star_components():
+    ignore = GitIgnore('/repo', ['**/tmp', 'logs/**', 'a/**/z'])
+
+    assert ignore.match('tmp') is True
+    assert ignore.match('x/y/tmp') is True
+    assert ignore.match('logs/2024/jan') is True
+    assert ignore.match('a/z') is True
+    assert ignore.match('a/b/c/z') is True
+    assert ignore.match('b/a/z') is None
+
+
+def test_last_matching_pattern_wins_with_negation():
+    ignore = GitIgnore('/repo', ['packages/*', '!packages/keep', '# comentário', ''])
+
+    assert ignore.match('packages/drop') is True
+    assert ignore.match('packages/keep') is False
+    assert ignore.match('other') is None
+
+
+def test_negation_before_pattern_is_overridden():
+    ignore = GitIgnore('/repo', ['!keep', 'keep'])
+
+    assert ignore.match('keep') is True
+
+
+def test_character_classes_and_escapes():
+    ignore = GitIgnore('/repo', ['tmp[0-9]', 'dir[!a]', r'\!bang', r'\#hash'])
+
+    assert ignore.match('tmp7') is True
+    assert ignore.match('tmpx') is None
+    assert ignore.match('dirb') is True
+    assert ignore.match('dira') is None
+    assert ignore.match('!bang') is True
+    assert ignore.match('#hash') is True
+
+
+def test_deepest_file_with_a_match_decides():
+    chain = [
+        GitIgnore('/repo', ['generated']),
+        GitIgnore('/repo/app', ['!generated']),
+    ]
+
+    assert is_ignored(chain, '/repo/generated') is True
+    assert is_ignored(chain, '/repo/lib/generated') is True
+    assert is_ignored(chain, '/repo/app/generated') is False
+    assert is_ignored(chain, '/repo/app/src') is False
+
+
+def test_patterns_only_apply_below_their_base():
+    chain = [GitIgnore('/repo/app', ['/dist'])]
+
+    assert is_ignored(chain, '/repo/app/dist') is True
+    assert is_ignored(chain, '/repo/dist') is False
+    assert is_ignored(chain, '/repo/application/dist') is False
@@ -0,0 +1,60 @@
+"""Diretórios alcançados por mais de um path (symlinks): um só indexado, os outros em project_aliases."""
+
+import os
+import sqlite3
+
+import pytest
+
+from conftest import scan, write_file
+
+
+def _aliases(db_path, root):
+    conn = sqlite3.connect(str(db_path))
+    try:
+        prefix = len(str(root)) + 1
+        return sorted((alias[prefix:], canonical[prefix:], via) for alias, canonical, via in conn.execute(
+            "SELECT alias_path, canonical_path, via FROM project_aliases"))
+    finally:
+        conn.close()
+
+
+def _paths(rows, root):
+    return [row[0][len(str(root)) + 1:] for row in rows]
+
+
+@pytest.mark.parametrize('workers', [1, 4])
+def test_real_path_wins_over_symlinks(tmp_path, workers):
+    root = tmp_path / 'tree'
+    write_file(root / 'real' / 'app' / 'package.json', '{}')
+    os.symlink(root / 'real' / 'app', root / 'a-link')
+    os.symlink(root / 'real', root / 'z-link')
+    db_path = tmp_path / 'projects.db'
+
+    stats, rows = scan(db_path, root, workers=workers)
+
+    assert _paths(rows, root) == ['real/app']
+    assert _aliases(db_path, root) == [('a-link', 'real/app', 'symlink'), ('z-link', 'real', 'symlink')]
+    assert stats['aliases_found'] == 2
+
+
+@pytest.mark.parametrize('workers', [1, 4])
+def test_smallest_link_path_wins_then_stays_canonical(tmp_path, workers):
+    # Alvo fora da raiz: só os symlinks chegam nele
+    write_file(tmp_path / 'outside' / 'app' / 'package.json', '{}')
+    root = tmp_path / 'tree'
+    root.mkdir()
+    for name in ('m-link', 'b-link', 'x-link'):
+        os.symlink(tmp_path / 'outside' / 'app', root / name)
+    db_path = tmp_path / 'projects.db'
+
+    _, rows = scan(db_path, root, workers=workers)
+    # O projeto fica com o path real; o canônico é o path do walk pelo qual foi visitado
+    assert [row[0] for row in rows] == [str(tmp_path / 'outside' / 'app')]
+    assert _aliases(db_path, root) == [('m-link', 'b-link', 'symlink'), ('x-link', 'b-link', 'symlink')]
+
+    # Um path menor depois: o já indexado continua canônico
+    os.symlink(tmp_path / 'outside' / 'app', root / 'a-link')
+    os.remove(root / 'x-link')
+    _, rows = scan(db_path, root, workers=workers)
+    assert len(rows) == 1
+    assert _aliases(db_path, root) == [('a-link', 'b-link', 'symlink'), ('m-link', 'b-link', 'symlink')]
@@ -0,0 +1,125 @@
+"""Caches do scanner entre execuções: contagem de linhas dos docs e package.json."""
+
+import os
+
+import pytest
+
+from conftest import ProjectScanner, write_file
+
+
+def _count_calls(monkeypatch):
+    """Registra os arquivos cujas linhas são contadas de fato."""
+    counted = []
+    original = ProjectScanner._count_lines
+
+    def count_lines(cls, path):
+        counted.append(os.path.basename(str(path)))
+        return original(path)
+
+    monkeypatch.setattr(ProjectScanner, '_count_lines', classmethod(count_lines))
+    return counted
+
+
+def _scan_docs(db_path, root):
+    scanner = ProjectScanner(db_path=str(db_path))
+    try:
+        scanner.scan_location(str(root))
+        return dict(scanner.conn.execute(
+            "SELECT substr(file_path, ?), line_count FROM project_docs ORDER BY file_path",
+            (len(str(root)) + 2,)
+        ).fetchall())
+    finally:
+        scanner.close()
+
+
+def test_doc_line_counts_are_cached_by_size_and_mtime(tmp_path, monkeypatch):
+    root = tmp_path / 'tree'
+    write_file(root / 'app' / 'package.json', '{}')
+    write_file(root / 'app' / 'README.md', 'a\nb\n')
+    write_file(root / 'app' / 'CLAUDE.md', 'x\n')
+    db_path = tmp_path / 'projects.db'
+    counted = _count_calls(monkeypatch)
+
+    assert _scan_docs(db_path, root) == {'app/CLAUDE.md': 1, 'app/README.md': 2}
+    assert sorted(counted) == ['CLAUDE.md', 'README.md']
+
+    del counted[:]
+    _scan_docs(db_path, root)
+    assert counted == []
+
+    # Mesmo tamanho e mtime: a contagem gravada vale, mesmo com outro conteúdo
+    readme = root / 'app' / 'README.md'
+    st = readme.stat()
+    readme.write_text('ab \n')
+    os.utime(readme, ns=(st.st_atime_ns, st.st_mtime_ns))
+    assert _scan_docs(db_path, root)['app/README.md'] == 2
+    assert counted == []
+
+    # Só o mtime muda: recontado
+    os.utime(readme, ns=(st.st_atime_ns, st.st_mtime_ns + 10 ** 9))
+    assert _scan_docs(db_path, root)['app/README.md'] == 1
+    assert counted == ['README.md']
+
+    # Tamanho muda
+    del counted[:]
+    (root / 'app' / 'CLAUDE.md').write_text('x\ny\nz')
+    assert _scan_docs(db_path, root)['app/CLAUDE.md'] == 3
+    assert counted == ['CLAUDE.md']
+
+
+@pytest.mark.parametrize('content', [b'', b'a', b'a\n', b'a\r\nb\rc\n\nd', b'\r\n' * 5 + b'x\r'])
+def test_count_lines_matches_text_mode_across_chunks(tmp_path, monkeypatch, content):
+    monkeypatch.setattr(ProjectScanner, 'DOC_READ_CHUNK', 1)
+    path = tmp_path / 'doc.md'
+    path.write_bytes(content)
+
+    with open(path, encoding='utf-8', newline=None) as f:
+        expected = sum(1 for _ in f)
+    assert ProjectScanner._count_lines(path) == expected
+
+
+def test_package_json_is_parsed_once_until_it_changes(tmp_path, monkeypatch):
+    root = tmp_path / 'tree'
+    write_file(root / 'web' / 'package.json', '{"dependencies": {"next": "^14.0.0"}}')
+    write_file(root / 'api' / 'package.json', '{"dependencies": {"express": "^4.0.0"}}')
+    write_file(root / 'broken' / 'package.json', '{"dependencies": ')
+    db_path = tmp_path / 'projects.db'
+
+    parsed = []
+    original = ProjectScanner._parse_package_json
+
+    def parse_package_json(self, package_json):
+        parsed.append(package_json.parent.name)
+        return original(self, package_json)
+
+    monkeypatch.setattr(ProjectScanner, '_parse_package_json', parse_package_json)
+
+    def scan_manifests():
+        scanner = ProjectScanner(db_path=str(db_path))
+        try:
+            stats = scanner.scan_location(str(root))
+            frameworks = dict(scanner.conn.execute("SELECT name, framework FROM projects"))
+            errors = [row[0] for row in scanner.conn.execute(
+                "SELECT path FROM manifest_cache WHERE parse_error IS NOT NULL")]
+        finally:
+            scanner.close()
+        return (stats['manifest_cache_hits'], stats['manifest_cache_misses']), frameworks, errors
+
+    counts, frameworks, errors = scan_manifests()
+    assert counts == (0, 3)
+    assert sorted(parsed) == ['api', 'broken', 'web']
+    assert (frameworks['web'], frameworks['api'], frameworks['broken']) == ('nextjs', 'express', None)
+    # Manifest inválido também fica em cache (não é reparseado a cada scan)
+    assert errors == [str(root / 'broken' / 'package.json')]
+
+    del parsed[:]
+    counts, cached, _ = scan_manifests()
+    assert counts == (3, 0)
+    assert parsed == []
+    assert cached == frameworks
+
+    write_file(root / 'web' / 'package.json', '{"dependencies": {"@nestjs/core": "^10.0.0"}}')
+    counts, frameworks, _ = scan_manifests()
+    assert counts == (2, 1)
+    assert parsed == ['web']
+    assert frameworks['web'] == 'nestjs'
@@ -0,0 +1,47 @@
+"""Tamanho em disco por projeto medido no walk (--disk-usage)."""
+
+import os
+import sqlite3
+
+import pytest
+
+from conftest import scan, write_file
+
+
+def _blocks(*paths):
+    return sum(os.lstat(path).st_blocks * 512 for path in paths)
+
+
+@pytest.mark.parametrize('workers', [1, 4])
+def test_disk_usage_per_project_with_hardlinks_on_the_smallest_path(tmp_path, workers):
+    root = tmp_path / 'tree'
+    app = root / 'app'
+    write_file(app / 'package.json', '{}')
+    write_file(app / 'src' / 'main.js', 'x' * 10000)
+    write_file(app / 'node_modules' / 'dep' / 'index.js', 'y' * 20000)
+    write_file(app / 'packages' / 'core' / 'package.json', '{}')
+    write_file(app / 'packages' / 'core' / 'lib.js', 'z' * 30000)
+
+    # Mesmo inode em dois projetos: conta uma vez, para o menor path ('alpha')
+    write_file(root / 'zeta' / 'Cargo.toml', '[package]\n')
+    write_file(root / 'zeta' / 'data.bin', 'd' * 50000)
+    write_file(root / 'alpha' / 'Cargo.toml', '[package]\n')
+    os.link(root / 'zeta' / 'data.bin', root / 'alpha' / 'data.bin')
+
+    db_path = tmp_path / 'projects.db'
+    scan(db_path, root, workers=workers, disk_usage=True)
+
+    conn = sqlite3.connect(str(db_path))
+    usage = {path[len(str(root)) + 1:]: (source, ignored) for path, source, ignored in conn.execute(
+        "SELECT path, disk_size_source, disk_size_ignored FROM projects")}
+    conn.close()
+
+    assert usage == {
+        # Subprojeto indexado tem o próprio tamanho; node_modules conta como ignorado
+        'app': (_blocks(app / 'package.json', app / 'src' / 'main.js'),
+                _blocks(app / 'node_modules' / 'dep' / 'index.js')),
+        'app/packages/core': (_blocks(app / 'packages' / 'core' / 'package.json',
+                                      app / 'packages' / 'core' / 'lib.js'), 0),
+        'alpha': (_blocks(root / 'alpha' / 'Cargo.toml', root / 'alpha' / 'data.bin'), 0),
+        'zeta': (_blocks(root / 'zeta' / 'Cargo.toml'), 0),
+    }
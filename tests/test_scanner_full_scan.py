@@ -0,0 +1,71 @@
+"""full-scan com várias raízes: agrupamento por dispositivo e agregação das estatísticas."""
+
+import os
+import threading
+
+from conftest import PROJECT_COLUMNS, ProjectScanner, write_file
+
+
+def test_full_scan_runs_devices_in_parallel_and_roots_of_a_device_in_order(tmp_path, monkeypatch):
+    roots = []
+    for name, projects in (('r1', 2), ('r2', 1), ('r3', 3)):
+        for n in range(projects):
+            write_file(tmp_path / name / f'p{n}' / 'package.json', '{}')
+        roots.append({'path': str(tmp_path / name), 'max_depth': 10, 'ignore': [], 'workers': 1})
+
+    # r1 e r2 no mesmo dispositivo, r3 em outro (só o stat da raiz muda)
+    devices = {roots[0]['path']: 101, roots[1]['path']: 101, roots[2]['path']: 202}
+    real_stat = os.stat
+
+    def fake_stat(path, *args, **kwargs):
+        st = real_stat(path, *args, **kwargs)
+        if isinstance(path, str) and path in devices:
+            fields = list(st)
+            fields[2] = devices[path]
+            st = os.stat_result(fields)
+        return st
+
+    monkeypatch.setattr(os, 'stat', fake_stat)
+
+    # Os dois grupos só passam da barreira se rodarem ao mesmo tempo
+    barrier = threading.Barrier(2, timeout=10)
+    groups = []
+    scan_device_roots = ProjectScanner._scan_device_roots
+
+    def record(self, device, group):
+        groups.append((device, [root['path'] for root in group]))
+        barrier.wait()
+        return scan_device_roots(self, device, group)
+
+    monkeypatch.setattr(ProjectScanner, '_scan_device_roots', record)
+
+    scanner = ProjectScanner(db_path=str(tmp_path / 'projects.db'))
+    try:
+        stats = scanner.full_scan(roots)
+        rows = [row[0] for row in scanner.conn.execute(PROJECT_COLUMNS)]
+    finally:
+        scanner.close()
+
+    assert sorted(groups) == [(101, [roots[0]['path'], roots[1]['path']]), (202, [roots[2]['path']])]
+    assert stats['devices'] == 2
+    assert stats['locations_scanned'] == 3
+    assert stats['total_projects_found'] == 6
+    # Estatísticas por raiz na ordem da configuração
+    assert [(root['location'], root['device'], root['projects_found']) for root in stats['roots']] == [
+        (roots[0]['path'], 101, 2), (roots[1]['path'], 101, 1), (roots[2]['path'], 202, 3),
+    ]
+    assert len(rows) == 6
+
+
+def test_full_scan_skips_missing_roots(tmp_path):
+    write_file(tmp_path / 'present' / 'app' / 'package.json', '{}')
+    roots = [{'path': str(tmp_path / name), 'max_depth': 10, 'ignore': [], 'workers': 1}
+             for name in ('missing', 'present')]
+
+    scanner = ProjectScanner(db_path=str(tmp_path / 'projects.db'))
+    try:
+        stats = scanner.full_scan(roots)
+    finally:
+        scanner.close()
+
+    assert (stats['devices'], stats['locations_scanned'], stats['total_projects_found']) == (1, 1, 1)
@@ -0,0 +1,47 @@
+"""Scan incremental (fingerprints por diretório) contra o scan completo."""
+
+import shutil
+
+import pytest
+
+from conftest import scan, write_file
+
+
+@pytest.mark.parametrize('workers', [1, 4])
+def test_incremental_rescan_matches_full_scan(tmp_path, tree, workers):
+    db_path = tmp_path / 'incremental.db'
+    _, first = scan(db_path, tree, workers=workers, incremental=True)
+    stats, unchanged = scan(db_path, tree, workers=workers, incremental=True)
+
+    assert unchanged == first
+    assert stats['dirs_skipped'] > 0
+
+    # Mudanças: projeto novo, projeto removido (arquivado pelo sweep) e subprojeto novo
+    write_file(tree / 'misc' / 'Gemfile', "source 'https://rubygems.org'\n")
+    shutil.rmtree(tree / 'many' / 'p03')
+    write_file(tree / 'api' / 'services' / 'mailer' / 'package.json', '{}')
+
+    _, incremental = scan(db_path, tree, workers=workers, incremental=True)
+    _, full = scan(tmp_path / 'full.db', tree, workers=workers)
+
+    assert incremental == full
+    paths = [row[0] for row in incremental]
+    assert str(tree / 'misc') in paths
+    assert str(tree / 'api' / 'services' / 'mailer') in paths
+    assert str(tree / 'many' / 'p03') not in paths
+
+
+def test_git_and_claude_changes_invalidate_the_fingerprint(tmp_path, tree):
+    db_path = tmp_path / 'incremental.db'
+    scan(db_path, tree, incremental=True)
+
+    # Só o conteúdo de arquivos aninhados muda (mtime do diretório do projeto intacto)
+    (tree / 'web' / '.claude').mkdir()
+    claude_md = tree / 'web' / '.claude' / 'CLAUDE.md'
+    scan(db_path, tree, incremental=True)
+    claude_md.write_text('# web')
+
+    _, rows = scan(db_path, tree, incremental=True)
+
+    web = next(row for row in rows if row[0] == str(tree / 'web'))
+    assert web[8] == 1  # has_claude_md
@@ -0,0 +1,74 @@
+"""Retomada de um scan interrompido (scanner.py resume) contra o scan sem interrupção."""
+
+import json
+import sqlite3
+
+import pytest
+
+from conftest import PROJECT_COLUMNS, ProjectScanner, scan
+
+
+def _record_listings(monkeypatch):
+    """Registra os diretórios listados por qualquer scanner (inclusive os do resume)."""
+    listed = []
+    original = ProjectScanner._list_directory
+
+    def list_directory(self, path):
+        listed.append(str(path))
+        return original(self, path)
+
+    monkeypatch.setattr(ProjectScanner, '_list_directory', list_directory)
+    return listed
+
+
+@pytest.mark.parametrize('workers', [1, 4])
+def test_resume_after_interrupt_matches_full_scan(tmp_path, tree, monkeypatch, workers):
+    _, expected = scan(tmp_path / 'full.db', tree, workers=workers)
+
+    listed = _record_listings(monkeypatch)
+    db_path = tmp_path / 'resumed.db'
+    scanner = ProjectScanner(db_path=str(db_path), workers=workers, batch_size=1,
+                             checkpoint_interval=1e-9)
+    save_checkpoint = scanner._save_checkpoint
+
+    # Interrompe (como o Ctrl-C do full-scan) logo depois do primeiro checkpoint de um lote
+    def save_and_cancel(location_path, generation, stats, writer=None, base=None, force=False):
+        save_checkpoint(location_path, generation, stats, writer, base, force)
+        if not force:
+            scanner._cancel.set()
+
+    scanner._save_checkpoint = save_and_cancel
+    try:
+        with pytest.raises(KeyboardInterrupt):
+            scanner.scan_location(str(tree))
+    finally:
+        scanner.close()
+
+    conn = sqlite3.connect(str(db_path))
+    frontier = json.loads(conn.execute("SELECT frontier FROM scan_checkpoints").fetchone()[0])
+    committed = conn.execute("SELECT COUNT(*) FROM projects").fetchone()[0]
+    conn.close()
+    assert 0 < committed < len(expected)
+
+    # Concluídos antes do checkpoint: listados e fora da fronteira gravada (nem abaixo
+    # de uma entrada dela; as de VISIT_SELF só reidentificam o próprio diretório)
+    def in_frontier(path):
+        return any(path == entry or (visit != ProjectScanner.VISIT_SELF and path.startswith(entry + '/'))
+                   for entry, _, _, _, visit in frontier['pending'])
+
+    finished = {path for path in listed if not in_frontier(path)}
+    assert finished
+    del listed[:]
+
+    scanner = ProjectScanner(db_path=str(db_path))
+    try:
+        results = scanner.resume()
+        rows = [tuple(row) for row in scanner.conn.execute(PROJECT_COLUMNS)]
+        assert scanner.conn.execute("SELECT COUNT(*) FROM scan_checkpoints").fetchone()[0] == 0
+    finally:
+        scanner.close()
+
+    assert [result['resumed'] for result in results] == [True]
+    assert rows == expected
+    assert listed
+    assert not finished & set(listed)
@@ -0,0 +1,133 @@
+"""Mark-and-sweep dos projetos que um scan não vê mais (prune archive/delete)."""
+
+import shutil
+import sqlite3
+
+from conftest import scan, write_file
+from status import StatusAnalyzer
+
+
+def _rows(db_path):
+    conn = sqlite3.connect(str(db_path))
+    conn.row_factory = sqlite3.Row
+    try:
+        return {row['path']: dict(row) for row in conn.execute(
+            "SELECT p.id, p.path, p.status, p.status_before_prune, parent.path AS parent_path "
+            "FROM projects p LEFT JOIN projects parent ON parent.id = p.parent_project_id"
+        )}
+    finally:
+        conn.close()
+
+
+def _execute(db_path, sql, params=()):
+    conn = sqlite3.connect(str(db_path))
+    try:
+        conn.execute(sql, params)
+        conn.commit()
+    finally:
+        conn.close()
+
+
+def _tree(root):
+    write_file(root / 'keep' / 'package.json', '{}')
+    write_file(root / 'gone' / 'package.json', '{}')
+    write_file(root / 'tasks' / 'package.json', '{}')
+    write_file(root / 'history' / 'package.json', '{}')
+    write_file(root / 'parent' / 'package.json', '{}')
+    write_file(root / 'parent' / 'child' / 'Cargo.toml', '[package]\n')
+    write_file(root / 'a' / 'b' / 'deep' / 'go.mod', 'module deep\n')
+
+
+def test_vanished_project_is_archived_and_restored_when_seen_again(tmp_path):
+    root = tmp_path / 'tree'
+    _tree(root)
+    db_path = tmp_path / 'projects.db'
+    scan(db_path, root)
+    gone = str(root / 'gone')
+    _execute(db_path, "UPDATE projects SET status = 'active' WHERE path = ?", (gone,))
+
+    shutil.move(gone, str(tmp_path / 'away'))
+    stats, _ = scan(db_path, root)
+
+    row = _rows(db_path)[gone]
+    assert stats['projects_removed'] == 1
+    assert (row['status'], row['status_before_prune']) == ('archived', 'active')
+
+    shutil.move(str(tmp_path / 'away'), gone)
+    scan(db_path, root)
+
+    row = _rows(db_path)[gone]
+    assert (row['status'], row['status_before_prune']) == ('active', None)
+
+
+def test_projects_not_visited_but_still_on_disk_are_kept(tmp_path):
+    root = tmp_path / 'tree'
+    _tree(root)
+    db_path = tmp_path / 'projects.db'
+    scan(db_path, root)
+
+    # max_depth menor: o projeto fundo não é visitado, mas o diretório continua lá
+    stats, _ = scan(db_path, root, max_depth=1, prune='delete')
+
+    deep = _rows(db_path)[str(root / 'a' / 'b' / 'deep')]
+    assert stats['projects_removed'] == 0
+    assert deep['status'] != 'archived'
+
+
+def test_delete_keeps_rows_with_tasks_or_history(tmp_path):
+    root = tmp_path / 'tree'
+    _tree(root)
+    db_path = tmp_path / 'projects.db'
+    scan(db_path, root)
+    rows = _rows(db_path)
+    _execute(db_path, "INSERT INTO project_tasks (project_id, description) VALUES (?, 'tarefa')",
+             (rows[str(root / 'tasks')]['id'],))
+    _execute(db_path, "INSERT INTO analysis_history (project_id, analysis_type) VALUES (?, 'status')",
+             (rows[str(root / 'history')]['id'],))
+
+    for name in ('gone', 'tasks', 'history'):
+        shutil.rmtree(root / name)
+    stats, _ = scan(db_path, root, prune='delete')
+
+    rows = _rows(db_path)
+    assert stats['projects_removed'] == 3
+    assert str(root / 'gone') not in rows
+    assert rows[str(root / 'tasks')]['status'] == 'archived'
+    assert rows[str(root / 'history')]['status'] == 'archived'
+
+
+def test_delete_detaches_surviving_children_before_the_cascade(tmp_path):
+    root = tmp_path / 'tree'
+    _tree(root)
+    db_path = tmp_path / 'projects.db'
+    scan(db_path, root)
+    child = str(root / 'parent' / 'child')
+    assert _rows(db_path)[child]['parent_path'] == str(root / 'parent')
+
+    # O pai deixa de ser projeto (diretório continua) e é apagado; o filho foi visto
+    (root / 'parent' / 'package.json').unlink()
+    scan(db_path, root, prune='delete')
+
+    rows = _rows(db_path)
+    assert str(root / 'parent') not in rows
+    assert rows[child]['parent_path'] is None
+    assert rows[child]['status'] != 'archived'
+
+
+def test_status_update_all_skips_projects_archived_by_the_sweep(tmp_path):
+    root = tmp_path / 'tree'
+    _tree(root)
+    db_path = tmp_path / 'projects.db'
+    scan(db_path, root)
+    shutil.rmtree(root / 'gone')
+    scan(db_path, root)
+
+    analyzer = StatusAnalyzer(str(db_path))
+    try:
+        results = analyzer.analyze_all()
+    finally:
+        analyzer.close()
+
+    row = _rows(db_path)[str(root / 'gone')]
+    assert (row['status'], row['status_before_prune']) == ('archived', 'unknown')
+    assert results['total'] == len(_rows(db_path)) - 1
@@ -0,0 +1,97 @@
+"""Atualizações sem scan completo: update-recent e update --paths-from."""
+
+import io
+import os
+import shutil
+import sys
+import time
+
+import pytest
+
+from conftest import ProjectScanner, commit_file, git, write_file
+from scanner import read_path_list
+
+needs_git = pytest.mark.skipif(shutil.which('git') is None, reason='git não instalado')
+
+
+def _age(directory, days):
+    """Recua o mtime de tudo sob `directory` em `days` dias."""
+    stamp = time.time() - days * 86400
+    for dirpath, _, filenames in os.walk(directory):
+        for name in filenames:
+            os.utime(os.path.join(dirpath, name), (stamp, stamp))
+
+
+@needs_git
+def test_update_recent_detects_activity_by_git_mtimes(tmp_path):
+    root = tmp_path / 'tree'
+    for name in ('fresh', 'stale'):
+        (root / name).mkdir(parents=True)
+        git(root / name, 'init', '-q', '-b', 'main')
+        commit_file(root / name, 'package.json', '{}', 'inicial')
+    write_file(root / 'no-git' / 'package.json', '{}')
+    _age(root / 'stale' / '.git', 30)
+
+    scanner = ProjectScanner(db_path=str(tmp_path / 'projects.db'))
+    try:
+        stats = scanner.update_recent(days=7, locations=[str(root)])
+        assert (stats['repos_checked'], stats['repos_recent']) == (2, 1)
+        assert stats['updated'] == [str(root / 'fresh')]
+        assert stats['projects_added'] == 1
+
+        # Um commit novo só muda refs/heads e o reflog
+        commit_file(root / 'stale', 'README.md', '# stale', 'novo')
+        stats = scanner.update_recent(days=7, locations=[str(root)])
+        assert sorted(stats['updated']) == [str(root / 'fresh'), str(root / 'stale')]
+        assert (stats['projects_added'], stats['projects_updated']) == (1, 1)
+
+        paths = [row[0] for row in scanner.conn.execute("SELECT path FROM projects ORDER BY path")]
+        assert paths == [str(root / 'fresh'), str(root / 'stale')]
+    finally:
+        scanner.close()
+
+
+def test_read_path_list_accepts_nul_and_newlines(tmp_path, monkeypatch):
+    nul = tmp_path / 'nul.txt'
+    nul.write_bytes(b'/a/with\nnewline\0/b\0\0')
+    lines = tmp_path / 'lines.txt'
+    lines.write_bytes(b'/a\n\n/b c\r\n')
+
+    assert read_path_list(str(nul)) == ['/a/with\nnewline', '/b']
+    assert read_path_list(str(lines)) == ['/a', '/b c']
+
+    monkeypatch.setattr(sys, 'stdin', io.TextIOWrapper(io.BytesIO(b'/x\0/y\0')))
+    assert read_path_list('-') == ['/x', '/y']
+
+
+def test_update_projects_reports_each_path_in_input_order(tmp_path):
+    root = tmp_path / 'tree'
+    write_file(root / 'app' / 'package.json', '{}')
+    write_file(root / 'app' / 'services' / 'api' / 'go.mod', 'module api\n')
+    write_file(root / 'notes' / 'todo.txt')
+
+    scanner = ProjectScanner(db_path=str(tmp_path / 'projects.db'))
+    try:
+        scanner.scan_location(str(root))
+        write_file(root / 'new' / 'Cargo.toml', '[package]\n')
+
+        api = str(root / 'app' / 'services' / 'api')
+        results = scanner.update_projects([
+            api, str(root / 'new'), str(root / 'missing'), str(root / 'notes'), api + '/',
+        ])
+        assert results == [
+            (api, ProjectScanner.UPDATE_UPDATED),
+            (str(root / 'new'), ProjectScanner.UPDATE_ADDED),
+            (str(root / 'missing'), ProjectScanner.UPDATE_NOT_FOUND),
+            (str(root / 'notes'), ProjectScanner.UPDATE_NOT_PROJECT),
+        ]
+
+        # Já indexado: mantém profundidade e pai; novo entra como raiz
+        rows = dict((row[0], tuple(row[1:])) for row in scanner.conn.execute(
+            "SELECT p.path, p.depth_level, parent.path FROM projects p "
+            "LEFT JOIN projects parent ON parent.id = p.parent_project_id"
+        ))
+        assert rows[api] == (3, str(root / 'app'))
+        assert rows[str(root / 'new')] == (0, None)
+    finally:
+        scanner.close()
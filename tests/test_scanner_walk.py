@@ -0,0 +1,21 @@
+"""Equivalência entre o walker serial e o paralelo do scanner."""
+
+from conftest import scan
+
+
+def test_parallel_walker_matches_serial(tmp_path, tree):
+    _, serial = scan(tmp_path / 'serial.db', tree, workers=1)
+    _, parallel = scan(tmp_path / 'parallel.db', tree, workers=4)
+
+    paths = [row[0] for row in serial]
+    assert str(tree / 'mono' / 'packages' / 'ui' / 'examples' / 'demo') in paths
+    assert not any('node_modules' in path or '/venv/' in path or '/dist' in path for path in paths)
+    assert serial == parallel
+
+
+def test_max_depth_is_applied_by_both_walkers(tmp_path, tree):
+    _, serial = scan(tmp_path / 'serial.db', tree, workers=1, max_depth=3)
+    _, parallel = scan(tmp_path / 'parallel.db', tree, workers=4, max_depth=3)
+
+    assert serial == parallel
+    assert str(tree / 'a' / 'b' / 'c' / 'd' / 'e' / 'deep') not in [row[0] for row in serial]
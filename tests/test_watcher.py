@@ -0,0 +1,152 @@
+"""Binding inotify (index/watcher.py) e aplicação de eventos do modo watch."""
+
+import os
+import shutil
+
+import pytest
+
+from conftest import ProjectScanner, write_file
+from scanner import ProjectBatchWriter
+import watcher as inotify
+
+
+def _inotify():
+    try:
+        return inotify.InotifyWatcher()
+    except OSError as e:
+        pytest.skip(f'inotify indisponível: {e}')
+
+
+def _read_all(watcher):
+    events = []
+    batch = watcher.read_events(timeout=1.0)
+    while batch:
+        events.extend(batch)
+        batch = watcher.read_events(timeout=0.1)
+    return events
+
+
+def test_inotify_reports_writes_moves_and_deletes(tmp_path):
+    watcher = _inotify()
+    try:
+        assert watcher.add_watch(str(tmp_path)) is not None
+        assert watcher.add_watch(str(tmp_path / 'missing')) is None
+
+        (tmp_path / 'project').mkdir()
+        (tmp_path / 'package.json').write_text('{}')
+        os.rename(tmp_path / 'project', tmp_path / 'renamed')
+        (tmp_path / 'renamed').rmdir()
+        events = _read_all(watcher)
+    finally:
+        watcher.close()
+
+    def kinds(name, flag):
+        return [(mask & inotify.IN_ISDIR != 0, cookie) for directory, entry, mask, cookie in events
+                if directory == str(tmp_path) and entry == name and mask & flag]
+
+    assert kinds('project', inotify.IN_CREATE) == [(True, 0)]
+    assert kinds('package.json', inotify.IN_CLOSE_WRITE) == [(False, 0)]
+    (_, cookie), = kinds('project', inotify.IN_MOVED_FROM)
+    assert cookie != 0
+    assert kinds('renamed', inotify.IN_MOVED_TO) == [(True, cookie)]
+    assert kinds('renamed', inotify.IN_DELETE) == [(True, 0)]
+
+
+def test_track_watch_removal_pairs_moves_by_cookie(tmp_path):
+    scanner = ProjectScanner(db_path=str(tmp_path / 'projects.db'))
+    removed, moves, moved_from = set(), [], {}
+    directory = str(tmp_path)
+    try:
+        for name, mask, cookie in (('a', inotify.IN_MOVED_FROM, 7), ('b', inotify.IN_MOVED_FROM, 8),
+                                   ('a2', inotify.IN_MOVED_TO, 7), ('c', inotify.IN_DELETE, 0),
+                                   ('notes.txt', inotify.IN_DELETE, 0)):
+            isdir = 0 if name.endswith('.txt') else inotify.IN_ISDIR
+            scanner._track_watch_removal(directory, name, mask | isdir, cookie, removed, moves, moved_from)
+    finally:
+        scanner.close()
+
+    assert moves == [(str(tmp_path / 'a'), str(tmp_path / 'a2'))]
+    # 'b' sem IN_MOVED_TO: vira remoção ao fim da rajada
+    assert moved_from == {8: str(tmp_path / 'b')}
+    assert removed == {str(tmp_path / 'c')}
+
+
+class _Watch:
+    """Um scanner com o índice inicial e os watches das raízes, como em `scanner.py watch`."""
+
+    def __init__(self, db_path, root):
+        self.root = root
+        self.scanner = ProjectScanner(db_path=str(db_path))
+        self.scanner.scan_location(str(root))
+        self.watcher = _inotify()
+        self.writer = ProjectBatchWriter(self.scanner.conn, batch_size=0)
+        self.scanner._add_watches(self.watcher, root, 0)
+
+    def apply(self):
+        changed, removed, moves, overflow = self.scanner._read_watch_burst(
+            self.watcher, [self.root], debounce=0.2, timeout=1.0)
+        assert not overflow
+        self.scanner._apply_watch_changes(changed, [self.root], self.writer, removed, moves)
+
+    def rows(self):
+        return {row[1][len(str(self.root)) + 1:]: (row[0], row[2]) for row in self.scanner.conn.execute(
+            "SELECT id, path, status FROM projects ORDER BY path")}
+
+    def close(self):
+        self.watcher.close()
+        self.scanner.close()
+
+
+@pytest.fixture
+def watch(tmp_path):
+    root = tmp_path / 'tree'
+    write_file(root / 'app' / 'package.json', '{}')
+    write_file(root / 'app' / 'README.md', '# app')
+    write_file(root / 'app' / 'packages' / 'core' / 'package.json', '{}')
+    write_file(root / 'lib' / 'pyproject.toml', '')
+    session = _Watch(tmp_path / 'projects.db', root)
+    yield session
+    session.close()
+
+
+def test_renamed_project_keeps_its_row(watch):
+    before = watch.rows()
+
+    os.rename(watch.root / 'app', watch.root / 'web')
+    watch.apply()
+
+    after = watch.rows()
+    assert set(after) == {'web', 'web/packages/core', 'lib'}
+    assert after['web'] == before['app']
+    assert after['web/packages/core'] == before['app/packages/core']
+    docs = [row[0] for row in watch.scanner.conn.execute("SELECT file_path FROM project_docs")]
+    assert docs == [str(watch.root / 'web' / 'README.md')]
+
+
+def test_removed_project_goes_through_prune(watch):
+    shutil.rmtree(watch.root / 'lib')
+    watch.apply()
+
+    assert watch.rows()['lib'][1] == 'archived'
+
+
+def test_rename_onto_an_indexed_path_prunes_the_source(watch):
+    status = watch.rows()['lib'][1]
+    # 'lib' sai da árvore: a linha arquivada continua com o path
+    shutil.rmtree(watch.root / 'lib')
+    watch.apply()
+    before = watch.rows()
+
+    os.rename(watch.root / 'app', watch.root / 'lib')
+    watch.apply()
+
+    after = watch.rows()
+    # A linha do destino é re-detectada (volta ao status anterior); a de origem é arquivada
+    assert after['lib'] == (before['lib'][0], status)
+    assert after['app'] == (before['app'][0], 'archived')
+    assert after['lib/packages/core'] == before['app/packages/core']
+    parent = watch.scanner.conn.execute(
+        "SELECT parent.path FROM projects p JOIN projects parent ON parent.id = p.parent_project_id "
+        "WHERE p.path = ?", (str(watch.root / 'lib' / 'packages' / 'core'),)
+    ).fetchone()
+    assert parent[0] == str(watch.root / 'lib')
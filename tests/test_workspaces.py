@@ -0,0 +1,96 @@
+"""Testes dos globs de membros de monorepo (index/workspaces.py)."""
+
+import json
+import os
+from pathlib import Path
+
+from workspaces import expand_member_globs, read_member_globs
+
+
+def _package(directory: Path, manifest: str = 'package.json'):
+    directory.mkdir(parents=True, exist_ok=True)
+    (directory / manifest).write_text('{}')
+
+
+def _list_subdirs(directory: Path):
+    return sorted(entry for entry in directory.iterdir() if entry.is_dir())
+
+
+def _relative(root: Path, members):
+    return [member.relative_to(root).as_posix() for member in members]
+
+
+def test_read_globs_from_every_manifest(tmp_path):
+    (tmp_path / 'pnpm-workspace.yaml').write_text(
+        "packages:\n  - 'apps/*'\n  - \"libs/**\"  # comentário\n  - '!**/test/**'\n"
+    )
+    (tmp_path / 'lerna.json').write_text(json.dumps({'packages': ['apps/*', 'tools/*']}))
+    (tmp_path / 'nx.json').write_text(json.dumps({'workspaceLayout': {'appsDir': 'web'}}))
+    (tmp_path / 'package.json').write_text(json.dumps({'workspaces': {'packages': ['modules/*']}}))
+
+    globs = read_member_globs(tmp_path, set(os.listdir(tmp_path)))
+
+    assert globs == ['apps/*', 'libs/**', '!**/test/**', 'tools/*', 'web/**', 'modules/*']
+
+
+def test_read_globs_inline_pnpm_list_and_missing_manifests(tmp_path):
+    (tmp_path / 'pnpm-workspace.yaml').write_text("packages: [packages/*, 'apps/*']\n")
+
+    assert read_member_globs(tmp_path, {'pnpm-workspace.yaml'}) == ['packages/*', 'apps/*']
+    # Só os manifests listados em names são lidos
+    assert read_member_globs(tmp_path, set()) is None
+
+
+def test_read_globs_without_members_returns_none(tmp_path):
+    (tmp_path / 'package.json').write_text(json.dumps({'name': 'root'}))
+    (tmp_path / 'turbo.json').write_text('{}')
+
+    assert read_member_globs(tmp_path, {'package.json', 'turbo.json'}) is None
+
+
+def test_expand_single_level_globs(tmp_path):
+    _package(tmp_path / 'packages' / 'a')
+    _package(tmp_path / 'packages' / 'b', 'project.json')
+    (tmp_path / 'packages' / 'no-manifest').mkdir()
+    _package(tmp_path / 'packages' / 'a' / 'nested')
+
+    members = expand_member_globs(tmp_path, ['packages/*'], _list_subdirs)
+
+    assert _relative(tmp_path, members) == ['packages/a', 'packages/b']
+
+
+def test_expand_double_star_stops_at_first_member(tmp_path):
+    _package(tmp_path / 'libs' / 'ui')
+    _package(tmp_path / 'libs' / 'ui' / 'inner')
+    _package(tmp_path / 'libs' / 'group' / 'core')
+    _package(tmp_path / 'libs' / 'group' / 'deep' / 'util')
+
+    members = expand_member_globs(tmp_path, ['libs/**'], _list_subdirs)
+
+    assert _relative(tmp_path, members) == ['libs/group/core', 'libs/group/deep/util', 'libs/ui']
+
+
+def test_expand_applies_exclusions_and_skips_parent_globs(tmp_path):
+    root = tmp_path / 'repo'
+    _package(root / 'apps' / 'web')
+    _package(root / 'apps' / 'test')
+    _package(root / 'apps' / 'docs')
+    _package(tmp_path / 'outside')
+
+    members = expand_member_globs(
+        root, ['apps/*', '!apps/docs', '!**/test/**', '../*', 'apps/web'], _list_subdirs
+    )
+
+    assert _relative(root, members) == ['apps/web']
+
+
+def test_expand_uses_list_subdirs_to_prune(tmp_path):
+    _package(tmp_path / 'packages' / 'kept')
+    _package(tmp_path / 'packages' / 'ignored')
+
+    def list_subdirs(directory):
+        return [subdir for subdir in _list_subdirs(directory) if subdir.name != 'ignored']
+
+    members = expand_member_globs(tmp_path, ['packages/*'], list_subdirs)
+
+    assert _relative(tmp_path, members) == ['packages/kept']